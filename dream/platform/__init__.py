@@ -24,11 +24,16 @@ import json
 import urllib
 import xlrd
 import traceback
-import multiprocessing
-import Queue
+import threading
+import atexit
+import tempfile
 from dream.KnowledgeExtraction.DistributionFitting import DistFittest
 from dream.KnowledgeExtraction.ImportExceldata import Import_Excel
 from dream.plugins.plugin import PluginRegistry
+from dream.plugins.cache import configureScenarioCache
+from dream.platform.workerpool import WorkerPool, TimeoutError, \
+    PoolFullError, WorkerError
+from dream.platform.jobs import JobStore, JobQueue
 
 import os.path
 import logging
@@ -80,40 +85,43 @@ def positionGraph():
 
   return jsonify(preference_dict)
 
-class TimeoutError(Exception):
-  pass
+# the pool of worker processes the simulations run in, created on first use
+worker_pool = None
+worker_pool_lock = threading.Lock()
+
+def getWorkerPool():
+  global worker_pool
+  with worker_pool_lock:
+    if worker_pool is None:
+      worker_pool = WorkerPool(
+        size=app.config.get('WORKER_POOL_SIZE'),
+        max_tasks_per_worker=app.config.get('WORKER_MAX_TASKS', 50),
+        max_queued=app.config.get('WORKER_MAX_QUEUED', 10))
+      atexit.register(worker_pool.close)
+    return worker_pool
 
 def runWithTimeout(func, timeout, *args, **kw):
-  queue = multiprocessing.Queue()
-  process = multiprocessing.Process(
-    target=_runWithTimeout,
-    args=(queue, func, args, kw))
-  process.start()
+  return getWorkerPool().apply(func, timeout, *args, **kw)
+
+def runRequest(func, parameter_dict):
+  """Run func(parameter_dict) in the worker pool and return the json response,
+  applying the processTimeout of the request (60 seconds by default).
+  """
+  try:
+    timeout = int(parameter_dict['general']['processTimeout'])
+  except (KeyError, ValueError, TypeError):
+    timeout = 60
+
   try:
-    return queue.get(timeout=timeout)
-  except Queue.Empty:
-    process.terminate()
-    raise TimeoutError()
-  finally:
-    process.join()
-
-def _runWithTimeout(queue, func, args, kw):
-  import signal
-  import traceback
-
-  if hasattr(signal, 'SIGUSR1'):
-    signal.signal(signal.SIGUSR1, lambda sig, stack: traceback.print_stack(stack))
-    print "To see current traceback:"
-    print "  kill -SIGUSR1 %s" % os.getpid()
-
-  # print a traceback when terminated.
-  def handler(sig, stack):
-    app.logger.error("Terminating")
-    app.logger.info("".join(traceback.format_stack(stack)))
-    sys.exit(0)
-  signal.signal(signal.SIGTERM, handler)
-
-  queue.put(func(*args, **kw))
+    result = runWithTimeout(func, timeout, parameter_dict)
+    return jsonify(result)
+  except TimeoutError:
+    return jsonify(dict(error="Timeout after %s seconds" % timeout))
+  except PoolFullError:
+    return jsonify(dict(error="Too many requests in progress, try again later"))
+  except WorkerError, e:
+    app.logger.error(str(e))
+    return jsonify(dict(error=str(e)))
 
 @app.route("/postJSONData", methods=["POST", "OPTIONS"])
 def postJSONData():
@@ -123,23 +131,25 @@ def postJSONData():
   response.headers['Content-Disposition'] = 'attachment; filename=dream.json'
   return response
 
+def setTraceDirectory(parameter_dict):
+  """The requests do not choose where the traces are written on the server:
+  they are kept in the directory given with --trace-directory, or returned in
+  the results if it is not given.
+  """
+  general = parameter_dict.get('general')
+  if isinstance(general, dict):
+    general.pop('traceDirectory', None)
+    if app.config.get('TRACE_DIRECTORY'):
+      general['traceDirectory'] = app.config['TRACE_DIRECTORY']
+  return parameter_dict
+
 @app.route("/runSimulation", methods=["POST", "OPTIONS"])
 def runSimulation():
-  parameter_dict = request.json
-  try:
-    timeout = int(parameter_dict['general']['processTimeout'])
-  except (KeyError, ValueError, TypeError):
-    timeout = 60
+  return runRequest(_runSimulation, setTraceDirectory(request.json))
 
+def _runSimulation(parameter_dict, progress=None):
   try:
-    result = runWithTimeout(_runSimulation, timeout, parameter_dict)
-    return jsonify(result)
-  except TimeoutError:
-    return jsonify(dict(error="Timeout after %s seconds" % timeout))
-
-def _runSimulation(parameter_dict):
-  try:
-    registry = PluginRegistry(app.logger, parameter_dict)
+    registry = PluginRegistry(app.logger, parameter_dict, progress=progress)
     return dict(success=True, data=registry.run(parameter_dict))
   except Exception:
     # Use simpy._compat to format exception chain in python2
@@ -154,19 +164,9 @@ def _runSimulation(parameter_dict):
 
 @app.route("/runKnowledgeExtraction", methods=["POST", "OPTIONS"])
 def runKnowledgeExtraction():
-  parameter_dict = request.json
-  try:
-    timeout = int(parameter_dict['general']['processTimeout'])
-  except (KeyError, ValueError, TypeError):
-    timeout = 60
+  return runRequest(_runKnowledgeExtraction, request.json)
 
-  try:
-    result = runWithTimeout(_runKnowledgeExtraction, timeout, parameter_dict)
-    return jsonify(result)
-  except TimeoutError:
-    return jsonify(dict(error="Timeout after %s seconds" % timeout))
-
-def _runKnowledgeExtraction(parameter_dict):
+def _runKnowledgeExtraction(parameter_dict, progress=None):
   try:
     workbook = xlrd.open_workbook(
         file_contents=urllib.urlopen(parameter_dict['general']['ke_url']).read())
@@ -189,6 +189,71 @@ def _runKnowledgeExtraction(parameter_dict):
     app.logger.error(tb)
     return dict(error=tb)
 
+# the queue of the jobs submitted with the asynchronous API, created on first use
+job_queue = None
+job_queue_lock = threading.Lock()
+
+def getJobQueue():
+  global job_queue
+  with job_queue_lock:
+    if job_queue is None:
+      job_queue = JobQueue(
+        JobStore(app.config.get('JOB_DIRECTORY') or
+                 os.path.join(tempfile.gettempdir(), 'dream_jobs')),
+        dict(runSimulation=_runSimulation,
+             runKnowledgeExtraction=_runKnowledgeExtraction),
+        max_running=app.config.get('MAX_RUNNING_JOBS', 1))
+      atexit.register(job_queue.close)
+    return job_queue
+
+@app.route("/jobs/<kind>", methods=["POST", "OPTIONS"])
+def submitJob(kind):
+  """Submits runSimulation or runKnowledgeExtraction as a background job and
+  returns its id, without waiting for the result.
+  """
+  parameter_dict = request.json
+  if kind == 'runSimulation':
+    parameter_dict = setTraceDirectory(parameter_dict)
+  try:
+    job_id = getJobQueue().submit(kind, parameter_dict)
+  except KeyError:
+    return jsonify(dict(error="Unknown job kind %s" % kind)), 404
+  return jsonify(getJobQueue().store.get(job_id))
+
+@app.route("/jobs/<job_id>/status", methods=["GET", "OPTIONS"])
+def getJobStatus(job_id):
+  """Returns the status and the progress of a job.
+  """
+  job = getJobQueue().store.get(job_id)
+  if job is None:
+    return jsonify(dict(error="No such job %s" % job_id)), 404
+  return jsonify(job)
+
+@app.route("/jobs/<job_id>/result", methods=["GET", "OPTIONS"])
+def getJobResult(job_id):
+  """Returns the result of a finished job, as the synchronous API would have
+  returned it.
+  """
+  store = getJobQueue().store
+  job = store.get(job_id)
+  if job is None:
+    return jsonify(dict(error="No such job %s" % job_id)), 404
+  result = store.getResult(job_id)
+  if result is None:
+    if job['error']:
+      return jsonify(dict(error=job['error']))
+    return jsonify(dict(error="Job %s is %s" % (job_id, job['status']))), 409
+  return jsonify(result)
+
+@app.route("/jobs/<job_id>/cancel", methods=["POST", "OPTIONS"])
+def cancelJob(job_id):
+  """Cancels a queued or running job.
+  """
+  job = getJobQueue().cancel(job_id)
+  if job is None:
+    return jsonify(dict(error="No such job %s" % job_id)), 404
+  return jsonify(job)
+
 def main(*args):
   parser = argparse.ArgumentParser(description='Launch the DREAM simulation platform.')
   parser.add_argument('--port', default=5000, type=int,
@@ -196,7 +261,36 @@ def main(*args):
   parser.add_argument('--host', default="localhost", help='Host address')
   parser.add_argument('--logfile', help='Log to file')
   parser.add_argument('--debug', help='Debug mode', action='store_true')
+  parser.add_argument('--workers', type=int,
+                      help='Number of simulation worker processes (default: number of cpus)')
+  parser.add_argument('--max-tasks-per-worker', default=50, type=int,
+                      help='Replace a worker process after this many requests (0 for never)')
+  parser.add_argument('--max-queued-requests', default=10, type=int,
+                      help='Number of requests that may wait for a free worker')
+  parser.add_argument('--job-directory',
+                      help='Directory where the jobs and their results are stored')
+  parser.add_argument('--max-running-jobs', default=1, type=int,
+                      help='Number of jobs running at the same time')
+  parser.add_argument('--scenario-cache-size', default=128, type=int,
+                      help='Number of scenario results cached in memory by each worker')
+  parser.add_argument('--scenario-cache-directory',
+                      help='Directory where the scenario results are cached on disk')
+  parser.add_argument('--scenario-cache-directory-size', default=1024, type=int,
+                      help='Number of scenario results kept on disk (0 for no limit)')
+  parser.add_argument('--trace-directory',
+                      help='Directory where the simulation traces are kept '
+                           '(default: returned in the results)')
   arguments = parser.parse_args()
+  app.config['WORKER_POOL_SIZE'] = arguments.workers
+  app.config['WORKER_MAX_TASKS'] = arguments.max_tasks_per_worker
+  app.config['WORKER_MAX_QUEUED'] = arguments.max_queued_requests
+  app.config['JOB_DIRECTORY'] = arguments.job_directory
+  app.config['MAX_RUNNING_JOBS'] = arguments.max_running_jobs
+  app.config['TRACE_DIRECTORY'] = arguments.trace_directory
+  # configured before the workers start, so that they all use it
+  configureScenarioCache(max_size=arguments.scenario_cache_size,
+                         path=arguments.scenario_cache_directory,
+                         max_disk_size=arguments.scenario_cache_directory_size)
   if arguments.logfile:
     file_handler = logging.FileHandler(arguments.logfile)
     file_handler.setLevel(logging.DEBUG)
@@ -206,6 +300,10 @@ def main(*args):
     # Serve static file with no cache
     app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 
+  # start the workers before serving, so that the first requests find them ready
+  getWorkerPool()
+  # run the jobs left queued by a previous run of the server
+  getJobQueue()
   # start the server
   app.run(debug=arguments.debug, host=arguments.host, port=arguments.port)
 
@@ -0,0 +1,269 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+import traceback
+import multiprocessing
+import Queue
+
+logger = logging.getLogger("dream.platform")
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+class JobStore(object):
+  """Keeps the jobs in a directory, so that their status and result can be
+  read from any process. For a job <id> the directory contains:
+
+  <id>.json: the status of the job
+  <id>.input.json: the parameters the job was submitted with
+  <id>.progress.json: the progress of the job, while it runs
+  <id>.result.json: the result, once the job is finished
+  <id>.error.json: the traceback, if the job raised an exception
+
+  Every file has a single writer: the status is only written by the
+  JobQueue, the progress, result and error only by the process running the
+  job, so that no update of a file is lost.
+  """
+  def __init__(self, path):
+    self.path = path
+    if not os.path.isdir(path):
+      os.makedirs(path)
+
+  def _getPath(self, job_id, suffix='.json'):
+    if not job_id.isalnum():
+      raise KeyError(job_id)
+    return os.path.join(self.path, job_id + suffix)
+
+  def _write(self, path, data):
+    # write in a temporary file and rename, so that readers never see a
+    # partially written file
+    tmp_path = '%s.%s.tmp' % (path, os.getpid())
+    with open(tmp_path, 'w') as f:
+      json.dump(data, f)
+    os.rename(tmp_path, path)
+
+  def _read(self, path):
+    try:
+      with open(path) as f:
+        return json.load(f)
+    except IOError:
+      return None
+
+  def create(self, kind, parameter_dict):
+    """Stores a new queued job and returns its id.
+    """
+    job_id = uuid.uuid4().hex
+    self._write(self._getPath(job_id, '.input.json'), parameter_dict)
+    self._write(self._getPath(job_id), dict(
+      id=job_id,
+      kind=kind,
+      status=QUEUED,
+      progress=dict(done=0, total=0, message=''),
+      submitted=time.time(),
+      started=None,
+      finished=None,
+      error=None))
+    return job_id
+
+  def get(self, job_id):
+    """Returns the status of the job, or None if there is no such job.
+    """
+    try:
+      job = self._read(self._getPath(job_id))
+    except KeyError:
+      return None
+    if job is not None:
+      progress = self._read(self._getPath(job_id, '.progress.json'))
+      if progress is not None:
+        job['progress'] = progress
+    return job
+
+  def update(self, job_id, **kw):
+    """Updates the status of the job, only called by the JobQueue.
+    """
+    job = self._read(self._getPath(job_id))
+    job.update(kw)
+    self._write(self._getPath(job_id), job)
+    return self.get(job_id)
+
+  def setProgress(self, job_id, done, total, message=''):
+    self._write(self._getPath(job_id, '.progress.json'),
+                dict(done=done, total=total, message=message))
+
+  def getInput(self, job_id):
+    return self._read(self._getPath(job_id, '.input.json'))
+
+  def setResult(self, job_id, result):
+    self._write(self._getPath(job_id, '.result.json'), result)
+
+  def getResult(self, job_id):
+    try:
+      return self._read(self._getPath(job_id, '.result.json'))
+    except KeyError:
+      return None
+
+  def setError(self, job_id, error):
+    self._write(self._getPath(job_id, '.error.json'), error)
+
+  def getError(self, job_id):
+    return self._read(self._getPath(job_id, '.error.json'))
+
+  def discardOutput(self, job_id):
+    """Removes the result and the error of a cancelled job.
+    """
+    for suffix in ('.result.json', '.error.json'):
+      try:
+        os.remove(self._getPath(job_id, suffix))
+      except OSError:
+        pass
+
+  def listJobs(self):
+    """Returns the status of all the jobs, oldest first.
+    """
+    job_list = []
+    for filename in os.listdir(self.path):
+      job_id, ext = os.path.splitext(filename)
+      if ext == '.json' and job_id.isalnum():
+        job = self.get(job_id)
+        if job is not None:
+          job_list.append(job)
+    job_list.sort(key=lambda job: job['submitted'])
+    return job_list
+
+def _runJob(store, job_id, func):
+  """Runs a job in a child process: func is called with the input of the job
+  and a progress callback, and the result (or the traceback) is saved in the
+  store. The status of the job is left to the JobQueue.
+  """
+  def progress(done, total, message=''):
+    store.setProgress(job_id, done, total, message)
+  try:
+    result = func(store.getInput(job_id), progress=progress)
+  except Exception:
+    store.setError(job_id, traceback.format_exc())
+    return
+  store.setResult(job_id, result)
+
+class JobQueue(object):
+  """Runs the jobs of a store in the background, at most max_running at a
+  time. Each job runs in its own process, so that it can be cancelled at any
+  time and is not limited by the request timeout.
+
+  function_dict maps the kind of a job to the function running it, which is
+  called as func(parameter_dict, progress=callback) and returns the result.
+  """
+  def __init__(self, store, function_dict, max_running=1):
+    self.store = store
+    self.function_dict = function_dict
+    self.queue = Queue.Queue()
+    self.lock = threading.Lock()
+    self.process_dict = {}
+    # jobs of a previous run of the server: the running ones were
+    # interrupted, the queued ones are run again.
+    for job in store.listJobs():
+      if job['status'] == RUNNING:
+        store.update(job['id'], status=FAILED, finished=time.time(),
+                     error="Interrupted by a restart of the server")
+      elif job['status'] == QUEUED:
+        self.queue.put(job['id'])
+    self.thread_list = []
+    for i in range(max_running):
+      thread = threading.Thread(target=self._runLoop)
+      thread.daemon = True
+      thread.start()
+      self.thread_list.append(thread)
+
+  def submit(self, kind, parameter_dict):
+    """Queues a job and returns its id.
+    """
+    if kind not in self.function_dict:
+      raise KeyError(kind)
+    job_id = self.store.create(kind, parameter_dict)
+    self.queue.put(job_id)
+    return job_id
+
+  def cancel(self, job_id):
+    """Cancels a job, terminating its process if it is running. Returns the
+    status of the job, or None if there is no such job.
+    """
+    with self.lock:
+      job = self.store.get(job_id)
+      if job is None or job['status'] not in (QUEUED, RUNNING):
+        return job
+      job = self.store.update(job_id, status=CANCELLED, finished=time.time())
+      process = self.process_dict.get(job_id)
+    if process is not None:
+      process.terminate()
+    return job
+
+  def _runLoop(self):
+    while True:
+      job_id = self.queue.get()
+      try:
+        self._run(job_id)
+      except Exception:
+        logger.error(traceback.format_exc())
+
+  def _run(self, job_id):
+    with self.lock:
+      job = self.store.get(job_id)
+      if job is None or job['status'] != QUEUED:
+        # cancelled while queued
+        return
+      self.store.update(job_id, status=RUNNING, started=time.time())
+      process = multiprocessing.Process(target=_runJob,
+        args=(self.store, job_id, self.function_dict[job['kind']]))
+      self.process_dict[job_id] = process
+      process.start()
+    process.join()
+    with self.lock:
+      del self.process_dict[job_id]
+      if self.store.get(job_id)['status'] == CANCELLED:
+        # the job may have saved its result before it was terminated
+        self.store.discardOutput(job_id)
+        return
+      error = self.store.getError(job_id)
+      result = self.store.getResult(job_id)
+      if error is None and isinstance(result, dict) and result.get('error'):
+        error = result['error']
+      if error is None and result is None:
+        # the process died without saving its result
+        error = "The job process exited with code %s" % process.exitcode
+      if error is None:
+        self.store.update(job_id, status=FINISHED, finished=time.time())
+      else:
+        self.store.update(job_id, status=FAILED, finished=time.time(),
+                          error=error)
+
+  def close(self):
+    """Cancels the running jobs.
+    """
+    with self.lock:
+      job_id_list = self.process_dict.keys()
+    for job_id in job_id_list:
+      self.cancel(job_id)
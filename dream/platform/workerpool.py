@@ -0,0 +1,207 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import os
+import sys
+import time
+import signal
+import logging
+import threading
+import traceback
+import multiprocessing
+import Queue
+
+logger = logging.getLogger("dream.platform")
+
+# the modules that keep the state of an application at module level instead of
+# in the SimulationContext of the run. A worker that has imported one of them is
+# retired after its task, so that the next request starts from a clean state.
+# The ones the pool process had already imported when the worker was forked do
+# not retire it, every worker would be retired after its first task otherwise
+STATEFUL_MODULES = (
+  'dream.simulation.applications.DemandPlanning.Globals',
+)
+
+class TimeoutError(Exception):
+  pass
+
+class PoolFullError(Exception):
+  """Raised when too many requests are already waiting for a worker.
+  """
+
+class WorkerError(Exception):
+  """Raised when the task failed in the worker, the message is the
+  traceback of the worker.
+  """
+
+def _workerLoop(connection, stateful_modules=STATEFUL_MODULES):
+  """Main loop of a worker process: run the tasks received on the connection
+  and send back (True, result, retire) or (False, traceback, retire), retire
+  telling if the worker imported a module holding module level state and must
+  not be reused.
+  """
+  stateful_modules = [name for name in stateful_modules
+                      if name not in sys.modules]
+  if hasattr(signal, 'SIGUSR1'):
+    signal.signal(signal.SIGUSR1, lambda sig, stack: traceback.print_stack(stack))
+    print "To see current traceback:"
+    print "  kill -SIGUSR1 %s" % os.getpid()
+
+  # print a traceback when terminated.
+  def handler(sig, stack):
+    logger.error("Terminating")
+    logger.info("".join(traceback.format_stack(stack)))
+    sys.exit(0)
+  signal.signal(signal.SIGTERM, handler)
+
+  while True:
+    try:
+      task = connection.recv()
+    except (EOFError, IOError):
+      # the pool is gone
+      break
+    if task is None:
+      break
+    func, args, kw = task
+    try:
+      success, result = True, func(*args, **kw)
+    except Exception:
+      success, result = False, traceback.format_exc()
+    retire = any(name in sys.modules for name in stateful_modules)
+    connection.send((success, result, retire))
+
+class Worker(object):
+  """A pre-forked process running tasks sent through a pipe.
+  """
+  def __init__(self, stateful_modules=STATEFUL_MODULES):
+    self.connection, child_connection = multiprocessing.Pipe()
+    self.process = multiprocessing.Process(target=_workerLoop,
+                                           args=(child_connection, stateful_modules))
+    # workers are not daemonic, so that they can use process pools themselves
+    # (see LineGenerationJSON.runInParallel)
+    self.process.start()
+    child_connection.close()
+    self.task_count = 0
+    # set when the worker ran a task leaving module level state behind
+    self.retire = False
+
+  def run(self, func, args, kw, timeout):
+    self.connection.send((func, args, kw))
+    if not self.connection.poll(timeout):
+      raise TimeoutError()
+    self.task_count += 1
+    success, result, self.retire = self.connection.recv()
+    if not success:
+      raise WorkerError(result)
+    return result
+
+  def stop(self):
+    try:
+      self.connection.send(None)
+    except IOError:
+      pass
+    self.connection.close()
+    self.process.join(1)
+    if self.process.is_alive():
+      self.kill()
+
+  def kill(self):
+    self.connection.close()
+    self.process.terminate()
+    self.process.join()
+
+class WorkerPool(object):
+  """A pool of pre-forked worker processes, so that requests do not pay for
+  a fork and the imports of the simulation on every call.
+
+  size: the number of worker processes
+  max_tasks_per_worker: a worker is replaced by a fresh one after running this
+    many tasks (0 for never), so that leaked state does not accumulate
+  max_queued: the number of requests that may wait for a free worker, further
+    requests are refused with PoolFullError
+  stateful_modules: a worker that has imported one of these modules is
+    replaced after its task (see STATEFUL_MODULES)
+  """
+  def __init__(self, size=None, max_tasks_per_worker=50, max_queued=10,
+               stateful_modules=STATEFUL_MODULES):
+    self.size = size or multiprocessing.cpu_count()
+    self.max_tasks_per_worker = max_tasks_per_worker
+    self.stateful_modules = stateful_modules
+    self.slots = threading.BoundedSemaphore(self.size + max_queued)
+    self.idle_workers = Queue.Queue()
+    self.lock = threading.Lock()
+    self.worker_list = []
+    for i in range(self.size):
+      self.idle_workers.put(self._startWorker())
+
+  def _startWorker(self):
+    worker = Worker(self.stateful_modules)
+    with self.lock:
+      self.worker_list.append(worker)
+    return worker
+
+  def _replaceWorker(self, worker, kill=False):
+    with self.lock:
+      self.worker_list.remove(worker)
+    if kill:
+      worker.kill()
+    else:
+      worker.stop()
+    return self._startWorker()
+
+  def apply(self, func, timeout, *args, **kw):
+    """Run func(*args, **kw) in a worker and return its result. The timeout
+    covers the wait for a free worker and the task: TimeoutError is raised if
+    no worker is free in time, and the worker running the task is terminated
+    and replaced if it does not finish in time.
+    """
+    if not self.slots.acquire(False):
+      raise PoolFullError()
+    try:
+      deadline = time.time() + timeout
+      try:
+        worker = self.idle_workers.get(timeout=timeout)
+      except Queue.Empty:
+        raise TimeoutError()
+      try:
+        result = worker.run(func, args, kw, max(deadline - time.time(), 0))
+      except TimeoutError:
+        worker = self._replaceWorker(worker, kill=True)
+        raise
+      except (EOFError, IOError):
+        # the worker died while running the task
+        worker = self._replaceWorker(worker, kill=True)
+        raise WorkerError("The worker process exited unexpectedly")
+      finally:
+        if worker.retire or (self.max_tasks_per_worker and
+            worker.task_count >= self.max_tasks_per_worker):
+          worker = self._replaceWorker(worker)
+        self.idle_workers.put(worker)
+      return result
+    finally:
+      self.slots.release()
+
+  def close(self):
+    """Stop all the workers.
+    """
+    with self.lock:
+      worker_list = self.worker_list[:]
+      self.worker_list = []
+    for worker in worker_list:
+      worker.kill()
@@ -1,6 +1,7 @@
 from dream.plugins import plugin
 from pprint import pformat
 from copy import copy
+from collections import OrderedDict
 import json
 import time
 import random
@@ -9,6 +10,7 @@ import xmlrpclib
 
 from dream.simulation.Queue import Queue
 from dream.simulation.Globals import getClassFromName
+from dream.simulation.Fingerprint import FingerprintSet, resultFingerprint
 
 class ACO(plugin.ExecutionPlugin):
 
@@ -36,10 +38,25 @@ class ACO(plugin.ExecutionPlugin):
 
     distributor_url = data['general'].get('distributorURL')
     distributor = None
+    pool = None
     if distributor_url:
         distributor = xmlrpclib.Server(distributor_url)
+    else:
+        # without a distributor, the ants of a generation are evaluated on a
+        # local pool of processes if numberOfProcesses asks for it
+        pool = self.createProcessPool(data)
+    try:
+        return self._run(data, distributor, pool)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+  def _run(self, data, distributor, pool):
+    """Evaluates the generations of ants, with the distributor or the pool if
+    given.
+    """
 
-    tested_ants = set()
+    tested_ants = FingerprintSet()
     start = time.time()         # start counting execution time
 
     # the list of options collated into a dictionary for ease of referencing in
@@ -71,13 +88,13 @@ class ACO(plugin.ExecutionPlugin):
             # TODO: function to calculate ant id. Store ant id in ant dict
             ant_key = repr(ant)
             # if the ant was not already tested, only then test it
-            if ant_key not in tested_ants:
-                tested_ants.add(ant_key)
+            if tested_ants.add(ant):
 
-                # set scheduling rule on queues based on ant data
+                # set scheduling rule on queues based on ant data. Only the
+                # modified nodes are copied, the rest is shared by the ants
                 ant_data = copy(data)
                 for k, v in ant.items():
-                    ant_data["graph"]["node"][k]['schedulingRule'] = v
+                    self.copyOnWrite(ant_data, "graph", "node", k)['schedulingRule'] = v
 
                 ant['key'] = ant_key
                 ant['input'] = ant_data
@@ -85,9 +102,12 @@ class ACO(plugin.ExecutionPlugin):
                 scenario_list.append(ant)
 
         if distributor is None:
-            # synchronous
-            for ant in scenario_list:
-                ant['result'] = self.runOneScenario(ant['input'])['result']
+            # synchronous, or on the local pool of processes. Results are in
+            # the same order as the scenarios, as with the distributor
+            result_list = self.runScenarioList(
+                [ant['input'] for ant in scenario_list], pool=pool)
+            for ant, result in zip(scenario_list, result_list):
+                ant['result'] = result['result']
 
         else: # asynchronous
             self.logger.info("Registering a job for %s scenarios" % len(scenario_list))
@@ -110,17 +130,17 @@ class ACO(plugin.ExecutionPlugin):
 
         for ant in scenario_list:
             ant['score'] = self._calculateAntScore(ant)
+            # the fingerprint of the output, without the execution time
+            result, = ant['result']['result_list']
+            ant['result_fingerprint'] = resultFingerprint(result)
 
         ants.extend(scenario_list)
 
         # remove ants that outputs the same schedules
         # XXX we in fact remove ands that produce the same output json
-        ants_without_duplicates = dict()
+        ants_without_duplicates = OrderedDict()
         for ant in ants:
-            ant_result, = copy(ant['result']['result_list'])
-            ant_result['general'].pop('totalExecutionTime', None)
-            ant_result = json.dumps(ant_result, sort_keys=True)
-            ants_without_duplicates[ant_result] = ant
+            ants_without_duplicates[ant['result_fingerprint']] = ant
 
         # The ants in this generation are ranked based on their scores and the
         # best (max_results) are selected
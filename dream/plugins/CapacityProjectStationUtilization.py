@@ -44,14 +44,17 @@ class CapacityProjectStationUtilization(plugin.OutputPreparationPlugin):
     }
 
 
-    i = 0
-    for obj in result['elementList']:
-      if obj.get('family') == self.configuration_dict.get('family'):
-        if obj['results']['meanUtilization']:
-          utilized_data.append((i, obj['results']['meanUtilization']*100))
-          idle_data.append((i, (1- obj['results']['meanUtilization'])*100))
+    # the stations are listed by id, the order of the elementList (and of the
+    # nodes of the model) is the arbitrary order of a dict
+    station_list = [obj for obj in result['elementList']
+                    if obj.get('family') == self.configuration_dict.get('family')]
+    station_list.sort(key=lambda obj: obj['id'])
 
-        ticks.append((i, obj.get('name', self.getNameFromId(data, obj['id']))))
-        i += 1
+    for (i, obj) in enumerate(station_list):
+      if obj['results']['meanUtilization']:
+        utilized_data.append((i, obj['results']['meanUtilization']*100))
+        idle_data.append((i, (1- obj['results']['meanUtilization'])*100))
+
+      ticks.append((i, obj.get('name', self.getNameFromId(data, obj['id']))))
   
     return data
@@ -7,7 +7,11 @@ class GatherWIPStat(plugin.InputPreparationPlugin):
     """
     # by default we add an event generator if using queue stats
     if data["application_configuration"]["output"]["view_queue_stats"]:
+      # optional recording options (changeOnly, interval, maxLength), see WipStatRecorder
+      wip_stat_options = self.configuration_dict.get('wip_stat_options')
       for node in data["graph"]["node"].values():
         if node['_class'] in ('Dream.Queue', ):
           node['gatherWipStat'] = 1
+          if wip_stat_options:
+            node['wipStatOptions'] = wip_stat_options
     return data
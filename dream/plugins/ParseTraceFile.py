@@ -1,18 +1,63 @@
+from StringIO import StringIO
+
 from dream.plugins import plugin
+from dream.simulation.TraceSink import readTrace, readRoute, exportToExcel
 
 class ParseTraceFile(plugin.OutputPreparationPlugin):
   """ Output the result of demand planning in a format compatible with
-  Output_viewDownloadFile
+  Output_viewDownloadFile.
+
+  The trace written by the simulation is converted to an excel file, unless
+  the export_format of the configuration is 'raw', in which case the trace
+  file is output as it is. Results without a version hold the excel file of
+  the trace already, they are output as they are.
   """
 
-  def postprocess(self, data):  
-    outPutFile=None
+  mime_type_dict = {'csv': 'text/csv',
+                    'jsonl': 'application/json',
+                    'csv.gz': 'application/gzip',
+                    'jsonl.gz': 'application/gzip'}
+
+  def _openTraceFile(self, trace, key):
+    """Returns the file of the trace (key 'data') or of the route (key
+    'routeData'), given either encoded or as a path.
+    """
+    if trace.get(key):
+      return StringIO(trace[key].decode('base64'))
+    return trace.get(key == 'data' and 'path' or 'routePath')
+
+  def postprocess(self, data):
+    trace = None
     for record in data['result']['result_list'][-1]['elementList']:
         if record.get('id',None)=='TraceFile':
-            outPutFile=record['results']['trace']
+            trace=record['results']
+    outPutFile = None
+    name = 'Trace.xls'
+    mime_type = 'application/vnd.ms-excel'
+    if trace and 'version' not in trace:
+      outPutFile = trace['trace']
+    elif trace:
+      trace_format = trace['format']
+      trace_file = self._openTraceFile(trace, 'data')
+      if self.configuration_dict.get('export_format', 'xls') == 'raw':
+        if isinstance(trace_file, basestring):
+          with open(trace_file, 'rb') as f:
+            outPutFile = f.read().encode('base64')
+        else:
+          outPutFile = trace['data']
+        name = 'Trace.' + trace_format
+        mime_type = self.mime_type_dict[trace_format]
+      else:
+        route = None
+        route_file = self._openTraceFile(trace, 'routeData')
+        if route_file:
+          route = readRoute(route_file, trace_format)
+        excel_file = StringIO()
+        exportToExcel(readTrace(trace_file, trace_format), route).save(excel_file)
+        outPutFile = excel_file.getvalue().encode('base64')
     data['result']['result_list'][-1][self.configuration_dict['output_id']] = {
-          'name': 'Trace.xls',
-          'mime_type': 'application/vnd.ms-excel',
+          'name': name,
+          'mime_type': mime_type,
           'data': outPutFile
         }
     return data
@@ -0,0 +1,171 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# the packages whose code computes the results of a scenario
+code_package_list = ('simulation', 'plugins')
+code_version = None
+
+def getCodeVersion():
+  """Returns a hash of the code computing the results, so that the results
+  cached by another version of the code are not used.
+  """
+  global code_version
+  if code_version is None:
+    dream_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code_hash = hashlib.sha1()
+    for package in code_package_list:
+      for directory, directory_list, filename_list in sorted(
+          os.walk(os.path.join(dream_path, package))):
+        directory_list.sort()
+        for filename in sorted(filename_list):
+          if filename.endswith('.py'):
+            path = os.path.join(directory, filename)
+            code_hash.update(os.path.relpath(path, dream_path))
+            with open(path, 'rb') as f:
+              code_hash.update(f.read())
+    code_version = code_hash.hexdigest()
+  return code_version
+
+class ScenarioCache(object):
+  """Cache of the results of simulated scenarios, keyed by a hash of the
+  canonical json of their input and of the version of the code.
+
+  The most recently used max_size results are kept in memory. If a path is
+  given, the results are also stored as files in this directory, so that they
+  are shared between processes and kept across restarts. At most
+  max_disk_size files are kept, the least recently used ones are removed
+  first, which also drops the results of previous versions of the code.
+
+  Only scenarios with a seed are cached: without a seed a stochastic scenario
+  gives a different result on every run.
+  """
+  def __init__(self, max_size=128, path=None, max_disk_size=1024,
+               version=None):
+    self.max_size = max_size
+    self.path = path
+    self.max_disk_size = max_disk_size
+    self.version = version
+    if path and not os.path.isdir(path):
+      os.makedirs(path)
+    self.lock = threading.Lock()
+    self.result_dict = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+
+  def getKey(self, data):
+    """Returns the key of a scenario, or None if it should not be cached.
+    The result of a previous run, if any, is not part of the key.
+    """
+    if not self.max_size and not self.path:
+      return None
+    general = data.get('general', {})
+    if not general.get('seed'):
+      return None
+    # the results of the traces kept in files only point to these files
+    if general.get('trace') == 'Yes' and general.get('traceDirectory'):
+      return None
+    data = dict(data)
+    data.pop('result', None)
+    key_hash = hashlib.sha1(self.version or getCodeVersion())
+    key_hash.update(json.dumps(data, sort_keys=True, separators=(',', ':')))
+    return key_hash.hexdigest()
+
+  def _getPath(self, key):
+    return os.path.join(self.path, key + '.json')
+
+  def get(self, key):
+    """Returns the result stored for the key, as a json string, or None.
+    """
+    with self.lock:
+      result = self.result_dict.pop(key, None)
+      if result is not None:
+        # move to the most recently used end
+        self.result_dict[key] = result
+        self.hits += 1
+        return result
+    if self.path:
+      path = self._getPath(key)
+      try:
+        with open(path) as f:
+          result = f.read()
+      except IOError:
+        pass
+      else:
+        try:
+          # mark the file as recently used
+          os.utime(path, None)
+        except OSError:
+          pass
+        self._remember(key, result)
+        with self.lock:
+          self.hits += 1
+        return result
+    with self.lock:
+      self.misses += 1
+    return None
+
+  def set(self, key, result):
+    """Stores the result of a scenario, as a json string.
+    """
+    self._remember(key, result)
+    if self.path:
+      path = self._getPath(key)
+      # write in a temporary file and rename, so that other processes never
+      # read a partially written result
+      tmp_path = '%s.%s.tmp' % (path, os.getpid())
+      with open(tmp_path, 'w') as f:
+        f.write(result)
+      os.rename(tmp_path, path)
+      self._prune()
+
+  def _prune(self):
+    """Removes the least recently used files above max_disk_size.
+    """
+    if not self.max_disk_size:
+      return
+    file_list = []
+    for filename in os.listdir(self.path):
+      if filename.endswith('.json'):
+        path = os.path.join(self.path, filename)
+        try:
+          file_list.append((os.path.getmtime(path), path))
+        except OSError:
+          # removed by another process
+          pass
+    file_list.sort()
+    for mtime, path in file_list[:len(file_list) - self.max_disk_size]:
+      try:
+        os.remove(path)
+      except OSError:
+        pass
+
+  def _remember(self, key, result):
+    if not self.max_size:
+      return
+    with self.lock:
+      self.result_dict.pop(key, None)
+      self.result_dict[key] = result
+      while len(self.result_dict) > self.max_size:
+        self.result_dict.popitem(last=False)
+
+  def clear(self):
+    with self.lock:
+      self.result_dict.clear()
+      self.hits = self.misses = 0
+
+# the cache shared by all the execution plugins of the process
+scenario_cache = ScenarioCache()
+
+def configureScenarioCache(max_size=128, path=None, max_disk_size=1024):
+  """Replaces the shared scenario cache, e.g. to persist it on disk.
+  """
+  global scenario_cache
+  scenario_cache = ScenarioCache(max_size=max_size, path=path,
+                                 max_disk_size=max_disk_size)
+  return scenario_cache
+
+def getScenarioCache():
+  return scenario_cache
@@ -1,10 +1,13 @@
-from copy import deepcopy
+from copy import copy, deepcopy
 import json
 import numpy
+import multiprocessing
 
 from zope.dottedname.resolve import resolve
 
 from dream.simulation.LineGenerationJSON import main as simulate_line_json
+from dream.simulation.SimulationContext import SimulationContext
+from dream.plugins.cache import getScenarioCache
 
 class Plugin(object):
   """Base class for pre-post processing Plugin.
@@ -52,17 +55,76 @@ class Plugin(object):
   def getStDev(self, value_list):
     return numpy.std(value_list)
 
+  # makes the dicts along the path in data private copies and returns the last
+  # one, so that it can be modified without modifying the original. data
+  # must itself be a copy owned by the caller, everything else stays shared
+  def copyOnWrite(self, data, *path):
+    for key in path:
+      data[key] = copy(data[key])
+      data = data[key]
+    return data
+
   # returns name of a node given its id
   def getNameFromId(self, data, node_id):
       return data['graph']['node'][node_id]['name']
 
+def _runScenarioInWorker(input_data):
+  """Runs one scenario in a process of the pool of ExecutionPlugin.runScenarioList.
+  The input and the result are passed as json strings.
+  """
+  return simulate_line_json(input_data=input_data, context=SimulationContext())
+
 class ExecutionPlugin(Plugin):
   """Plugin to handle the execution of multiple simulation runs.
   """
   def runOneScenario(self, data):
-    """default method for running one scenario
+    """default method for running one scenario. Every scenario runs in its
+    own simulation context, so no state is left over between scenarios.
+    The results of seeded scenarios are kept in the scenario cache.
     """
-    return json.loads(simulate_line_json(input_data=json.dumps(data)))
+    cache = getScenarioCache()
+    key = cache.getKey(data)
+    result = key and cache.get(key)
+    if result is None:
+      result = simulate_line_json(input_data=json.dumps(data),
+                                  context=SimulationContext())
+      if key:
+        cache.set(key, result)
+    return json.loads(result)
+
+  def createProcessPool(self, data):
+    """Returns a pool of processes to run scenarios on, if the numberOfProcesses
+    general property asks for more than one process (0 meaning one process per
+    cpu), or None.
+    """
+    number_of_processes = int(data['general'].get('numberOfProcesses', 1))
+    if number_of_processes <= 0:
+      number_of_processes = multiprocessing.cpu_count()
+    if number_of_processes <= 1:
+      return None
+    # daemonic processes (e.g. the ones of a pool) are not allowed to have children
+    if multiprocessing.current_process().daemon:
+      self.logger.info("scenarios cannot run in parallel in a daemonic process")
+      return None
+    return multiprocessing.Pool(number_of_processes)
+
+  def runScenarioList(self, data_list, pool=None):
+    """Runs the scenarios and returns their results in the same order. If a
+    pool of processes is given, the scenarios run concurrently on it.
+    """
+    if pool is None:
+      return [self.runOneScenario(data) for data in data_list]
+    # only the scenarios that are not in the cache are sent to the pool
+    cache = getScenarioCache()
+    key_list = [cache.getKey(data) for data in data_list]
+    result_list = [key and cache.get(key) for key in key_list]
+    missing_list = [i for i, result in enumerate(result_list) if result is None]
+    for i, result in zip(missing_list, pool.map(_runScenarioInWorker,
+        [json.dumps(data_list[i]) for i in missing_list], chunksize=1)):
+      result_list[i] = result
+      if key_list[i]:
+        cache.set(key_list[i], result)
+    return [json.loads(result) for result in result_list]
 
   def run(self, data):
     """General execution plugin.
@@ -105,7 +167,10 @@ class DefaultExecutionPlugin(ExecutionPlugin):
 class PluginRegistry(object):
   """Registry of plugins.
   """
-  def __init__(self, logger, data):
+  def __init__(self, logger, data, progress=None):
+    # progress, if given, is called as progress(done, total, message) after
+    # each step of run
+    self.progress = progress
 
     self.input_preparation_list = []
     for plugin_data in data['application_configuration']['pre_processing']['plugin_list']:
@@ -120,13 +185,29 @@ class PluginRegistry(object):
 
   def run(self, data):
     """Preprocess, execute & postprocess.
+
+    data is copied once, so that it is not modified. The plugins then work on
+    the data returned by the previous one, which is not used by anyone else.
     """
+    total = len(self.input_preparation_list) + 1 + len(self.output_preparation_list)
+    done = 0
+    data = deepcopy(data)
     for input_preparation in self.input_preparation_list:
-        data = input_preparation.preprocess(deepcopy(data))
+        data = input_preparation.preprocess(data)
+        done += 1
+        self.reportProgress(done, total, input_preparation)
 
     data = self.execution_plugin.run(data)
+    done += 1
+    self.reportProgress(done, total, self.execution_plugin)
 
     for output_preparation in self.output_preparation_list:
-        data = output_preparation.postprocess(deepcopy(data))
+        data = output_preparation.postprocess(data)
+        done += 1
+        self.reportProgress(done, total, output_preparation)
 
     return data
+
+  def reportProgress(self, done, total, plugin):
+    if self.progress is not None:
+      self.progress(done, total, plugin.__class__.__name__)
@@ -62,7 +62,7 @@ class Assembly(CoreObject):
             processingTime['Normal']['max'] = float(processingTime['Normal']['mean']) + 5 * float(processingTime['Normal']['stdev'])
     
         CoreObject.__init__(self, id, name)
-        self.rng=RandomNumberGenerator(self, processingTime)
+        self.rng=RandomNumberGenerator(self, processingTime, purpose='processing')
         
          # ============================== variable that is used for the loading of machines =============
         self.exitAssignedToReceiver = False             # by default the objects are not blocked 
@@ -88,7 +88,7 @@ class Assembly(CoreObject):
               processingTime.get('max', None) is None:
             processingTime['max'] = float(processingTime['mean']) + 5 * float(processingTime['stdev'])
 
-        self.rng=RandomNumberGenerator(self, **processingTime)
+        self.rng=RandomNumberGenerator(self, purpose='processing', **processingTime)
         
          # ============================== variable that is used for the loading of machines =============
         self.exitAssignedToReceiver = False             # by default the objects are not blocked 
@@ -169,7 +169,7 @@ class Assembly(CoreObject):
                 
                 self.expectedSignals['isRequested']=0
                 
-                self.outputTrace(self.getActiveObjectQueue()[0].name, "is now full in "+ self.objName)
+                self.outputTrace(self.getActiveObjectQueue()[0].name, "is now full in "+ self.objName, kind='full')
             
                 self.isProcessing=True
                 self.timeLastFrameWasFull=self.env.now
@@ -181,7 +181,7 @@ class Assembly(CoreObject):
                 self.totalWorkingTime+=self.env.now-self.timeLastProcessingStarted
                 self.isProcessing=False
             
-                self.outputTrace(self.getActiveObjectQueue()[0].name, "ended processing in " + self.objName)
+                self.outputTrace(self.getActiveObjectQueue()[0].name, "ended processing in " + self.objName, kind='processingEnd')
                 self.timeLastEntityEnded=self.env.now
                 self.nameLastEntityEnded=self.getActiveObjectQueue()[0].name
             
@@ -356,7 +356,7 @@ class Assembly(CoreObject):
         #remove the entity from the previews object
         giverObject.removeEntity(activeEntity)     
         self.printTrace(activeEntity.name, enter=self.id)
-        self.outputTrace(activeEntity.name, "got into "+ self.objName)
+        self.outputTrace(activeEntity.name, "got into "+ self.objName, kind='enter')
         # if the type is Frame 
         if(activeEntity.type=="Frame"):
             self.nameLastEntityEntered=activeEntity.name
@@ -33,6 +33,7 @@ from SubBatch import SubBatch
 #===============================================================================
 class Batch(Entity):
     type="Batch"
+    __slots__=('numberOfSubBatches', 'subBatchList', 'unitsToProcess')
 
     def __init__(self, id, name, numberOfUnits=1, currentStation=None, 
                  remainingProcessingTime=0, unitsToProcess=0, **kw):
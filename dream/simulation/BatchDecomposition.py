@@ -60,7 +60,7 @@ class BatchDecomposition(CoreObject):
         # sets the operator resource of the Machine
         self.operator=operator         
         # Sets the attributes of the processing (and failure) time(s)
-        self.rng=RandomNumberGenerator(self, processingTime)
+        self.rng=RandomNumberGenerator(self, processingTime, purpose='processing')
         from Globals import G
         G.BatchDecompositionList.append(self)
 
@@ -236,19 +236,19 @@ class BatchDecomposition(CoreObject):
             subBatch=SubBatch(str(activeEntity.id)+'_'+str(i), activeEntity.name+"_SB_"\
                             +str(i), numberOfUnits=numberOfSubBatchUnits,
                             parentBatch=activeEntity)    #create the sub-batch
-            self.outputTrace(subBatch.name,'was created from '+ activeEntity.name)
+            self.outputTrace(subBatch.name,'was created from '+ activeEntity.name, kind='create')
             #===================================================================
             # TESTING
 #             print self.env.now, subBatch.name,'was created from '+ activeEntity.name
             #===================================================================
-            G.EntityList.append(subBatch)
+            self.context.EntityList.append(subBatch)
             activeObjectQueue.append(subBatch)                          #append the sub-batch to the active object Queue
             #activeEntity.subBatchList.append(subBatch)
             subBatch.currentStation=self
             # if the activeEntity is in the pendingEntities list then place the subBatches there
-            if activeEntity in G.pendingEntities:
-                G.pendingEntities.append(subBatch)
-                G.pendingEntities.remove(activeEntity)
+            if activeEntity in self.context.pendingEntities:
+                self.context.pendingEntities.append(subBatch)
+                self.context.pendingEntities.remove(activeEntity)
         activeEntity.numberOfSubBatches=self.numberOfSubBatches
         self.timeLastEntityEnded=self.env.now
 
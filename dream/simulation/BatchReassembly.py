@@ -59,7 +59,7 @@ class BatchReassembly(CoreObject):
         # sets the operator resource of the Machine
         self.operator=operator         
         # Sets the attributes of the processing (and failure) time(s)
-        self.rng=RandomNumberGenerator(self, processingTime)
+        self.rng=RandomNumberGenerator(self, processingTime, purpose='processing')
         from Globals import G
         G.BatchReassemblyList.append(self)
         # flag to show if the objects outputs results
@@ -236,11 +236,11 @@ class BatchReassembly(CoreObject):
         # the batch to be reassembled
         batchToBeReassembled = activeObjectQueue[0].parentBatch
         # if the activeEntity is in the pendingEntities list then place the subBatches there
-        if activeObjectQueue[0] in G.pendingEntities:
-            G.pendingEntities.append(batchToBeReassembled)
-            if G.Router:
+        if activeObjectQueue[0] in self.context.pendingEntities:
+            self.context.pendingEntities.append(batchToBeReassembled)
+            if self.context.Router:
                 for entity in activeObjectQueue:
-                    G.pendingEntities.remove(entity)
+                    self.context.pendingEntities.remove(entity)
         
         del activeObjectQueue[:]
         batchToBeReassembled.numberOfSubBatches = 1
@@ -248,7 +248,7 @@ class BatchReassembly(CoreObject):
         activeObjectQueue.append(batchToBeReassembled)
         batchToBeReassembled.currentStation=self
         self.timeLastEntityEnded=self.env.now
-        self.outputTrace(batchToBeReassembled.name, 'was reassembled')
+        self.outputTrace(batchToBeReassembled.name, 'was reassembled', kind='reassemble')
         
     # =======================================================================
     #     returns True if the object doensn't hold entities of type Batch
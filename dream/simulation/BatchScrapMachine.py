@@ -67,7 +67,7 @@ class BatchScrapMachine(Machine):
         if not scrapQuantity:
             scrapQuantity = {'Fixed':{'mean': 0}}
             
-        self.scrapRng=RandomNumberGenerator(self, scrapQuantity)
+        self.scrapRng=RandomNumberGenerator(self, scrapQuantity, purpose='scrap')
         from Globals import G
         G.BatchScrapMachineList.append(self)
 
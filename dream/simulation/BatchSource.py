@@ -42,7 +42,7 @@ class BatchSource(Source):
         
     def createEntity(self):
         # return the newly created Entity
-        return self.item(id = self.item.type+str(G.numberOfEntities), \
+        return self.item(id = self.item.type+str(self.context.numberOfEntities), \
                          name = self.item.type+str(self.numberOfArrivals), numberOfUnits=self.numberOfUnits)
         
         
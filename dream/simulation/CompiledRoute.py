@@ -0,0 +1,141 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+the route of a Job read once into a table. The steps of the route are indexed by the ids
+of their stations, so that the step a Job is processed in is found without scanning the
+route, and the required parts of the steps are resolved once. The table also keeps the 
+station objects of every step and the fixed processing time remaining from every step 
+to the end of the route, used by the scheduling rules
+'''
+
+# ===========================================================================
+# the compiled route
+# ===========================================================================
+class CompiledRoute(object):
+
+    def __init__(self, route=[]):
+        from Globals import findObjectById
+        from SchedulingRules import getStepProcessingTime
+        self.route=route
+        self.sequences=[]               # the sequence of every step (0 if not given)
+        self.operators=[]               # the id of the responsible operator of every step (None if not given)
+        self.stations=[]                # the station objects of every step (the ids that are not found are left out)
+        self.stepByStationId={}         # dict station id -> index of the first step with the station
+        self.stepIndex={}               # dict id(step) -> index of the step
+        self.requiredParts={}           # dict id(step) -> (step, list of the required parts)
+        processingTimes=[]
+        for (index, step) in enumerate(route):
+            self.sequences.append(step.get('sequence',0))
+            self.operators.append(step.get('operator',None))
+            self.stepIndex[id(step)]=index
+            stations=[]
+            for stationId in step.get('stationIdsList',[]):
+                self.stepByStationId.setdefault(stationId, index)
+                station=findObjectById(stationId)
+                if station is not None:
+                    stations.append(station)
+            self.stations.append(stations)
+            processingTimes.append(getStepProcessingTime(step))
+        # the fixed processing time from every step to the end of the route, summed
+        # from the step on as the scheduling rules sum the remaining route
+        self.remainingProcessingTimes=[sum(processingTimes[index:]) for index in range(len(route))]
+
+    #===========================================================================
+    # returns the index of the step in the route, None if the step is not one of the
+    # route (e.g. a step inserted in the remaining route of the Job)
+    #===========================================================================
+    def getIndex(self, step):
+        index=self.stepIndex.get(id(step), None)
+        if index is None or self.route[index] is not step:
+            return None
+        return index
+
+    #===========================================================================
+    # returns the fixed processing time of the remaining route, None if the remaining
+    # route is not the end of the route (steps were inserted at its start)
+    #===========================================================================
+    def getRemainingProcessingTime(self, remainingRoute):
+        if not remainingRoute:
+            return 0
+        index=self.getIndex(remainingRoute[0])
+        # the remaining route is only consumed or extended from its start
+        if index is None or len(self.route)-index!=len(remainingRoute):
+            return None
+        return self.remainingProcessingTimes[index]
+
+    #===========================================================================
+    # returns the station objects of the step, None if the step is not one of the route
+    #===========================================================================
+    def getStations(self, step):
+        index=self.getIndex(step)
+        if index is None:
+            return None
+        return self.stations[index]
+
+    #===========================================================================
+    # returns the index of the first step of the route that the station can perform (None if no step)
+    #===========================================================================
+    def getStepIndex(self, stationId):
+        return self.stepByStationId.get(stationId, None)
+
+    #===========================================================================
+    # returns the sequence of the step the station performs (0 if there is no such step)
+    #===========================================================================
+    def getSequence(self, stationId):
+        index=self.stepByStationId.get(stationId, None)
+        if index is None:
+            return 0
+        return self.sequences[index]
+
+    #===========================================================================
+    # returns the id of the responsible operator of the step the station performs
+    #===========================================================================
+    def getOperator(self, stationId):
+        index=self.stepByStationId.get(stationId, None)
+        if index is None:
+            return None
+        return self.operators[index]
+
+    #===========================================================================
+    # returns the objects of the required parts of a step. The parts are resolved
+    # once per step, as soon as all of them exist
+    #===========================================================================
+    def getRequiredParts(self, step):
+        cached=self.requiredParts.get(id(step), None)
+        if cached and cached[0] is step:
+            return cached[1]
+        requiredParts=[]
+        resolved=True
+        requiredPartsIDs=step.get('requiredParts',[])
+        if requiredPartsIDs:
+            from Globals import findObjectById
+            for partID in requiredPartsIDs:
+                # find the objects with the corresponding IDs
+                part=findObjectById(partID)
+                if part is None:
+                    resolved=False
+                if not part in requiredParts:
+                    requiredParts.append(part)
+        if resolved:
+            self.requiredParts[id(step)]=(step, requiredParts)
+        return requiredParts
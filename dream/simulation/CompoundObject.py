@@ -351,7 +351,7 @@ class CompoundObject(CoreObject,Queue):
             print "Receiver object error: {0}".format(receiverError)
             
         try:
-            self.outputTrace(activeEntity.name, "released "+ self.objName)
+            self.outputTrace(activeEntity.name, "released "+ self.objName, kind='release')
         except TypeError:
             pass
         return activeEntity
@@ -27,13 +27,18 @@ Class that acts as an abstract. It should have no instances. All the core-object
 
 # from SimPy.Simulation import Process, Resource, now, SimEvent, waitevent
 import simpy
-from ManPyObject import ManPyObject
+from ManPyObject import ManPyObject, ExpectedSignals
 
 # ===========================================================================
 # the core object
 # ===========================================================================
 class CoreObject(ManPyObject):
     class_name = 'Dream.CoreObject'
+    registryCategory='CoreObject'
+    # the lists holding the statistics of multiple runs, one item per replication
+    # (merged from the replications that run on other models, see LineGenerationJSON)
+    replicationResults=('Failure', 'Working', 'Blockage', 'Waiting', 'OffShift', 'WaitingForOperator',
+                        'WaitingForLoadOperator', 'Loading', 'SettingUp', 'WipStat')
     
     def __init__(self, id, name, **kw):
         ManPyObject.__init__(self,id,name)
@@ -63,6 +68,8 @@ class CoreObject(ManPyObject):
         self.resetOnPreemption=False
         self.interruptCause=None
         self.gatherWipStat=False
+        # options of the WipStatRecorder (changeOnly, interval, maxLength)
+        self.wipStatOptions={}
         # flag used to signal that the station waits for removeEntity event
         self.waitEntityRemoval=False
         # attributes/indices used for printing the route, hold the cols corresponding to the object (entities route and operators route) 
@@ -72,7 +79,7 @@ class CoreObject(ManPyObject):
         from Globals import G
         G.ObjList.append(self)  # add object to ObjList
         # list of expected signals of a station (values can be used as flags to inform on which signals is the station currently yielding)
-        self.expectedSignals={
+        self.expectedSignals=ExpectedSignals({
                                 "isRequested":0,
                                 "canDispose":0,
                                 "interruptionStart":0,
@@ -85,7 +92,7 @@ class CoreObject(ManPyObject):
                                 "entityCreated":0,
                                 "moveEnd":0,
                                 "processOperatorUnavailable":0
-                              }
+                              })
         # flag notifying the the station can deliver entities that ended their processing while interrupted
         self.canDeliverOnInterruption=False
         # keep wip stats for every replication
@@ -185,8 +192,8 @@ class CoreObject(ManPyObject):
         # initialize the wipStatList - 
         # TODO, think what to do in multiple runs
         # TODO, this should be also updated in Globals.setWIP (in case we have initial wip)
-        import numpy as np
-        self.wipStatList=np.array([[0,0]])
+        from WipStatRecorder import WipStatRecorder
+        self.wipStatList=WipStatRecorder(**self.wipStatOptions)
 
         self.isRequested=self.env.event()
         self.canDispose=self.env.event()
@@ -215,7 +222,7 @@ class CoreObject(ManPyObject):
         self.isBlocked=False
         self.timeLastBlockageStarted=None
         # list of expected signals of a station (values can be used as flags to inform on which signals is the station currently yielding)
-        self.expectedSignals={
+        self.expectedSignals=ExpectedSignals({
                                 "isRequested":0,
                                 "canDispose":0,
                                 "interruptionStart":0,
@@ -227,7 +234,7 @@ class CoreObject(ManPyObject):
                                 "entityRemoved":0,
                                 "entityCreated":0,
                                 "moveEnd":0
-                              }
+                              })
         # lists that keep the start/endShiftTimes of the victim
         self.endShiftTimes=[]
         self.startShiftTimes=[]
@@ -293,7 +300,7 @@ class CoreObject(ManPyObject):
         self.offShiftTimeTryingToReleaseCurrentEntity=0
         
         self.timeLastEntityLeft=self.env.now
-        self.outputTrace(entity.name, "released "+self.objName)
+        self.outputTrace(entity.name, "released "+self.objName, kind='release')
         
         #append the time to schedule so that it can be read in the result
         #remember that every entity has it's schedule which is supposed to be updated every time 
@@ -303,8 +310,7 @@ class CoreObject(ManPyObject):
         
         # update wipStatList
         if self.gatherWipStat:
-            import numpy
-            self.wipStatList=numpy.concatenate((self.wipStatList,[[self.env.now, len(activeObjectQueue)]]))   
+            self.wipStatList.record(self.env.now, len(activeObjectQueue))
         if self.expectedSignals['entityRemoved']:
             self.printTrace(self.id, signal='(removedEntity)')
             self.sendSignal(receiver=self, signal=self.entityRemoved)
@@ -377,7 +383,7 @@ class CoreObject(ManPyObject):
         self.nameLastEntityEntered=activeEntity.name      # this holds the name of the last entity that got into object      
         # update the next list of the object
         self.updateNext(activeEntity)
-        self.outputTrace(activeEntity.name, "got into "+self.objName)
+        self.outputTrace(activeEntity.name, "got into "+self.objName, kind='enter')
         self.printTrace(activeEntity.name, enter=self.id)
 #         # if there are entities with requiredParts then check whether the requirements are fulfilled for them to proceed
 #         #     ass soon as a "buffer" receives an entity it controls if the entity is requested elsewhere,
@@ -459,18 +465,14 @@ class CoreObject(ManPyObject):
                     activeObjectQueue.sort(key=lambda x: x==activeEntity, reverse=True)
         # update wipStatList
         if self.gatherWipStat:
-            import numpy
-            self.wipStatList=numpy.concatenate((self.wipStatList,[[self.env.now, len(activeObjectQueue)]]))   
+            self.wipStatList.record(self.env.now, len(activeObjectQueue))
     
     #===========================================================================
     # find possible receivers
     #===========================================================================
     @staticmethod
     def findReceiversFor(activeObject):
-        receivers=[]
-        for object in [x for x in activeObject.next if x.canAccept(activeObject) and not x.isRequested.triggered and x.expectedSignals['isRequested']]:
-            receivers.append(object)
-        return receivers
+        return [x for x in activeObject.next if x.canAccept(activeObject) and not x.isRequested.triggered and x.expectedSignals['isRequested']]
         
     # =======================================================================
     # signal the successor that the object can dispose an entity 
@@ -478,19 +480,14 @@ class CoreObject(ManPyObject):
     def signalReceiver(self):
         possibleReceivers=self.findReceiversFor(self)
         if possibleReceivers:
-            receiver=self.selectReceiver(possibleReceivers)
-            receiversGiver=self
             # perform the checks that canAcceptAndIsRequested used to perform and update activeCallersList or assignExit and operatorPool
-            while not receiver.canAcceptAndIsRequested(receiversGiver):
-                possibleReceivers.remove(receiver)
-                if not possibleReceivers:
-                    receiversGiver=None
-                    receiver=None
-                    # if no receiver can accept then try to preempt a receive if the stations holds a critical order
-                    self.preemptReceiver()
-                    return False
-                receiver=self.selectReceiver(possibleReceivers)
-                receiversGiver=self
+            for receiver in self.orderReceivers(possibleReceivers):
+                if receiver.canAcceptAndIsRequested(self):
+                    break
+            else:
+                # if no receiver can accept then try to preempt a receive if the stations holds a critical order
+                self.preemptReceiver()
+                return False
             # sorting the entities of the object for the receiver
             self.sortEntitiesForReceiver(receiver)
             # signalling the Router if the receiver is operated and not assigned an operator
@@ -511,6 +508,35 @@ class CoreObject(ManPyObject):
         self.preemptReceiver()
         return False
     
+    #===========================================================================
+    # generates the possible receivers in the order selectReceiver would pick them
+    # one after the other. The first one is selected, the others are only sorted
+    # if the first one cannot accept
+    #===========================================================================
+    def orderReceivers(self, possibleReceivers):
+        receiver=self.selectReceiver(possibleReceivers)
+        yield receiver
+        possibleReceivers=[x for x in possibleReceivers if x is not receiver]
+        if self.selectReceiver is not CoreObject.selectReceiver:
+            # selectReceiver is overridden, select the receivers one by one
+            while possibleReceivers:
+                receiver=self.selectReceiver(possibleReceivers)
+                yield receiver
+                possibleReceivers.remove(receiver)
+            return
+        # the longest waiting first, the first of the list among equals.
+        # The receivers that are not waiting come last, the last of the list first
+        now=self.env.now
+        order=[]
+        for (index, object) in enumerate(possibleReceivers):
+            timeWaiting=now-object.timeLastEntityLeft
+            if timeWaiting==0:
+                index=-index
+            order.append((-timeWaiting, index, object))
+        order.sort(key=lambda item: item[:2])
+        for item in order:
+            yield item[2]
+
     # =======================================================================
     # select a receiver Object
     # =======================================================================
@@ -520,9 +546,11 @@ class CoreObject(ManPyObject):
         # dummy variables that help prioritize the objects requesting to give objects to the object (activeObject)
         maxTimeWaiting=0                                            # dummy variable counting the time a successor is waiting
         receiver=None
-        from Globals import G
+        if not candidates:
+            return None
+        now=candidates[0].context.env.now
         for object in candidates:
-            timeWaiting=G.env.now-object.timeLastEntityLeft     # the time it has been waiting is updated and stored in dummy variable timeWaiting
+            timeWaiting=now-object.timeLastEntityLeft     # the time it has been waiting is updated and stored in dummy variable timeWaiting
             if(timeWaiting>maxTimeWaiting or maxTimeWaiting==0):# if the timeWaiting is the maximum among the ones of the successors 
                 maxTimeWaiting=timeWaiting
                 receiver=object                                 # set the receiver as the longest waiting possible receiver
@@ -555,15 +583,12 @@ class CoreObject(ManPyObject):
     def signalGiver(self):
         possibleGivers=self.findGiversFor(self)
         if possibleGivers:
-            giver=self.selectGiver(possibleGivers)
-            giversReceiver=self
             # perform the checks that canAcceptAndIsRequested used to perform and update activeCallersList or assignExit and operatorPool
-            while not self.canAcceptAndIsRequested(giver):
-                possibleGivers.remove(giver)
-                if not possibleGivers:
-                    return False
-                giver=self.selectGiver(possibleGivers)
-                giversReceiver=self
+            for giver in self.orderGivers(possibleGivers):
+                if self.canAcceptAndIsRequested(giver):
+                    break
+            else:
+                return False
             self.giver=giver
             self.giver.receiver=self
             if self.giver.expectedSignals['canDispose'] or (self.giver.canDeliverOnInterruption 
@@ -574,6 +599,28 @@ class CoreObject(ManPyObject):
             return True
         return False
     
+    #===========================================================================
+    # generates the possible givers in the order selectGiver would pick them
+    # one after the other, as orderReceivers
+    #===========================================================================
+    def orderGivers(self, possibleGivers):
+        giver=self.selectGiver(possibleGivers)
+        yield giver
+        possibleGivers=[x for x in possibleGivers if x is not giver]
+        if self.selectGiver is not CoreObject.selectGiver:
+            # selectGiver is overridden, select the givers one by one
+            while possibleGivers:
+                giver=self.selectGiver(possibleGivers)
+                yield giver
+                possibleGivers.remove(giver)
+            return
+        # the longest blocked first, the last of the list among equals
+        now=self.env.now
+        order=[(-(now-object.timeLastEntityEnded), -index, object) for (index, object) in enumerate(possibleGivers)]
+        order.sort(key=lambda item: item[:2])
+        for item in order:
+            yield item[2]
+
     # =======================================================================
     # select a giver Object
     # =======================================================================
@@ -583,11 +630,13 @@ class CoreObject(ManPyObject):
         # dummy variables that help prioritize the objects requesting to give objects to the object (activeObject)
         maxTimeWaiting=0                                            # dummy variable counting the time a predecessor is blocked
         giver=None
-        from Globals import G
+        if not candidates:
+            return None
+        now=candidates[0].context.env.now
         # loop through the possible givers to see which have to dispose and which is the one blocked for longer
         for object in candidates:
             # calculate how much the giver is waiting
-            timeWaiting=G.env.now-object.timeLastEntityEnded   
+            timeWaiting=now-object.timeLastEntityEnded   
             if(timeWaiting>=maxTimeWaiting): 
                 giver=object                 # the object to deliver the Entity to the activeObject is set to the ith member of the previous list
                 maxTimeWaiting=timeWaiting  
@@ -638,12 +687,7 @@ class CoreObject(ManPyObject):
             # if we ran the simulation for infinite time we have to identify the last event
             now=self.env.now
             if now==float('inf'):
-                now=0
-                lastExits=[]
-                for object in G.ExitList:
-                    lastExits.append(object.timeLastEntityEntered)
-                if lastExits:
-                    now=max(lastExits)
+                now=G.timeLastEntityExited
             self.totalOffShiftTime+=now-self.timeLastShiftEnded 
                 
         #object was idle when it was not in any other state    
@@ -664,7 +708,8 @@ class CoreObject(ManPyObject):
         activeObject.Loading.append(100*self.totalLoadTime/MaxSimtime)
         activeObject.SettingUp.append(100*self.totalSetupTime/MaxSimtime)
         activeObject.OffShift.append(100*self.totalOffShiftTime/MaxSimtime)
-        activeObject.WipStat.append(self.wipStatList.tolist())   
+        # kept as an array, it is converted to a list in the JSON output
+        activeObject.WipStat.append(self.wipStatList.toArray().copy())
        
     # =======================================================================
     # outputs results to JSON File 
@@ -758,7 +803,7 @@ class CoreObject(ManPyObject):
             if activeEntity.remainingProcessingTime:
                 remainingProcessingTime=activeEntity.remainingProcessingTime
                 from RandomNumberGenerator import RandomNumberGenerator
-                initialWIPrng=RandomNumberGenerator(self, remainingProcessingTime)
+                initialWIPrng=RandomNumberGenerator(self, remainingProcessingTime, purpose='initialWIP')
                 return initialWIPrng.generateNumber()
         return self.rng.generateNumber()           # this is if we have a default processing time for all the entities
     
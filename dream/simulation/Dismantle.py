@@ -72,7 +72,7 @@ class Dismantle(CoreObject):
                 processingTime['Normal'].get('max', None) is None:
             processingTime['Normal']['max'] = float(processingTime['Normal']['mean']) + 5 * float(processingTime['Normal']['stdev'])
 
-        self.rng=RandomNumberGenerator(self, processingTime)   
+        self.rng=RandomNumberGenerator(self, processingTime, purpose='processing')   
                                     
     #===========================================================================
     # the initialize method
@@ -302,25 +302,6 @@ class Dismantle(CoreObject):
             activeObject.signalGiver()
         return activeEntity
                
-    #===========================================================================
-    #                  outputs message to the trace.xls. 
-    #       Format is (Simulation Time | Entity or Frame Name | message)
-    #===========================================================================
-    def outputTrace(self, name, message):
-        from Globals import G
-        if(G.trace=="Yes"):         #output only if the user has selected to
-            #handle the 3 columns
-            G.traceSheet.write(G.traceIndex,0,str(self.env.now))
-            G.traceSheet.write(G.traceIndex,1,name)  
-            G.traceSheet.write(G.traceIndex,2,message)          
-            G.traceIndex+=1       #increment the row
-            #if we reach row 65536 we need to create a new sheet (excel limitation)  
-            if(G.traceIndex==65536):
-                G.traceIndex=0
-                G.sheetIndex+=1
-                G.traceSheet=G.traceFile.add_sheet('sheet '+str(G.sheetIndex), cell_overwrite_ok=True)  
-        
-    
     #===========================================================================
     # outputs results to JSON File
     #===========================================================================
@@ -34,6 +34,14 @@ from ManPyObject import ManPyObject
 # ===========================================================================
 class Entity(ManPyObject):
     type="Entity"
+    registryCategory='Entity'
+    # the attributes of the entity are kept in slots instead of a per instance dict,
+    # many thousands of entities may be created in a replication
+    __slots__=('creationTime', 'startTime', 'width', 'height', 'length',
+               'priority', 'dueDate', 'orderDate', 'schedule', 'currentStation',
+               'internal', 'isCritical', 'manager', 'numberOfUnits', 'family',
+               'proceed', '_candidateReceivers', 'candidateReceiver', 'alias',
+               'remainingProcessingTime', 'remainingSetupTime', 'schedulingKeyCache')
 
     def __init__(self, id=None, name=None, priority=0, dueDate=0, orderDate=0, 
                  isCritical=False, remainingProcessingTime=0,remainingSetupTime=0,currentStation=None,**kw):
@@ -71,13 +79,31 @@ class Entity(ManPyObject):
         
         # variables to be used by OperatorRouter
         self.proceed=False               # boolean that is used to check weather the entity can proceed to the candidateReceiver
-        self.candidateReceivers=[]          # list of candidateReceivers of the entity (those stations that can receive the entity
+        self._candidateReceivers=None       # list of candidateReceivers of the entity (those stations that can receive the entity
+                                            # created when first used, see candidateReceivers
         self.candidateReceiver=None         # the station that is finaly chosen to receive the entity
         # alias used for printing the Route
         self.alias=None
         self.remainingProcessingTime=remainingProcessingTime
         self.remainingSetupTime=remainingSetupTime
+        # the keys of the scheduling rules computed for the current step of the route
+        # (created by the first route dependent rule that sorts the entity)
+        self.schedulingKeyCache=None
         
+    #===========================================================================
+    # the list of candidateReceivers of the entity, only created for the entities
+    # handled by the OperatorRouter
+    #===========================================================================
+    @property
+    def candidateReceivers(self):
+        if self._candidateReceivers is None:
+            self._candidateReceivers=[]
+        return self._candidateReceivers
+
+    @candidateReceivers.setter
+    def candidateReceivers(self, candidateReceivers):
+        self._candidateReceivers=candidateReceivers
+
     #===========================================================================
     # return the responsible operator for the current step, not implemented for entities
     #===========================================================================
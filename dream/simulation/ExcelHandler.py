@@ -27,13 +27,14 @@ auxiliary script to handle excel related methods
 
 
 from Globals import G
+from TraceSink import MemoryTraceSink, exportToExcel
 
 import xlwt
 import xlrd
 
 #outputs the trace of the simulation run
 def outputTrace(fileName='Trace'):
-    G.traceFile.save(str(fileName)+'.xls')
+    exportToExcel(G.traceSink.readRecords(), G.traceSink.route).save(str(fileName)+'.xls')
 
 #outputs the log of the Entities given
 #the format is (Entity Name | Station ID | Station Name| time)
@@ -60,9 +61,7 @@ def outputLog(fileName='Log', entityList=G.EntityList):
     logFile.save(str(fileName)+'.xls')  
     
 def resetTrace():
-    # data for the trace output in excel
+    # data for the trace output
     # -----------------------------------------------------------------------
-    G.traceIndex=0                    #index that shows in what row we are
-    G.sheetIndex=1                    #index that shows in what sheet we are
-    G.traceFile = xlwt.Workbook()     #create excel file
-    G.traceSheet = G.traceFile.add_sheet('sheet '+str(G.sheetIndex), cell_overwrite_ok=True)  #create excel sheet  
\ No newline at end of file
+    G.traceSink.close()
+    G.traceSink=MemoryTraceSink()
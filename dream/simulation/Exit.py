@@ -35,6 +35,7 @@ from CoreObject import CoreObject
 # ===========================================================================
 class Exit(CoreObject):
     family='Exit'
+    replicationResults=CoreObject.replicationResults+('Exits', 'UnitExits', 'Lifespan', 'TaktTime')
     
     
     def __init__(self, id, name, **kw):
@@ -106,11 +107,10 @@ class Exit(CoreObject):
     def getEntity(self): 
         activeEntity = CoreObject.getEntity(self)           #run the default method
         # if the entity is in the G.pendingEntities list then remove it from there
-        from Globals import G
 #         G.pendingEntities[:]=(entity for entity in G.pendingEntities if not entity is activeEntity)
-        if G.Router:
-            if activeEntity in G.pendingEntities:
-                G.pendingEntities.remove(activeEntity)
+        if self.context.Router:
+            if activeEntity in self.context.pendingEntities:
+                self.context.pendingEntities.remove(activeEntity)
 #         if activeEntity in G.EntityList:
 #             G.EntityList.remove(activeEntity)
 #         self.clear(activeEntity)
@@ -119,6 +119,9 @@ class Exit(CoreObject):
         self.totalNumberOfUnitsExited+=activeEntity.numberOfUnits   # add the number of units that xited
         self.totalTaktTime+=self.env.now-self.timeLastEntityLeft           # add the takt time
         self.timeLastEntityLeft=self.env.now                               # update the time that the last entity left from the Exit
+        self.context.timeLastEntityExited=self.env.now                     # and the time the last entity left the model
+        if self.context.stopMonitor:
+            self.context.stopMonitor.entityExited(self, activeEntity)
         activeObjectQueue=self.getActiveObjectQueue()
         del self.Res.users[:]
         return activeEntity
@@ -135,6 +138,7 @@ class Exit(CoreObject):
 #                G.pendingEntities, G.WipList)
         for list in lists:
             deleteEntityfromlist(entity,list)
+        G.registry.unregister(entity)
     
     #===========================================================================
     # haveToDispose of an exit must always return False
@@ -38,8 +38,8 @@ class Failure(ObjectInterruption):
                  deteriorationType='constant',
                  waitOnTie=False,**kw):
         ObjectInterruption.__init__(self,id,name,victim=victim)
-        self.rngTTF=RandomNumberGenerator(self, distribution.get('TTF',{'Fixed':{'mean':100}}))
-        self.rngTTR=RandomNumberGenerator(self, distribution.get('TTR',{'Fixed':{'mean':10}}))
+        self.rngTTF=RandomNumberGenerator(self, distribution.get('TTF',{'Fixed':{'mean':100}}), purpose='TTF')
+        self.rngTTR=RandomNumberGenerator(self, distribution.get('TTR',{'Fixed':{'mean':10}}), purpose='TTR')
         self.name="F"+str(index)
         self.repairman=repairman        # the resource that may be needed to fix the failure
                                         # if now resource is needed this will be "None" 
@@ -147,7 +147,7 @@ class Failure(ObjectInterruption):
                     self.sendSignal(receiver=oi, signal=oi.victimFailed)
             self.victim.Up=False
             self.victim.timeLastFailure=self.env.now           
-            self.outputTrace(self.victim.name,"is down")
+            self.outputTrace(self.victim.name,"is down", kind='failure')
             # update the failure time
             failTime=self.env.now    
             if(self.repairman and self.repairman!="None"):     # if the failure needs a resource to be fixed, 
@@ -164,7 +164,7 @@ class Failure(ObjectInterruption):
                     self.victim.totalFailureTime+=self.env.now-failTime    
                     self.reactivateVictim()                     # since repairing is over, the Machine is reactivated
                     self.victim.Up=True              
-                    self.outputTrace(self.victim.name,"is up")
+                    self.outputTrace(self.victim.name,"is up", kind='repair')
                     
                     self.repairman.totalWorkingTime+=self.env.now-timeOperationStarted   
                 continue
@@ -189,4 +189,4 @@ class Failure(ObjectInterruption):
                 self.victim.totalFailureTime+=self.env.now-failTime   
             self.reactivateVictim()                     # since repairing is over, the Machine is reactivated
             self.victim.Up=True              
-            self.outputTrace(self.victim.name,"is up")
+            self.outputTrace(self.victim.name,"is up", kind='repair')
@@ -0,0 +1,80 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+fingerprints of the candidates of the optimisers (ants, chromosomes) and of their results.
+A fingerprint is a canonical hashable encoding: two values have the same fingerprint if
+they are equal, whatever the order of their dict keys. The optimisers keep the fingerprints
+of the tested candidates in a FingerprintSet, so that a duplicate is found in O(1)
+'''
+
+# the keys of the results that change from one run of the same scenario to another
+VOLATILE_KEYS=frozenset(['totalExecutionTime'])
+
+# ===========================================================================
+# returns the fingerprint of a value made of dicts, lists, tuples, sets and
+# scalars. The keys of the dicts in excludedKeys are left out, at any depth
+# ===========================================================================
+def fingerprint(value, excludedKeys=frozenset()):
+    if isinstance(value, dict):
+        return ('dict', frozenset([(fingerprint(key), fingerprint(item, excludedKeys))
+                                   for (key, item) in value.items() if key not in excludedKeys]))
+    if isinstance(value, (list, tuple)):
+        return tuple([fingerprint(item, excludedKeys) for item in value])
+    if isinstance(value, (set, frozenset)):
+        return ('set', frozenset([fingerprint(item, excludedKeys) for item in value]))
+    # numpy scalars
+    if hasattr(value, 'item') and not isinstance(value, (int, long, float, basestring)):
+        return value.item()
+    return value
+
+# ===========================================================================
+# returns the fingerprint of a result, without its volatile keys
+# ===========================================================================
+def resultFingerprint(result, volatileKeys=VOLATILE_KEYS):
+    return fingerprint(result, volatileKeys)
+
+# ===========================================================================
+# a set of candidates, stored by their fingerprint
+# ===========================================================================
+class FingerprintSet(object):
+    def __init__(self, candidates=(), excludedKeys=frozenset()):
+        self.excludedKeys=frozenset(excludedKeys)   # the keys that do not identify a candidate
+        self.fingerprints=set()
+        for candidate in candidates:
+            self.add(candidate)
+
+    # =======================================================================
+    # adds the candidate, returns False if it was already in the set
+    # =======================================================================
+    def add(self, candidate):
+        key=fingerprint(candidate, self.excludedKeys)
+        if key in self.fingerprints:
+            return False
+        self.fingerprints.add(key)
+        return True
+
+    def __contains__(self, candidate):
+        return fingerprint(candidate, self.excludedKeys) in self.fingerprints
+
+    def __len__(self):
+        return len(self.fingerprints)
@@ -33,98 +33,15 @@ import xlwt
 import xlrd
 from random import Random, expovariate, gammavariate, normalvariate
 import simpy
+from SimulationContext import SimulationContext, ObjectRegistry, ContextProxy, getCurrentContext
 
 # ===========================================================================
-# globals
+# globals. The attributes of G are the ones of the SimulationContext 
+# active in the current thread (see SimulationContext)
 # ===========================================================================
-class G:   
-    seed=1450                       #the seed of the random number generator
-    Rnd = Random(seed)              #random number generator
-    import numpy
-    numpyRnd=numpy    
+class G(object):
+    __metaclass__=ContextProxy
 
-    ObjList=[]                      #a list that holds all the CoreObjects 
-    EntityList=[]                   #a list that holds all the Entities 
-    ObjectResourceList=[]
-    ObjectInterruptionList=[]
-    
-    numberOfReplications=1          #the number of replications default=1git 
-    confidenceLevel=0.9             #the confidence level default=90%
-    Base=1                          #the Base time unit. Default =1 minute
-    maxSimTime=0                    #the total simulation time
-    
-    # flag for printing in console
-    console=""
-    
-    # data for the trace output in excel
-    trace=""                        #this is written from input. If it is "Yes" then you write to trace, else we do not
-    traceIndex=0                    #index that shows in what row we are
-    sheetIndex=1                    #index that shows in what sheet we are
-    traceFile = xlwt.Workbook()     #create excel file
-    traceSheet = traceFile.add_sheet('sheet '+str(sheetIndex), cell_overwrite_ok=True)  #create excel sheet    
-    
-    
-    # variables for excel output
-    outputIndex=0                   #index that shows in what row we are
-    sheetIndex=1                    #index that shows in what sheet we are
-    outputFile = xlwt.Workbook()    #create excel file
-    outputSheet = outputFile.add_sheet('sheet '+str(sheetIndex), cell_overwrite_ok=True)  #create excel sheet
-    
-    #variables for json output
-    outputJSON={}
-    outputJSONFile=None
-    
-    numberOfEntities = 0
-    
-    #object that routes the operators in the model
-    Router=None 
-    
-    #                define the lists of each object type
-    SourceList=[]
-    MachineList=[]
-    ExitList=[]
-    QueueList=[]    
-    RepairmanList=[]
-    AssemblyList=[]
-    DismantleList=[]
-    ConveyerList=[]
-    MachineJobShopList=[]
-    QueueJobShopList=[]
-    ExitJobShopList=[]
-    BatchDecompositionList=[]
-    BatchSourceList=[]
-    BatchReassemblyList=[]
-    LineClearanceList=[]
-    EventGeneratorList=[]
-    OperatorsList = []
-    OperatorManagedJobsList = []
-    OperatorPoolsList = []
-    BrokersList = []
-    OperatedMachineList = []
-    BatchScrapMachineList=[]
-    OrderDecompositionList=[]
-    ConditionalBufferList=[]
-    MouldAssemblyBufferList=[]
-    MouldAssemblyList=[]
-    MachineManagedJobList=[]
-    QueueManagedJobList=[]
-    ModelResourceList=[]
-    
-    JobList=[]
-    WipList=[]
-    EntityList=[]  
-    PartList=[]
-    OrderComponentList=[]
-    OrderList=[]
-    MouldList=[]
-    BatchList=[]
-    SubBatchList=[]
-    # entities that just finished processing in a station 
-    # and have to enter the next machine 
-    pendingEntities=[]
-    env=simpy.Environment()
-
-    
 # =======================================================================
 # method to move entities exceeding a certain safety stock
 # =======================================================================
@@ -190,10 +107,7 @@ def getMethodFromName(dotted_name):
 # method finding objects by ID
 # =======================================================================
 def findObjectById(id):
-    for obj in G.ObjList + G.ObjectResourceList + G.EntityList + G.ObjectInterruptionList + G.OrderList:
-        if obj.id==id:
-            return obj
-    return None
+    return getCurrentContext().registry.find(id)
 
 # =======================================================================
 # Error in the setting up of the WIP
@@ -341,58 +255,29 @@ def countIntervalThroughput(**kw):
 # get the supported print Keywords
 #===========================================================================
 def getSupportedPrintKwrds():
-    return ("create",
-            "signal", "signalReceiver", "signalGiver",
-            "attemptSignal","attemptSignalGiver", "attemptSignalReceiver",
-            "preempt", "preempted",
-            "startWork", "finishWork", 
-            "processEnd", "interrupted",
-            "enter", "destroy",
-            "waitEvent", "received", "isRequested","canDispose",
-            "interruptionEnd", "loadOperatorAvailable", "resourceAvailable","entityRemoved",
-            'conveyerEnd', 'conveyerFull','moveEnd')
+    from Tracing import SUPPORTED_KEYWORDS
+    return SUPPORTED_KEYWORDS
         
 #===========================================================================
 # get the phrase to print from the keyword
 #===========================================================================
 def getPhrase():
-    printKwrds={'create':{'phrase':'created an entity'},
-                "destroy":{'phrase':'destroyed at', 'suffix':' * '},
-                'signal':{'phrase':'signalling'},
-                'signalGiver':{'phrase':'signalling giver', 'prefix':'_'},
-                'signalReceiver':{'phrase':'signalling receiver','prefix':'_'}, 
-                'attemptSignal':{'phrase':'will try to signal'},
-                'attemptSignalGiver':{'phrase':'will try to signal a giver'}, 
-                'attemptSignalReceiver':{'phrase':'will try to signal a receiver'}, 
-                'preempt': {'phrase':'preempts','suffix':' .'}, 
-                'preempted': {'phrase':'is being preempted','suffix':'. '},
-                'startWork':{'phrase':'started working in'},
-                'finishWork':{'phrase':'finished working in'},
-                'processEnd':{'phrase':'ended processing in'},
-                'interrupted':{'phrase':'interrupted at','suffix':' .'},
-                'enter':{'phrase':'got into','suffix':'='}, 
-                'waitEvent':{'phrase':'will wait for event'},
-                'received':{'phrase':'received event'},
-                'isRequested':{'phrase':'received an isRequested event from'},
-                'canDispose':{'phrase':'received an canDispose event'},
-                'interruptionEnd':{'phrase':'received an interruptionEnd event at'},
-                "loadOperatorAvailable":{'phrase':'received a loadOperatorAvailable event at'},
-                "resourceAvailable":{'phrase':'received a resourceAvailable event'},
-                "entityRemoved":{'phrase':'received an entityRemoved event from'},
-                'moveEnd':{'phrase':'received a moveEnd event'},
-                "conveyerEnd":{'phrase':'has reached conveyer End', 'suffix':'.!'},
-                'conveyerFull':{'phrase':'is now Full, No of units:', 'suffix':'(*)'}}
-    return printKwrds
+    from Tracing import PHRASES
+    return PHRASES
 
-def runSimulation(objectList=[], maxSimTime=100, numberOfReplications=1, trace='No', seed=1):
+def runSimulation(objectList=[], maxSimTime=100, numberOfReplications=1, trace='No', seed=1,
+                  stopConditions=[], stopCheckInterval=1):
     G.numberOfReplications=numberOfReplications
     G.trace=trace
     G.maxSimTime=float(maxSimTime)
     G.seed=seed
+    G.stopConditions=stopConditions
+    G.stopCheckInterval=stopCheckInterval
     
     G.ObjList=[]
     G.ObjectInterruptionList=[]
     G.ObjectResourceList=[]
+    G.registry.clear()
     from CoreObject import CoreObject
     from ObjectInterruption import ObjectInterruption
     from ObjectResource import ObjectResource
@@ -404,6 +289,7 @@ def runSimulation(objectList=[], maxSimTime=100, numberOfReplications=1, trace='
             G.ObjectInterruptionList.append(object)
         elif issubclass(object.__class__, ObjectResource):
             G.ObjectResourceList.append(object)  
+        G.registry.register(object)
 
     #run the replications
     for i in range(G.numberOfReplications):    
@@ -413,9 +299,11 @@ def runSimulation(objectList=[], maxSimTime=100, numberOfReplications=1, trace='
                                     # this is where all the simulation object 'live'
 
         G.EntityList=[]
+        G.registry.clear('Entity')
         for object in objectList:
             if issubclass(object.__class__, Entity):
                 G.EntityList.append(object)   
+                G.registry.register(object)
 
         #initialize all the objects
         for object in G.ObjList + G.ObjectInterruptionList + G.ObjectResourceList + G.EntityList:
@@ -430,19 +318,24 @@ def runSimulation(objectList=[], maxSimTime=100, numberOfReplications=1, trace='
 
         #set the WIP
         setWIP(G.EntityList)
+        G.timeLastEntityExited=0
     
-        G.env.run(until=G.maxSimTime)    #run the simulation
+        #run the simulation
+        if G.stopConditions:
+            # stop earlier if one of the stop conditions is met (the previous replication may have)
+            from StopCondition import StopMonitor
+            G.maxSimTime=float(maxSimTime)
+            G.stopMonitor=StopMonitor(G.stopConditions, G.stopCheckInterval)
+            G.stopMonitor.run(G.env, G.maxSimTime)
+            if G.stopMonitor.stoppedBy:
+                G.maxSimTime=G.env.now
+            G.stopMonitor=None
+        else:
+            G.env.run(until=G.maxSimTime)
 
-        # identify from the exits what is the time that the last entity has ended. 
-        endList=[]
-        from Exit import Exit
-        for object in G.ObjList:
-            if issubclass(object.__class__,Exit):
-                endList.append(object.timeLastEntityLeft)
-        
-        # identify the time of the last event
+        # identify the time of the last event, the time that the last entity has ended
         if G.env.now==float('inf'):    
-            G.maxSimTime=float(max(endList))
+            G.maxSimTime=float(G.timeLastEntityExited)
         # do not let G.maxSimTime=0 so that there will be no crash
         if G.maxSimTime==0:
             print "simulation ran for 0 time, something may have gone wrong"
@@ -28,13 +28,15 @@ in the system and also in the processing times at each station
 
 from Globals import G
 from Entity import Entity
+from CompiledRoute import CompiledRoute
 
 # =======================================================================
 # The job object 
 # =======================================================================
 class Job(Entity):                                  # inherits from the Entity class   
     type='Job'
-    family='Job'
+    __slots__=('route', 'remainingRoute', 'compiledRoute', 'extraPropertyDict',
+               'routeInBOM', 'initialOperationTypes')
     
     def __init__(self, id=None, name=None, route=[], priority=0, dueDate=0, orderDate=0, 
                  extraPropertyDict=None,remainingProcessingTime={}, remainingSetupTime={},currentStation=None, isCritical=False,**kw):
@@ -47,6 +49,7 @@ class Job(Entity):                                  # inherits from the Entity c
                                                     # also contains the processing times in each station
         self.remainingRoute=list(route)             # the remaining route. in the beginning 
                                                     # this should be the same as the full route
+        self.compiledRoute=None                     # the route read into a table, see initialize
         self.extraPropertyDict = extraPropertyDict
         # variable used to differentiate entities with and entities without routes
         self.family='Job'
@@ -122,6 +125,8 @@ class Job(Entity):                                  # inherits from the Entity c
     # initializes all the Entity for a new simulation replication 
     # =======================================================================
     def initialize(self):
+        # the steps of the route may be modified below
+        self.compiledRoute=None
         currentStationWellDefined=False
         # if the currentStation is defined and the route is given in the BOM
         if self.currentStation and self.routeInBOM:
@@ -161,7 +166,18 @@ class Job(Entity):                                  # inherits from the Entity c
                     raise SetWipTypeError('The starting station of the the entity is not defined uniquely')
             except SetWipTypeError as setWipError:
                 print 'WIP definition error: {0}'.format(setWipError)
+        # the route is final, read it into a table
+        self.compiledRoute=CompiledRoute(self.route)
     
+    #===========================================================================
+    # returns the route read into a table (built by initialize, or on first use
+    # for the Jobs that are not initialized)
+    #===========================================================================
+    def getCompiledRoute(self):
+        if self.compiledRoute is None:
+            self.compiledRoute=CompiledRoute(self.route)
+        return self.compiledRoute
+
     #===========================================================================
     # check if the requireParts of the entity next step sequence (route) have
     # have concluded the steps with sequence numbers smaller than the sequence
@@ -214,19 +230,10 @@ class Job(Entity):                                  # inherits from the Entity c
     # of a blocked entity at its current step sequence 
     #===========================================================================
     def getRequiredParts(self):
-        # retrieve the IDs of the required parts in the next step sequence
-        requiredParts=[]
+        # retrieve the required parts in the next step sequence
         if self.remainingRoute:
-            requiredPartsIDs=self.remainingRoute[0].get('requiredParts',[])
-            # if there are requested parts
-            if requiredPartsIDs:
-                from Globals import findObjectById
-                for partID in requiredPartsIDs:
-                    # find the objects with the corresponding IDs
-                    part=findObjectById(partID)
-                    if not part in requiredParts:
-                        requiredParts.append(part)
-        return requiredParts
+            return self.getCompiledRoute().getRequiredParts(self.remainingRoute[0])
+        return []
     
     #===========================================================================
     # method that returns the sequence of the entity's next step
@@ -245,12 +252,7 @@ class Job(Entity):                                  # inherits from the Entity c
         # if the part is being currently processed in a Station
         from Machine import Machine
         if issubclass(currentStation.__class__, Machine):
-            for routeStep in self.route:
-                stepSeq=routeStep.get('sequence',0)
-                stepIDs=routeStep.get('stationIdsList',[])
-                if currentStation.id in stepIDs:
-                    curStepSeq=stepSeq
-                    break
+            curStepSeq=self.getCompiledRoute().getSequence(currentStation.id)
         return curStepSeq
     
     #===========================================================================
@@ -279,12 +281,7 @@ class Job(Entity):                                  # inherits from the Entity c
         currentStation=self.currentStation
         from Machine import Machine
         if issubclass(currentStation.__class__, Machine):
-            for routeStep in self.route:
-                stepResponsible=routeStep.get('operator',None)
-                stepIDs=routeStep.get('stationIdsList',[])
-                if currentStation.id in stepIDs:
-                    responsibleID=stepResponsible
-                    break
+            responsibleID=self.getCompiledRoute().getOperator(currentStation.id)
         else:
             responsibleID=self.remainingRoute[0].get('operator',None)
         from Globals import findObjectById
@@ -48,6 +48,7 @@ from MachineJobShop import MachineJobShop
 from QueueJobShop import QueueJobShop
 from ExitJobShop import ExitJobShop
 import xlwt
+import ExcelHandler
 import xlrd
 import time
 from random import Random
@@ -386,6 +387,7 @@ def main():
  
     #create an empty list to store all the objects in   
     G.ObjList=[]
+    G.registry.clear('CoreObject')
     
     #user inputs the id of the JSON file
     topologyId=raw_input("give the path to the CMSD file\n")
@@ -424,11 +426,8 @@ def main():
             
         #output trace to excel
         if(G.trace=="Yes"):
-            G.traceFile.save('trace'+str(i+1)+'.xls')
-            G.traceIndex=0    #index that shows in what row we are
-            G.sheetIndex=1    #index that shows in what sheet we are
-            G.traceFile = xlwt.Workbook()     #create excel file
-            G.traceSheet = G.traceFile.add_sheet('sheet '+str(G.sheetIndex), cell_overwrite_ok=True)  #create excel sheet
+            ExcelHandler.outputTrace('trace'+str(i+1))
+            ExcelHandler.resetTrace()
     
     G.outputSheet.write(G.outputIndex,0, "Execution Time")
     G.outputSheet.write(G.outputIndex,1, str(time.time()-start)+" seconds")
@@ -43,13 +43,17 @@ from dream.simulation.Order import Order
 from dream.simulation.OrderDesign import OrderDesign
 from dream.simulation.Mould import Mould
 import dream.simulation.PrintRoute as PrintRoute
-import dream.simulation.ExcelHandler as ExcelHandler
 import time
 import json
 from random import Random
 import sys
 import os.path
 import dream.simulation.Globals as Globals
+from dream.simulation.TopologyIndex import TopologyIndex
+from dream.simulation.RandomNumberGenerator import RandomStreams, getReplicationSeed
+from dream.simulation.TraceSink import FileTraceSink, MemoryTraceSink
+from dream.simulation.Tracing import Tracer
+from dream.simulation.StopCondition import StopCondition, StopMonitor
 import ast
 import cProfile
 
@@ -61,11 +65,25 @@ def readGeneralInput():
     G.numberOfReplications=int(general.get('numberOfReplications', '1'))    # read the number of replications / default 1
     G.maxSimTime=float(general.get('maxSimTime', '100'))                    # get the maxSimTime / default 100
     G.trace=general.get('trace', 'No')                                      # get trace in order to check if trace is requested
+    G.traceFormat=general.get('traceFormat', 'csv.gz')                      # the format of the trace files (csv, csv.gz, jsonl, jsonl.gz)
+    G.traceDirectory=general.get('traceDirectory')                          # the directory the trace files are kept in
     G.console=general.get('console', 'No')                                  # get console flag in order to check if console print is requested
+    G.tracer=Tracer.fromGeneralInput(general)                               # the tracer of the console messages
     G.confidenceLevel=float(general.get('confidenceLevel', '0.95'))         # get the confidence level
+    G.stopConditions=[StopCondition.fromDict(condition)                     # the conditions that stop a replication early
+                      for condition in general.get('stopConditions', [])]
+    G.stopCheckInterval=float(general.get('stopCheckInterval', 1))          # the time between two checks of these conditions
     G.seed = general.get('seed')                                            # the seed for random number generation
+    G.vectorisedRandomNumbers=bool(int(general.get('vectorisedRandomNumbers', 0)))  # draw the random numbers from numpy in blocks
+    G.randomNumberBlockSize=int(general.get('randomNumberBlockSize', 1024))  # the maximum size of these blocks
+    G.commonRandomNumbers=bool(int(general.get('commonRandomNumbers', 0)))  # every object draws from its own random streams
+    G.samplers={}                                                           # the samplers of the previous model are not reused
     G.extraPropertyDict=general.get('extraPropertyDict', {})                # a dict to put extra properties that are 
                                                                             # generic for the model
+    G.numberOfProcesses=int(general.get('numberOfProcesses', '1'))          # the number of processes the replications run on
+    if G.numberOfProcesses<=0:                                              # 0 means one process per cpu
+        import multiprocessing
+        G.numberOfProcesses=multiprocessing.cpu_count()
 
 # ===========================================================================
 #                       creates first the object interruptions 
@@ -80,26 +98,9 @@ def createObjectResourcesAndCoreObjects():
     edges = json_data['graph']["edge"]                      # read from the dictionary the dicts with key 'edges'
 
 
-    '''
-    getSuccesorList method to get the successor 
-    list of object with ID = id
-    XXX slow implementation
-    '''
-    def getSuccessorList(node_id, predicate=lambda source, destination, edge_class, edge_data: True):
-      successor_list = []                           # dummy variable that holds the list to be returned
-      
-      for edge in edges.values():
-          source = edge["source"]
-          destination = edge["destination"]
-          edge_class = edge["_class"]
-          edge_data = edge.get("data", {})
-          if source == node_id:                               # for the node_id argument
-              if predicate(source, destination, edge_class, edge_data):     # find its 'destinations' and 
-                successor_list.append(destination)              # append it to the successor list
-      # XXX We should probably not need to sort, but there is a bug that
-      # prevents Topology10 to work if this sort is not used.
-      successor_list.sort()
-      return successor_list
+    # index the edges once, so that successors are not found by scanning all the edges for every node
+    G.topologyIndex=TopologyIndex(edges)
+    getSuccessorList=G.topologyIndex.getSuccessorList
     '''
     define the lists of each object type
     '''
@@ -134,6 +135,7 @@ def createObjectResourcesAndCoreObjects():
     G.MachineManagedJobList=[]
     G.QueueManagedJobList=[]
     G.ObjectResourceList=[]
+    G.registry.clear('ObjectResource')
     G.CapacityStationBufferList=[]
     G.AllocationManagementList=[]
     G.CapacityStationList=[]
@@ -220,25 +222,27 @@ def createObjectResourcesAndCoreObjects():
             coreObject.nextIds=getSuccessorList(element['id'])           
             # (Below is only for Dismantle for now)
             # get the successorList for the 'Parts'
-            coreObject.nextPartIds=getSuccessorList(element['id'], lambda source, destination, edge_class, edge_data: edge_data.get('entity',{}) == 'Part')
+            coreObject.nextPartIds=getSuccessorList(element['id'], entity='Part')
             # get the successorList for the 'Frames'
-            coreObject.nextFrameIds=getSuccessorList(element['id'], lambda source, destination, edge_class, edge_data: edge_data.get('entity',{}) == 'Frame')
+            coreObject.nextFrameIds=getSuccessorList(element['id'], entity='Frame')
             
     #                    loop through all the core objects    
     #                         to read predecessors
+    G.topologyIndex.indexObjects(G.ObjList)
     for element in G.ObjList:
         #loop through all the nextIds of the object
         for nextId in element.nextIds:
-            #loop through all the core objects to find the on that has the id that was read in the successorList
-            for possible_successor in G.ObjList:
-                if possible_successor.id==nextId:
-                    possible_successor.previousIds.append(element.id)            
+            # find the core object that has the id that was read in the successorList
+            possible_successor=G.topologyIndex.getObject(nextId)
+            if possible_successor:
+                possible_successor.previousIds.append(element.id)            
 
 # ===========================================================================
 #                creates the object interruptions
 # ===========================================================================
 def createObjectInterruptions():
     G.ObjectInterruptionList=[]
+    G.registry.clear('ObjectInterruption')
     G.ScheduledMaintenanceList=[]
     G.FailureList=[]
     G.ShiftSchedulerList=[]
@@ -351,6 +355,8 @@ def createWIP():
     G.BatchList=[]
     G.SubBatchList=[]
     G.CapacityEntityList=[]
+    G.registry.clear('Entity')
+    G.registry.clear('Order')
     G.CapacityProjectList=[]
     # entities that just finished processing in a station 
     # and have to enter the next machine 
@@ -532,19 +538,13 @@ def createWIP():
 #    defines the topology (predecessors and successors for all the objects)
 # ===========================================================================
 def setTopology():
+    # id->object dict of the core objects, so that next and previous are not found by linear searches
+    topologyIndex=TopologyIndex()
+    topologyIndex.indexObjects(G.ObjList)
     #loop through all the objects  
     for element in G.ObjList:
-        next=[]
-        previous=[]
-        for j in range(len(element.previousIds)):
-            for q in range(len(G.ObjList)):
-                if G.ObjList[q].id==element.previousIds[j]:
-                    previous.append(G.ObjList[q])
-                    
-        for j in range(len(element.nextIds)):
-            for q in range(len(G.ObjList)):
-                if G.ObjList[q].id==element.nextIds[j]:
-                    next.append(G.ObjList[q])      
+        previous=topologyIndex.getObjects(element.previousIds)
+        next=topologyIndex.getObjects(element.nextIds)
                              
         if element.type=="Source":
             element.defineRouting(next)
@@ -553,16 +553,8 @@ def setTopology():
         #Dismantle should be changed to identify what the the successor is.
         #nextPart and nextFrame will become problematic    
         elif element.type=="Dismantle":
-            nextPart=[]
-            nextFrame=[]
-            for j in range(len(element.nextPartIds)):
-                for q in range(len(G.ObjList)):
-                    if G.ObjList[q].id==element.nextPartIds[j]:
-                        nextPart.append(G.ObjList[q])
-            for j in range(len(element.nextFrameIds)):
-                for q in range(len(G.ObjList)):
-                    if G.ObjList[q].id==element.nextFrameIds[j]:
-                        nextFrame.append(G.ObjList[q])
+            nextPart=topologyIndex.getObjects(element.nextPartIds)
+            nextFrame=topologyIndex.getObjects(element.nextFrameIds)
             element.defineRouting(previous, next)            
             element.definePartFrameRouting(nextPart, nextFrame)
         else:
@@ -584,14 +576,256 @@ def activateObjects():
     for element in G.ObjList:
         G.env.process(element.run())                                             
 
+# ===========================================================================
+#            runs the replication i of the experiment. Returns the 
+#        results of the trace if the trace is requested, otherwise None
+# ===========================================================================
+def runReplication(i):
+    G.env=simpy.Environment()                       # initialize the environment
+    G.maxSimTime=float(G.JSONData['general'].get('maxSimTime', '100'))     # read the maxSimTime in each replication 
+                                                                           # since it may be changed for infinite ones
+    if G.Router:
+        G.Router.isActivated=False
+        G.Router.isInitialized=False
+        
+    if G.seed:
+        G.Rnd=Random('%s%s' % (G.seed, i))
+        # numpy is seeded per replication too, every replication draws other numbers
+        G.numpyRnd.random.seed(getReplicationSeed(G.seed, i))
+    else:
+        G.Rnd=Random()
+        G.numpyRnd.random.seed()
+    if G.commonRandomNumbers:
+        G.randomStreams=RandomStreams(G.seed, i)
+    if G.trace=="Yes":
+        G.traceSink=createTraceSink(i)
+    createWIP()
+    initializeObjects()
+    Globals.setWIP(G.EntityList)        
+    activateObjects()
+    G.timeLastEntityExited=0
+        
+    until=G.maxSimTime
+    # if the simulation is ran until no more events are scheduled, 
+    # then we have to find the end time as the time the last entity ended.
+    if G.maxSimTime==-1:
+        # If someone does it for a model that has always events, then it will run forever!
+        until=float('inf')
+    if G.stopConditions:
+        # stop earlier if one of the stop conditions is met
+        G.stopMonitor=StopMonitor(G.stopConditions, G.stopCheckInterval)
+        G.stopMonitor.run(G.env, until)
+    else:
+        G.env.run(until=until)
+
+    if G.stopMonitor and G.stopMonitor.stoppedBy:
+        logger.info("replication %s stopped at %s by %r" % (i, G.env.now, G.stopMonitor.stoppedBy))
+        G.maxSimTime=G.env.now
+    elif G.maxSimTime==-1:
+        # the end time is the time the last entity left an exit
+        if G.timeLastEntityExited!=0 and G.env.now==float('inf'):    #do not let G.maxSimTime=0 so that there will be no crash
+            G.maxSimTime=float(G.timeLastEntityExited)
+        else:
+            print "simulation ran for 0 time, something may have gone wrong"
+            logger.info("simulation ran for 0 time, something may have gone wrong")
+    G.stopMonitor=None
+        
+    #carry on the post processing operations for every object in the topology       
+    for element in G.ObjList:
+        element.postProcessing()
+            
+    #carry on the post processing operations for every model resource in the topology       
+    for model_resource in G.ObjectResourceList:
+        model_resource.postProcessing()
+            
+    # added for debugging, print the Route of the Jobs on the same G.traceFile
+    PrintRoute.outputRoute()
+            
+    #output the trace
+    if(G.trace=="Yes"):
+        return closeTraceSink()
+    return None
+
+# ===========================================================================
+#   returns the sink the trace of the replication i is streamed to, a file 
+#   in G.traceDirectory, or in a temporary directory if it is not given.
+#   The other runs (scenarios or processes) may keep their traces in the
+#   same G.traceDirectory, so every run creates its own file there
+# ===========================================================================
+def createTraceSink(i):
+    import tempfile
+    directory=G.traceDirectory
+    if not directory:
+        directory=tempfile.mkdtemp(prefix='manpy-trace-')
+        return FileTraceSink(os.path.join(directory, 'trace%s.%s' % (i, G.traceFormat)), G.traceFormat)
+    try:
+        os.makedirs(directory)
+    except OSError:
+        # it exists, or an other run created it meanwhile
+        if not os.path.isdir(directory):
+            raise
+    (fd, path)=tempfile.mkstemp(prefix='trace%s-' % i, suffix='.'+G.traceFormat, dir=directory)
+    os.close(fd)
+    return FileTraceSink(path, G.traceFormat)
+
+# the version of the results of the TraceFile element. Before the version was
+# given the results were {'trace': the encoded excel file of the trace}
+TRACE_RESULTS_VERSION=2
+
+# ===========================================================================
+#     closes the trace sink and returns the results of the trace. If the 
+#  files are kept in G.traceDirectory, their paths, otherwise their encoded 
+#  content (and the temporary files are removed)
+# ===========================================================================
+def closeTraceSink():
+    sink=G.traceSink
+    sink.close()
+    G.traceSink=MemoryTraceSink()
+    routePath=None
+    if sink.route is not None:
+        routePath=sink.routePath
+    if G.traceDirectory:
+        return {'version': TRACE_RESULTS_VERSION, 'format': sink.format, 
+                'path': sink.path, 'routePath': routePath}
+    results={'version': TRACE_RESULTS_VERSION, 'format': sink.format, 
+             'data': None, 'routeData': None}
+    for (key, path) in (('data', sink.path), ('routeData', routePath)):
+        if path:
+            with open(path, 'rb') as traceFile:
+                results[key]=traceFile.read().encode('base64')
+            os.remove(path)
+    os.rmdir(os.path.dirname(sink.path))
+    return results
+
+# ===========================================================================
+#            creates the model (the objects, their interruptions 
+#                   and the topology) from G.JSONData
+# ===========================================================================
+def createModel():
+    G.ObjList=[]
+    G.registry.clear('CoreObject')
+    readGeneralInput()
+    createObjectResourcesAndCoreObjects()
+    createObjectInterruptions()
+    setTopology()
+
+# ===========================================================================
+# returns True if value holds only data that can be sent between processes
+# (numbers, strings, None, numeric arrays and lists/tuples/dicts of them)
+# ===========================================================================
+def isPlainData(value):
+    if value is None or isinstance(value, (bool, int, long, float, basestring)):
+        return True
+    # e.g. the WipStat of the stations
+    if isinstance(value, numpy.ndarray):
+        return value.dtype.kind in 'biuf'
+    if isinstance(value, (list, tuple)):
+        return all(isPlainData(x) for x in value)
+    if isinstance(value, dict):
+        return all(isPlainData(k) and isPlainData(v) for (k, v) in value.iteritems())
+    return False
+
+# ===========================================================================
+#   returns the results of the replication that was just ran, a dict 
+#   {object id: {attribute: items}} of the lists of results declared in the 
+#   replicationResults of the objects. Raises TypeError if a result can not 
+#   be merged in the model of another replication
+# ===========================================================================
+def getReplicationResults():
+    results={}
+    for obj in G.ObjList+G.ObjectResourceList:
+        results[obj.id]={}
+        for attribute in obj.replicationResults:
+            value=getattr(obj, attribute, None)
+            if not isinstance(value, list) or not isPlainData(value):
+                raise TypeError("the replication result %s of %s is not a list of plain data: %r" 
+                                % (attribute, obj.id, value))
+            results[obj.id][attribute]=value
+    return results
+
+# ===========================================================================
+#   appends the results of the previous replications to the result lists
+#   of the objects of the current model, in replication order
+# ===========================================================================
+def mergeReplicationResults(replicationResults):
+    for results in replicationResults:
+        for obj in G.ObjList+G.ObjectResourceList:
+            if set(results.get(obj.id, {}))!=set(obj.replicationResults):
+                raise TypeError("the results of %s do not match its replicationResults %r" 
+                                % (obj.id, obj.replicationResults))
+            for attribute in obj.replicationResults:
+                getattr(obj, attribute).extend(results[obj.id][attribute])
+
+# ===========================================================================
+#   runs the replication i on a model created from scratch, so that the 
+#   result does not depend on the replications previously ran in the process.
+#   Returns its results (see getReplicationResults)
+# ===========================================================================
+def runReplicationOnNewModel(args):
+    (input_data, i)=args
+    G.InputData=input_data
+    G.JSONData=json.loads(G.InputData)
+    createModel()
+    # the trace of this replication is not returned
+    G.trace="No"
+    runReplication(i)
+    return getReplicationResults()
+
+# ===========================================================================
+#    runs the replications of the experiment. Every replication runs on a 
+#  model created from scratch, one after another or, if runInParallel, on a 
+#  pool of G.numberOfProcesses processes, so that both give the same results.
+#  The results of the replications but the last are appended to the result 
+#  lists of the objects in replication order. The last replication is ran 
+#  in this process, so that the entities, the trace and any other state of 
+#  the model are the ones of the last replication. Returns its trace results
+# ===========================================================================
+def runReplications():
+    replicationArgs=[(G.InputData, i) for i in xrange(G.numberOfReplications-1)]
+    if not replicationArgs:
+        return runReplication(0)
+    if runInParallel():
+        import multiprocessing
+        pool=multiprocessing.Pool(min(G.numberOfProcesses, len(replicationArgs)))
+        try:
+            # map returns the results in the order of the replications
+            replicationResults=pool.map(runReplicationOnNewModel, replicationArgs, chunksize=1)
+        finally:
+            pool.terminate()
+    else:
+        replicationResults=[runReplicationOnNewModel(args) for args in replicationArgs]
+    G.JSONData=json.loads(G.InputData)
+    createModel()
+    mergeReplicationResults(replicationResults)
+    return runReplication(G.numberOfReplications-1)
+
+# ===========================================================================
+# returns True if the replications should run on a pool of processes
+# ===========================================================================
+def runInParallel():
+    if G.numberOfProcesses<=1 or G.numberOfReplications<=1:
+        return False
+    import multiprocessing
+    # daemonic processes (e.g. the platform ones) are not allowed to have children
+    if multiprocessing.current_process().daemon:
+        logger.info("replications cannot run in parallel in a daemonic process")
+        return False
+    return True
+
 # ===========================================================================
 #                        the main script that is ran
 # ===========================================================================
-def main(argv=[], input_data=None):
+def main(argv=[], input_data=None, context=None):
+    # if a SimulationContext is given the simulation runs in it, 
+    # so that it does not share its state with other simulations of the process
+    if context is not None:
+        with context:
+            return main(argv=argv, input_data=input_data)
     argv = argv or sys.argv[1:]
 
     #create an empty list to store all the objects in   
     G.ObjList=[]
+    G.registry.clear('CoreObject')
 
     if input_data is None:
       # user passes the topology filename as first argument to the program
@@ -608,71 +842,10 @@ def main(argv=[], input_data=None):
 
     #read the input from the JSON file and create the line
     G.JSONData=json.loads(G.InputData)              # create the dictionary JSONData
-    readGeneralInput()
-    createObjectResourcesAndCoreObjects()
-    createObjectInterruptions()
-    setTopology()
+    createModel()
 
     #run the experiment (replications)          
-    for i in xrange(G.numberOfReplications):
-        G.env=simpy.Environment()                       # initialize the environment
-        G.maxSimTime=float(G.JSONData['general'].get('maxSimTime', '100'))     # read the maxSimTime in each replication 
-                                                                               # since it may be changed for infinite ones
-        if G.Router:
-            G.Router.isActivated=False
-            G.Router.isInitialized=False
-        
-        if G.seed:
-            G.Rnd=Random('%s%s' % (G.seed, i))
-            G.numpyRnd.random.seed(G.seed)
-        else:
-            G.Rnd=Random()
-            G.numpyRnd.random.seed()
-        createWIP()
-        initializeObjects()
-        Globals.setWIP(G.EntityList)        
-        activateObjects()
-        
-        # if the simulation is ran until no more events are scheduled, 
-        # then we have to find the end time as the time the last entity ended.
-        if G.maxSimTime==-1:
-            # If someone does it for a model that has always events, then it will run forever!
-            G.env.run(until=float('inf'))
-                                         
-            # identify from the exits what is the time that the last entity has ended. 
-            endList=[]
-            for exit in G.ExitList:
-                endList.append(exit.timeLastEntityLeft)
-  
-            # identify the time of the last event
-            if float(max(endList))!=0 and G.env.now==float('inf'):    #do not let G.maxSimTime=0 so that there will be no crash
-                G.maxSimTime=float(max(endList))
-            else:
-                print "simulation ran for 0 time, something may have gone wrong"
-                logger.info("simulation ran for 0 time, something may have gone wrong")
-        #else we simulate until the given maxSimTime
-        else:
-            G.env.run(until=G.maxSimTime)
-        
-        #carry on the post processing operations for every object in the topology       
-        for element in G.ObjList:
-            element.postProcessing()
-            
-        #carry on the post processing operations for every model resource in the topology       
-        for model_resource in G.ObjectResourceList:
-            model_resource.postProcessing()
-            
-        # added for debugging, print the Route of the Jobs on the same G.traceFile
-        PrintRoute.outputRoute()
-            
-        #output trace to excel      
-        if(G.trace=="Yes"):
-            ExcelHandler.outputTrace('trace'+str(i))  
-            import StringIO
-            traceStringIO = StringIO.StringIO()
-            G.traceFile.save(traceStringIO)
-            encodedTrace=traceStringIO.getvalue().encode('base64')
-            ExcelHandler.resetTrace()
+    traceResults=runReplications()
     
     G.outputJSON['_class'] = 'Dream.Simulation';
     G.outputJSON['general'] ={};
@@ -685,12 +858,12 @@ def main(argv=[], input_data=None):
     for object in G.ObjectResourceList + G.EntityList + G.ObjList:
         object.outputResultsJSON()
         
-    # output the trace as encoded if it is set on
+    # output the trace of the last replication if it is set on
     if G.trace=="Yes":
         # XXX discuss names on this
         jsonTRACE = {'_class': 'Dream.Simulation',
                 'id': 'TraceFile',
-                'results': {'trace':encodedTrace}
+                'results': traceResults
             }
         G.outputJSON['elementList'].append(jsonTRACE)
         
@@ -70,7 +70,7 @@ class Machine(CoreObject):
         #     sets the repairman resource of the Machine
         self.repairman=repairman
         #     Sets the attributes of the processing (and failure) time(s)
-        self.rng=RandomNumberGenerator(self, processingTime)
+        self.rng=RandomNumberGenerator(self, processingTime, purpose='processing')
         # check whether the operators are provided with a skills set
         # check whether the operators are provided with a skills set
         self.dedicatedOperator=self.checkForDedicatedOperators()
@@ -105,11 +105,11 @@ class Machine(CoreObject):
         # boolean to check whether the machine is being operated
         self.toBeOperated = False
         # define the load times
-        self.loadRng = RandomNumberGenerator(self, loadTime)
+        self.loadRng = RandomNumberGenerator(self, loadTime, purpose='load')
         # XX variable that informs on the need for setup
         self.setUp=True
         # define the setup times
-        self.stpRng = RandomNumberGenerator(self, setupTime)
+        self.stpRng = RandomNumberGenerator(self, setupTime, purpose='setup')
         # examine if there are multiple operation types performed by the operator
         #     there can be Setup/Processing operationType
         #     or the combination of both (MT-Load-Setup-Processing) 
@@ -860,7 +860,7 @@ class Machine(CoreObject):
         # update totalWorking time for operator and also print trace
         if self.currentOperator:
             operator=self.currentOperator
-            self.outputTrace(operator.name, "ended a process in "+ self.objName)
+            self.outputTrace(operator.name, "ended a process in "+ self.objName, kind='operationEnd')
             operator.totalWorkingTime+=self.env.now-operator.timeLastOperationStarted  
         # if the station has just concluded a processing turn then
         if type=='Processing':
@@ -870,14 +870,13 @@ class Machine(CoreObject):
             self.printTrace(self.getActiveObjectQueue()[0].name, processEnd=self.objName)
             # output to trace that the processing in the Machine self.objName ended 
             try:
-                self.outputTrace(activeObjectQueue[0].name,"ended processing in "+self.objName)
+                self.outputTrace(activeObjectQueue[0].name,"ended processing in "+self.objName, kind='processingEnd')
             except IndexError:
                 pass
-            from Globals import G
-            if G.Router:
+            if self.context.Router:
                 # the just processed entity is added to the list of entities 
                 # pending for the next processing
-                G.pendingEntities.append(activeObjectQueue[0])
+                self.context.pendingEntities.append(activeObjectQueue[0])
             # set the variable that flags an Entity is ready to be disposed 
             self.waitToDispose=True
             # update the variables keeping track of Entity related attributes of the machine    
@@ -896,7 +895,7 @@ class Machine(CoreObject):
             if self.isWorkingOnTheLast:
                 # for the scheduled Object interruptions
                 # XXX add the SkilledOperatorRouter to this list and perform the signalling only once
-                for interruption in (G.ObjectInterruptionList):
+                for interruption in (self.context.ObjectInterruptionList):
                     # if the objectInterruption is waiting for a a signal
                     if interruption.victim==self and interruption.expectedSignals['endedLastProcessing']:
                         self.sendSignal(receiver=self, signal=self.endedLastProcessing)
@@ -928,7 +927,7 @@ class Machine(CoreObject):
         if len(activeObjectQueue):
             activeEntity=activeObjectQueue[0]
             self.printTrace(activeEntity.name, interrupted=self.objName)                                    
-            self.outputTrace(activeObjectQueue[0].name, "Interrupted at "+self.objName)
+            self.outputTrace(activeObjectQueue[0].name, "Interrupted at "+self.objName, kind='interruption')
             # recalculate the processing time left tinM
             if self.timeLastOperationStarted>=0:
                 self.tinM=self.tinM-(self.env.now-self.timeLastOperationStarted)
@@ -967,7 +966,7 @@ class Machine(CoreObject):
             self.timeLastFailureEnded=self.env.now                                 # set the timeLastFailureEnded
             # output to trace that the Machine self.objName was passivated for the current failure time
             if len(activeObjectQueue):
-                self.outputTrace(activeObjectQueue[0].name, "passivated in "+self.objName+" for "+str(self.env.now-self.breakTime))
+                self.outputTrace(activeObjectQueue[0].name, "passivated in "+self.objName+" for "+str(self.env.now-self.breakTime), kind='passivation')
         # when a machine returns from failure while trying to deliver an entity
         else:
             # calculate the time the Machine was down while trying to dispose the current Entity,
@@ -1079,10 +1078,9 @@ class Machine(CoreObject):
     def getEntity(self):
         activeEntity=CoreObject.getEntity(self)          # run the default method   
         # after the machine receives an entity, it must be removed from the pendingEntities list
-        from Globals import G
-        if G.Router:
-            if activeEntity in G.pendingEntities:
-                G.pendingEntities.remove(activeEntity)
+        if self.context.Router:
+            if activeEntity in self.context.pendingEntities:
+                self.context.pendingEntities.remove(activeEntity)
         return activeEntity
   
     # =======================================================================
@@ -1152,12 +1150,12 @@ class Machine(CoreObject):
             operator.timeLastShiftEnded=self.env.now      
             operator.unAssign()     # set the flag operatorAssignedTo to None     
             operator.workingStation=None  
-            self.outputTrace(operator.name, "released from "+ self.objName)
+            self.outputTrace(operator.name, "released from "+ self.objName, kind='operatorRelease')
         # XXX in case of skilled operators which stay at the same station should that change
         elif not operator.operatorDedicatedTo==self:
             operator.unAssign()     # set the flag operatorAssignedTo to None
             operator.workingStation=None
-            self.outputTrace(operator.name, "released from "+ self.objName)
+            self.outputTrace(operator.name, "released from "+ self.objName, kind='operatorRelease')
             # if the Router is expecting for signal send it
             from Globals import G
             from SkilledOperatorRouter import SkilledRouter
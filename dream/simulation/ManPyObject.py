@@ -27,10 +27,38 @@ Class that acts as an abstract. It should have no instances. All ManPy objects i
 Also only abstract ManPy classes inherit directly (CoreObject, Entity, ObjectResource, ObjectInterruption)
 '''
 
+from SimulationContext import getCurrentContext
+from Tracing import KEYWORD_CATEGORIES, formatKeywordMessage
+
+# ===========================================================================
+# the flags of the signals an object is yielding for. The signals are fixed when the
+# object is created, so that all the flags are cleared at once when a signal is sent
+# ===========================================================================
+class ExpectedSignals(dict):
+    def __init__(self, *args, **kw):
+        dict.__init__(self, *args, **kw)
+        self.cleared=dict.fromkeys(self, 0)     # all the signals, not expected
+
+    # =======================================================================
+    # sets all the flags to 0
+    # =======================================================================
+    def reset(self):
+        if len(self.cleared)!=len(self):
+            # a signal was added after the creation of the object
+            self.cleared=dict.fromkeys(self, 0)
+        self.update(self.cleared)
+
 # ===========================================================================
 # the ManPy object
 # ===========================================================================
 class ManPyObject(object):
+    # the sub-index of G.registry the object is registered in (None for no registration)
+    registryCategory=None
+    # the category of the messages of printTrace that have no keyword (see Tracing)
+    traceCategory=None
+    # the attributes of the objects are kept in slots. The subclasses that declare their own
+    # slots (the entities) only allocate a __dict__ if an attribute that is not in the slots is set
+    __slots__=('id', 'name', 'context', '__dict__', '__weakref__')
     
     def __init__(self, id, name,**kw):
         if id:
@@ -45,6 +73,10 @@ class ManPyObject(object):
         # if no name was given give id as name  
         else:
             self.name=self.id    
+        # the context of the simulation run the object belongs to
+        self.context=getCurrentContext()
+        # register the object so that it can be found by its id
+        self.context.registry.register(self)
             
     #===========================================================================
     #  method used to request allocation from the Router
@@ -98,53 +130,39 @@ class ManPyObject(object):
         # flag used to inform if the operators assigned to the station are skilled (skillsList)
         return any(operator.skillsList for operator in G.OperatorsList)
     
-    @staticmethod
-    def printTrace(entity='', **kw):
+    #===========================================================================
+    # prints a message of the object to the console (or to the output of the tracer).
+    # The message is only formatted if the tracer traces its category and the object
+    #===========================================================================
+    def printTrace(self, entity='', **kw):
         assert len(kw)==1, 'only one phrase per printTrace supported for the moment'
-        from Globals import G
-        import Globals
-        time=G.env.now
-        charLimit=60
-        remainingChar=charLimit-len(entity)-len(str(time))
-        if(G.console=='Yes'):
-            print time,entity,
-            for key in kw:
-                if key not in Globals.getSupportedPrintKwrds():
-                    raise ValueError("Unsupported phrase %s for %s" % (key, entity))
-                element=Globals.getPhrase()[key]
-                phrase=element['phrase']
-                prefix=element.get('prefix',None)
-                suffix=element.get('suffix',None)
-                arg=kw[key]
-                if prefix:
-                    print prefix*remainingChar,phrase,arg
-                elif suffix:
-                    remainingChar-=len(phrase)+len(arg)
-                    suffix*=remainingChar
-                    if key=='enter':
-                        suffix=suffix+'>'
-                    print phrase,arg,suffix
-                else:
-                    print phrase,arg
+        context=getCurrentContext()
+        tracer=context.tracer
+        if not tracer.enabled:
+            return
+        for key in kw:
+            category=KEYWORD_CATEGORIES.get(key)
+            if category is None:
+                raise ValueError("Unsupported phrase %s for %s" % (key, entity))
+            if tracer.isEnabledFor(self, category):
+                tracer.emit(category, formatKeywordMessage(context.env.now, entity, key, kw[key]))
+
+    #===========================================================================
+    # returns True if the messages of the object in the category are traced, so that
+    # the arguments of printTrace that are costly to build are only built if needed
+    #===========================================================================
+    def isTraced(self, category=None):
+        tracer=getCurrentContext().tracer
+        return tracer.enabled and tracer.isEnabledFor(self, category or self.traceCategory)
                     
     # =======================================================================
-    # outputs message to the trace.xls 
-    # outputs message to the trace.xls. Format is (Simulation Time | Entity or Frame Name | message)
+    # outputs message to the trace sink of the run. A record of the trace is
+    # (Simulation Time | Object ID | Entity or Frame Name | Event kind | message)
     # =======================================================================
-    @staticmethod
-    def outputTrace(entityName, message):
-        from Globals import G
+    def outputTrace(self, entityName, message, kind=None):
+        G=getCurrentContext()
         if(G.trace=="Yes"):         #output only if the user has selected to
-            #handle the 3 columns
-            G.traceSheet.write(G.traceIndex,0,str(G.env.now))
-            G.traceSheet.write(G.traceIndex,1,entityName)
-            G.traceSheet.write(G.traceIndex,2,message)          
-            G.traceIndex+=1       #increment the row
-            #if we reach row 65536 we need to create a new sheet (excel limitation)  
-            if(G.traceIndex==65536):
-                G.traceIndex=0
-                G.sheetIndex+=1
-                G.traceSheet=G.traceFile.add_sheet('sheet '+str(G.sheetIndex), cell_overwrite_ok=True)
+            G.traceSink.write(G.env.now, self.id, entityName, kind, message)
                 
     #===========================================================================
     # sends a signal
@@ -159,8 +177,7 @@ class ManPyObject(object):
         # send the signal
         signal.succeed(succeedTuple)
         # reset the expected signals of the receiver to 0
-        for key, value in receiver.expectedSignals.iteritems():
-            receiver.expectedSignals[key]=0
+        receiver.expectedSignals.reset()
           
     #===========================================================================
     # actions to be performed after the end of the simulation
@@ -240,7 +240,7 @@ class MouldAssembly(MachineJobShop):
             # normal processing operation
             processingTime=firstStep['processingTime']
             processingTime=self.getOperationTime(processingTime)
-            self.rng=RandomNumberGenerator(self, processingTime)
+            self.rng=RandomNumberGenerator(self, processingTime, purpose='processing')
             self.procTime=self.rng.generateNumber()
             # update the activeObject's processing time according to the readings in the mould's route
             processDistType=processingTime.keys()[0]
@@ -251,7 +251,7 @@ class MouldAssembly(MachineJobShop):
             setupTime=firstStep.get('setupTime',None)
             if setupTime:
                 setupTime=self.getOperationTime(setupTime)
-                self.stpRng=RandomNumberGenerator(self, setupTime)
+                self.stpRng=RandomNumberGenerator(self, setupTime, purpose='setup')
                 # update the activeObject's processing time according to the readings in the mould's route
                 setupDistType=setupTime.keys()[0]
                 setTime=float(setupTime[setupDistType].get('mean', 0))
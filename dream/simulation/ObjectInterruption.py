@@ -28,12 +28,14 @@ Class that acts as an abstract. It should have no instances. All object interrup
 
 # from SimPy.Simulation import Process, Resource, reactivate, now
 import simpy
-from ManPyObject import ManPyObject
+from ManPyObject import ManPyObject, ExpectedSignals
 
 #===============================================================================
 # The ObjectInterruption process
 #===============================================================================
 class ObjectInterruption(ManPyObject):
+    registryCategory='ObjectInterruption'
+    traceCategory='interruption'
     
     def __init__(self, id='',name='',victim=None,**kw):
         ManPyObject.__init__(self,id,name)
@@ -47,7 +49,7 @@ class ObjectInterruption(ManPyObject):
             if isinstance(self.victim.objectInterruptions, list):
                 self.victim.objectInterruptions.append(self)
         # list of expected signals of an interruption (values can be used as flags to inform on which signals is the interruption currently yielding)
-        self.expectedSignals={
+        self.expectedSignals=ExpectedSignals({
                                 "victimOffShift":0,
                                 "victimOnShift":0,
                                 "victimStartsProcessing":0,
@@ -57,7 +59,7 @@ class ObjectInterruption(ManPyObject):
                                 "victimIsEmptyBeforeMaintenance":0,
                                 "resourceAvailable":0,
                                 "victimFailed":0
-                              }
+                              })
     
     def initialize(self):
         from Globals import G
@@ -71,7 +73,7 @@ class ObjectInterruption(ManPyObject):
         self.isWaitingForVictimOffShift=False
         self.isWaitingForVictimOnShift=False
         # list of expected signals of an interruption (values can be used as flags to inform on which signals is the interruption currently yielding)
-        self.expectedSignals={
+        self.expectedSignals=ExpectedSignals({
                                 "victimOffShift":0,
                                 "victimOnShift":0,
                                 "victimStartsProcessing":0,
@@ -81,7 +83,7 @@ class ObjectInterruption(ManPyObject):
                                 "victimIsEmptyBeforeMaintenance":0,
                                 "resourceAvailable":0,
                                 "victimFailed":0
-                              }
+                              })
     
     #===========================================================================
     # the main process of the core object
@@ -150,6 +152,6 @@ class ObjectInterruption(ManPyObject):
     #===========================================================================
     #print message in the console. Format is (Simulation Time | Entity or Frame Name | message)
     def printTrace(self, entityName, message):
-        from Globals import G
-        if(G.console=="Yes"):         #output only if the user has selected to
-            print self.env.now, entityName, message
\ No newline at end of file
+        tracer=self.context.tracer
+        if tracer.enabled and tracer.isEnabledFor(self, self.traceCategory):
+            tracer.emit(self.traceCategory, ' '.join([unicode(self.env.now), unicode(entityName), unicode(message)]))
\ No newline at end of file
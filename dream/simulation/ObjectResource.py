@@ -32,6 +32,9 @@ from ManPyObject import ManPyObject
 #                    the resource that repairs the machines
 # ===========================================================================
 class ObjectResource(ManPyObject):
+    registryCategory='ObjectResource'
+    # the lists holding the statistics of multiple runs (see CoreObject)
+    replicationResults=()
     
     def __init__(self,id='',name='',**kw):
         ManPyObject.__init__(self,id,name)
@@ -258,7 +258,7 @@ class OperatedMachine(Machine):
                 yield hold,self,tinM                                # getting processed for remaining processing time tinM
                 if self.interrupted():                              # if a failure occurs while processing the machine is interrupted.
                     # output to trace that the Machine (self.objName) got interrupted                                                                  
-                    self.outputTrace(self.getActiveObjectQueue()[0].name, "Interrupted at "+self.objName)
+                    self.outputTrace(self.getActiveObjectQueue()[0].name, "Interrupted at "+self.objName, kind='interruption')
                     # recalculate the processing time left tinM
                     tinM=tinM-(self.env.now-tBefore)
                     if(tinM==0):            # sometimes the failure may happen exactly at the time that the processing would finish
@@ -287,7 +287,7 @@ class OperatedMachine(Machine):
                     failureTime+=self.env.now-breakTime                                # dummy variable keeping track of the failure time 
                     # output to trace that the Machine self.objName was passivated for the current failure time
                     self.outputTrace(self.getActiveObjectQueue()[0].name,
-                    "passivated in "+self.objName+" for "+str(self.env.now-breakTime))
+                    "passivated in "+self.objName+" for "+str(self.env.now-breakTime), kind='passivation')
                     
     # =============== request a resource after the repair
                     if (self.operatorPool!="None")\
@@ -303,7 +303,7 @@ class OperatedMachine(Machine):
                 else:
                     processingEndedFlag=False
             # output to trace that the processing in the Machine self.objName ended
-            self.outputTrace(self.getActiveObjectQueue()[0].name,"ended processing in "+self.objName)
+            self.outputTrace(self.getActiveObjectQueue()[0].name,"ended processing in "+self.objName, kind='processingEnd')
             
     # =============== release resource after the end of processing
             if (self.operatorPool!='None')\
@@ -30,12 +30,14 @@ models an operator that operates a machine
 import simpy
 import xlwt
 from ObjectResource import ObjectResource
+from SchedulingRules import sortByRules, getSupportedSchedulingRules
 
 # ===========================================================================
 #                 the resource that operates the machines
 # ===========================================================================
 class Operator(ObjectResource):
-    family='Operator'  
+    family='Operator'
+    replicationResults=('Waiting', 'Working', 'OffShift')  
     
     def __init__(self, id, name, capacity=1, schedulingRule='FIFO', skillDict={}, skills=[], available=True,ouputSchedule=False,**kw):
         ObjectResource.__init__(self,id=id, name=name)
@@ -101,8 +103,7 @@ class Operator(ObjectResource):
         
     @staticmethod
     def getSupportedSchedulingRules():
-        return ("FIFO", "Priority", "WT", "EDD", "EOD",
-            "NumStages", "RPC", "LPT", "SPT", "MS", "WINQ")
+        return getSupportedSchedulingRules('Operator')
     
     #===========================================================================
     # assign an operator
@@ -146,10 +147,10 @@ class Operator(ObjectResource):
     # sort entities provided in a list
     #===========================================================================
     def sortEntities(self):
-        #if we have sorting according to multiple criteria we have to call the sorter many times
+        #if we have sorting according to multiple criteria they are all applied in one sort
         if self.schedulingRule=="MC":
-            for criterion in reversed(self.multipleCriterionList):
-               self.activeQSorter(criterion=criterion) 
+            sortByRules(self.candidateEntities, 
+                        [self.getSortingCriterion(criterion) for criterion in self.multipleCriterionList], self)
         #else we just use the default scheduling rule
         else:
             self.activeQSorter(self.schedulingRule)
@@ -158,95 +159,19 @@ class Operator(ObjectResource):
     #    sorts the Entities of the Queue according to the scheduling rule
     # =======================================================================
     def activeQSorter(self, criterion=None):
-        activeObjectQ=self.candidateEntities
-        
         if criterion==None:
-            criterion=self.schedulingRule           
-        #if the schedulingRule is first in first out
-        if criterion=="FIFO": 
-            # FIFO sorting has no meaning when sorting candidateEntities
-            self.activeQSorter('WT')
-        #if the schedulingRule is based on a pre-defined priority
-        elif criterion=="Priority":
-            
-            activeObjectQ.sort(key=lambda x: x.priority)
-        #if the scheduling rule is time waiting (time waiting of machine)
-        elif criterion=='WT':
-            
-            for part in activeObjectQ:
-                part.factor=0
-                if part.schedule:
-                   part.factor=self.env.now-part.schedule[-1][1] 
-            
-            activeObjectQ.sort(key=lambda x: x.factor, reverse=True)
-        #if the schedulingRule is earliest due date
-        elif criterion=="EDD":
-            
-            activeObjectQ.sort(key=lambda x: x.dueDate)   
-        #if the schedulingRule is earliest order date
-        elif criterion=="EOD":
-            
-            activeObjectQ.sort(key=lambda x: x.orderDate)
-        #if the schedulingRule is to sort Entities according to the stations they have to visit
-        elif criterion=="NumStages":
-            
-            activeObjectQ.sort(key=lambda x: len(x.remainingRoute), reverse=True)  
-        #if the schedulingRule is to sort Entities according to the their remaining processing time in the system
-        elif criterion=="RPC":
-            
-            for entity in activeObjectQ:
-                RPT=0
-                for step in entity.remainingRoute:
-                    processingTime=step.get('processingTime',None)
-                    if processingTime:
-                        RPT+=float(processingTime.get('Fixed',{}).get('mean',0))           
-                entity.remainingProcessingTime=RPT
-            activeObjectQ.sort(key=lambda x: x.remainingProcessingTime, reverse=True)     
-        #if the schedulingRule is to sort Entities according to longest processing time first in the next station
-        elif criterion=="LPT":
-            
-            for entity in activeObjectQ:
-                processingTime = entity.remainingRoute[0].get('processingTime',None)
-                entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                if processingTime:
-                    entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                else:
-                    entity.processingTimeInNextStation=0
-            activeObjectQ.sort(key=lambda x: x.processingTimeInNextStation, reverse=True)             
-        #if the schedulingRule is to sort Entities according to shortest processing time first in the next station
-        elif criterion=="SPT":
-            
-            for entity in activeObjectQ:
-                processingTime = entity.remainingRoute[0].get('processingTime',None)
-                if processingTime:
-                    entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                else:
-                    entity.processingTimeInNextStation=0
-            activeObjectQ.sort(key=lambda x: x.processingTimeInNextStation) 
-        #if the schedulingRule is to sort Entities based on the minimum slackness
-        elif criterion=="MS":
-            
-            for entity in activeObjectQ:
-                RPT=0
-                for step in entity.remainingRoute:
-                    processingTime=step.get('processingTime',None)
-                    if processingTime:
-                        RPT+=float(processingTime.get('Fixed',{}).get('mean',0))              
-                entity.remainingProcessingTime=RPT
-            activeObjectQ.sort(key=lambda x: (x.dueDate-x.remainingProcessingTime))  
-        #if the schedulingRule is to sort Entities based on the length of the following Queue
-        elif criterion=="WINQ":
-            
-            from Globals import G
-            for entity in activeObjectQ:
-                nextObjIds=entity.remainingRoute[1].get('stationIdsList',[])
-                for obj in G.ObjList:
-                    if obj.id in nextObjIds:
-                        nextObject=obj
-                entity.nextQueueLength=len(nextObject.getActiveObjectQueue())           
-            activeObjectQ.sort(key=lambda x: x.nextQueueLength)
-        else:
-            assert False, "Unknown scheduling criterion %r" % (criterion, )
+            criterion=self.schedulingRule
+        sortByRules(self.candidateEntities, [self.getSortingCriterion(criterion)], self)
+
+    # =======================================================================
+    #    FIFO sorting has no meaning when sorting candidateEntities,
+    #    the time waiting of the machines is used instead
+    # =======================================================================
+    @staticmethod
+    def getSortingCriterion(criterion):
+        if criterion=="FIFO":
+            return "WT"
+        return criterion
             
     # =======================================================================    
     #            actions to be taken after the simulation ends
@@ -0,0 +1,201 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+assigns the skilled operators to the stations, with the objective of opAss_LP.
+The solutions are cached for identical inputs. When the objective reduces to a
+weighted matching (no subline objective and one machine per station) the optimal
+assignment is found in process, by successive shortest augmenting paths, and the
+LP is only solved if this optimum is not unique (the LP solver could pick another one)
+'''
+
+from collections import OrderedDict
+
+from opAss_LPmethod import opAss_LP
+
+# ===========================================================================
+# returns a list with, for every number k of assignments, the (value, assignment)
+# of the maximum weight assignment of k operators to machines. weights is a dict
+# (operator, machine) -> weight, operators and machines give the order of the search
+# ===========================================================================
+def bestAssignments(weights, operators, machines):
+    machinesOf={}
+    for (operator, machine) in weights:
+        machinesOf.setdefault(operator, []).append(machine)
+    assignment={}               # operator -> machine
+    operatorOf={}               # machine -> operator
+    results=[(0.0, {})]
+    while 1:
+        # longest augmenting path from a free operator to a free machine (Bellman-Ford,
+        # the assignment being optimal for its size there is no positive cycle)
+        gain={}
+        parent={}
+        for operator in operators:
+            if operator not in assignment:
+                gain[operator]=0.0
+        for i in range(len(operators)+len(machines)+1):
+            changed=False
+            for operator in operators:
+                if operator not in gain:
+                    continue
+                for machine in machinesOf.get(operator, []):
+                    if assignment.get(operator)==machine:
+                        continue
+                    value=gain[operator]+weights[(operator, machine)]
+                    if value>gain.get(('machine', machine), None):
+                        gain[('machine', machine)]=value
+                        parent[machine]=operator
+                        # the operator of the machine can move to another machine
+                        previous=operatorOf.get(machine)
+                        if previous is not None:
+                            value-=weights[(previous, machine)]
+                            if value>gain.get(previous, None):
+                                gain[previous]=value
+                        changed=True
+            if not changed:
+                break
+        free=[machine for machine in machines
+              if machine not in operatorOf and ('machine', machine) in gain]
+        if not free:
+            return results
+        end=max(free, key=lambda machine: gain[('machine', machine)])
+        # augment along the path
+        value=results[-1][0]+gain[('machine', end)]
+        machine=end
+        while machine is not None:
+            operator=parent[machine]
+            nextMachine=assignment.get(operator)
+            assignment[operator]=machine
+            operatorOf[machine]=operator
+            machine=nextMachine
+        results.append((value, dict(assignment)))
+
+# ===========================================================================
+# the engine assigning the operators, one per SkilledRouter
+# ===========================================================================
+class OperatorAssignment(object):
+    tolerance=1e-9
+
+    def __init__(self, cacheSize=256):
+        self.cacheSize=cacheSize
+        self.solutions=OrderedDict()     # the most recent solutions, keyed by their inputs
+        self.cacheHits=0
+        self.fastSolutions=0            # the number of solutions found without the LP
+        self.LPSolutions=0
+
+    # =======================================================================
+    # returns the assignment {operator id: machine id}, see opAss_LP
+    # =======================================================================
+    def solve(self, machineList, PBlist, PBskills, previousAssignment={},
+              weightFactors=[2, 1, 0, 2, 1, 1], Tool={}):
+        key=None
+        if not Tool:
+            key=repr((sorted((mach, sorted(data.items())) for (mach, data) in machineList.items()),
+                      list(PBlist), sorted((oper, list(PBskills[oper])) for oper in PBlist),
+                      sorted(previousAssignment.items()), list(weightFactors)))
+            solution=self.solutions.pop(key, None)
+            if solution is not None:
+                self.solutions[key]=solution
+                self.cacheHits+=1
+                return dict(solution)
+        solution=self.solveFast(machineList, PBlist, PBskills, previousAssignment, weightFactors)
+        if solution is None:
+            solution=opAss_LP(machineList, PBlist, PBskills, previousAssignment=previousAssignment,
+                              weightFactors=weightFactors, Tool=Tool)
+            self.LPSolutions+=1
+        else:
+            self.fastSolutions+=1
+        if key is not None and self.cacheSize:
+            self.solutions[key]=dict(solution)
+            while len(self.solutions)>self.cacheSize:
+                self.solutions.popitem(last=False)
+        return solution
+
+    # =======================================================================
+    # returns the optimal assignment if the objective is a weighted matching
+    # and its optimum is unique, otherwise None
+    # =======================================================================
+    def solveFast(self, machineList, PBlist, PBskills, previousAssignment, weightFactors):
+        machines=machineList.keys()
+        # the subline objective is not a matching
+        if weightFactors[3]>0 and [mach for mach in machines if machineList[mach]['stationID'] in [0,1,2]]:
+            return None
+        stations={}
+        for mach in machines:
+            stations[machineList[mach]['stationID']]=stations.get(machineList[mach]['stationID'], 0)+1
+        # the distribution across the stations is a function of the number of
+        # assignments only if every station has one machine
+        if weightFactors[1]>0 and max(stations.values()+[0])>1:
+            return None
+        # the weight of every (operator, machine) pair in the objective of opAss_LP
+        weights=OrderedDict()
+        for oper in PBlist:
+            for mach in machines:
+                if machineList[mach]['stationID'] in PBskills[oper]:
+                    weights[(oper, mach)]=0.0
+        sumWIP=float(sum([machineList[mach]['WIP'] for mach in machines]))
+        if weightFactors[0]>0 and sumWIP>0:
+            for (oper, mach) in weights:
+                weights[(oper, mach)]+=machineList[mach]['WIP']*weightFactors[0]/sumWIP
+        if weightFactors[2]>0:
+            # the variation from the previous assignment
+            for pb in previousAssignment:
+                if pb in PBlist:
+                    for station in PBskills[pb]:
+                        for mach in machineList:
+                            if machineList[mach]['stationID']==station:
+                                variation=weightFactors[2]/(2.0*len(previousAssignment))
+                                if previousAssignment[pb]==mach:
+                                    weights[(pb, mach)]+=variation
+                                else:
+                                    weights[(pb, mach)]-=variation
+        lastAssignmentSum=float(sum([machineList[mach]['lastAssignment'] for mach in machines]))
+        if lastAssignmentSum>0 and weightFactors[4]>0:
+            for (oper, mach) in weights:
+                weights[(oper, mach)]+=machineList[mach]['lastAssignment']*weightFactors[4]/lastAssignmentSum
+        if weightFactors[5]>0:
+            for (oper, mach) in weights:
+                weights[(oper, mach)]+=weightFactors[5]/float(len(PBlist))
+        # the distribution objective, a penalty for every pair of stations
+        # with and without operator
+        numberOfStations=len(stations)
+        def penalty(k):
+            if weightFactors[1]>0 and numberOfStations>1:
+                return weightFactors[1]*k*(numberOfStations-k)/(numberOfStations*(numberOfStations-1)/2.0)
+            return 0
+
+        results=bestAssignments(weights, list(PBlist), machines)
+        values=[value-penalty(k) for (k, (value, assignment)) in enumerate(results)]
+        best=max(range(len(values)), key=lambda k: values[k])
+        # another number of assignments as good
+        for (k, value) in enumerate(values):
+            if k!=best and value>=values[best]-self.tolerance:
+                return None
+        solution=results[best][1]
+        # another assignment of the same size as good
+        for (oper, mach) in solution.items():
+            otherWeights=OrderedDict([(pair, weight) for (pair, weight) in weights.items()
+                                      if pair!=(oper, mach)])
+            otherResults=bestAssignments(otherWeights, list(PBlist), machines)
+            if len(otherResults)>best and otherResults[best][0]>=results[best][0]-self.tolerance:
+                return None
+        return solution
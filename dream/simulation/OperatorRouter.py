@@ -26,13 +26,29 @@ Created on 19 Feb 2013
 Models an Interruption that schedules the operation of the machines by different managers
 '''
 import simpy
+from simpy.events import Event, NORMAL
 
 from ObjectInterruption import ObjectInterruption
 
+# ===========================================================================
+#   an event triggered at the current time after all the other events of 
+#  this time, including the ones scheduled while they are processed. It is 
+#  scheduled with a priority lower than the priority of the simpy events
+# ===========================================================================
+class EndOfTimestep(Event):
+    priority=NORMAL+1
+    
+    def __init__(self, env):
+        Event.__init__(self, env)
+        self._ok=True
+        self._value=None
+        env.schedule(self, self.priority)
+
 # ===========================================================================
 #               Class that handles the Operator Behavior
 # ===========================================================================
 class Router(ObjectInterruption):
+    traceCategory='router'
     
     # =======================================================================
     #   according to this implementation one machine per broker is allowed
@@ -92,13 +108,8 @@ class Router(ObjectInterruption):
             self.printTrace('','=-'*15)
             self.printTrace('','router received event')
             # wait till there are no more events, the machines must be blocked
-            while 1:
-                if self.env.now==self.env.peek():
-                    self.printTrace('', 'there are MORE events for now')
-                    yield self.env.timeout(0)
-                else:
-                    self.printTrace('','there are NO more events for now')
-                    break
+            yield EndOfTimestep(self.env)
+            self.printTrace('','there are NO more events for now')
             self.printTrace('','=-'*15)
             # entry actions
             self.entryActions()
@@ -154,7 +165,8 @@ class Router(ObjectInterruption):
                 # check if the candidateOperators are available, if the are requested and reside in the pendingObjects list
                 if operator.checkIfResourceIsAvailable():
                     # assign an operator to the priorityObject
-                    self.printTrace('router', 'will assign '+operator.id+' to '+operator.candidateStation.id)
+                    if self.isTraced():
+                        self.printTrace('router', 'will assign '+operator.id+' to '+operator.candidateStation.id)
                     operator.assignTo(operator.candidateStation)
                     if not operator.candidateStation in self.toBeSignalled:
                         self.toBeSignalled.append(operator.candidateStation)
@@ -164,11 +176,13 @@ class Router(ObjectInterruption):
                     #     currently working on must be preempted, and he must be unassigned and assigned to the new station
                     if operator.workingStation!=operator.candidateStation:
                         operator.unAssign()
-                        self.printTrace('router', ' will assign'+operator.id+'to'+operator.candidateStation.id)
+                        if self.isTraced():
+                            self.printTrace('router', ' will assign'+operator.id+'to'+operator.candidateStation.id)
                         operator.assignTo(operator.candidateStation)
                     if not operator.candidateStation in self.toBeSignalled:
                         self.toBeSignalled.append(operator.candidateStation)
-        self.printTrace('objects to be signaled:'+' '*11, [str(object.id) for object in self.toBeSignalled])
+        if self.isTraced():
+            self.printTrace('objects to be signaled:'+' '*11, [str(object.id) for object in self.toBeSignalled])
     
     #===========================================================================
     # entry actions 
@@ -217,39 +231,46 @@ class Router(ObjectInterruption):
                     if station!=operator.workingStation:
                         # preempt operators currentStation
                         operator.workingStation.shouldPreempt=True
-                        self.printTrace('router', 'preempting '+operator.workingStation.id+'.. '*6)
+                        if self.isTraced():
+                            self.printTrace('router', 'preempting '+operator.workingStation.id+'.. '*6)
                         operator.workingStation.preempt()
                         operator.workingStation.timeLastEntityEnded=self.env.now     #required to count blockage correctly in the preemptied station
                     station.shouldPreempt=True
-                    self.printTrace('router', 'preempting receiver '+station.id+'.. '*6)
+                    if self.isTraced():
+                        self.printTrace('router', 'preempting receiver '+station.id+'.. '*6)
                     station.preempt()
                     station.timeLastEntityEnded=self.env.now     #required to count blockage correctly in the preemptied station
                 elif station.broker.waitForOperator:
                     # signal this station's broker that the resource is available
                     if station.broker.expectedSignals['resourceAvailable']:
                         self.sendSignal(receiver=station.broker, signal=station.broker.resourceAvailable)
-                        self.printTrace('router', 'signalling broker of'+' '*50+operator.isAssignedTo().id)
+                        if self.isTraced():
+                            self.printTrace('router', 'signalling broker of'+' '*50+operator.isAssignedTo().id)
                 else:
                     # signal the queue proceeding the station
                     if station.canAccept()\
                             and any(type=='Load' for type in station.multOperationTypeList):
                         if station.expectedSignals['loadOperatorAvailable']:
                             self.sendSignal(receiver=station, signal=station.loadOperatorAvailable)
-                            self.printTrace('router', 'signalling'+' '*50+operator.isAssignedTo().id)
+                            if self.isTraced():
+                                self.printTrace('router', 'signalling'+' '*50+operator.isAssignedTo().id)
     
     #===========================================================================
     # find the stations that can be signalled by the router and the entities that are requesting operators now
     #===========================================================================
     def findPending(self):
         from Globals import G
-        # first sort the queues according to their sorting rule
+        # first sort the queues according to their sorting rule (the empty ones need no sorting)
         for object in G.ObjList:
-            object.sortEntities()
-            object.getActiveObjectQueue().sort(key=lambda x:x.isCritical, reverse=True)
+            activeObjectQueue=object.getActiveObjectQueue()
+            if activeObjectQueue:
+                object.sortEntities()
+                activeObjectQueue.sort(key=lambda x:x.isCritical, reverse=True)
+        machines=set(G.MachineList)
         # search among the pendingEntities
         for entity in G.pendingEntities:
             # if the entity resides in a machine that waits for load operation
-            if entity.currentStation in G.MachineList:
+            if entity.currentStation in machines:
                 if entity.currentStation.broker.waitForOperator:
                     self.pendingMachines.append(entity.currentStation)
                     self.pending.append(entity)
@@ -257,7 +278,7 @@ class Router(ObjectInterruption):
             if entity.currentStation.getActiveObjectQueue().index(entity)==0:
                 # check the next stations
                 for machine in entity.currentStation.next:
-                    if machine in G.MachineList and entity.checkIfRequiredPartsReady() and entity.currentStation.haveToDispose():
+                    if machine in machines and entity.checkIfRequiredPartsReady() and entity.currentStation.haveToDispose():
                         if any(type=='Load' for type in machine.multOperationTypeList) and not entity.currentStation in self.pendingQueues:
                             self.pendingQueues.append(entity.currentStation)
                             self.pending.append(entity)
@@ -277,9 +298,10 @@ class Router(ObjectInterruption):
 #                         break
         # figure out which queues are holding critical pending entities 
         self.findCriticalQueues()
-        self.printTrace('pendingMachines'+'-'*19+'>', [str(object.id) for object in self.pendingMachines])
-        self.printTrace('pendingQueues'+'-'*21+'>', [str(object.id) for object in self.pendingQueues])
-        self.printTrace('found pending entities'+'-'*12+'>', [str(entity.id) for entity in self.pending if not entity.type=='Part'])
+        if self.isTraced():
+            self.printTrace('pendingMachines'+'-'*19+'>', [str(object.id) for object in self.pendingMachines])
+            self.printTrace('pendingQueues'+'-'*21+'>', [str(object.id) for object in self.pendingQueues])
+            self.printTrace('found pending entities'+'-'*12+'>', [str(entity.id) for entity in self.pending if not entity.type=='Part'])
     
     #===========================================================================
     # find the pending queues that hold critical pending entities 
@@ -329,8 +351,9 @@ class Router(ObjectInterruption):
 
         # if there are candidate operators
         if self.candidateOperators:
-            self.printTrace('router found candidate operators'+' '*3,
-                            [(operator.id, [station.id for station in operator.candidateStations]) for operator in self.candidateOperators])
+            if self.isTraced():
+                self.printTrace('router found candidate operators'+' '*3,
+                                [(operator.id, [station.id for station in operator.candidateStations]) for operator in self.candidateOperators])
         else:    
             self.printTrace('router', 'found NO candidate operators')
             
@@ -30,7 +30,7 @@ Models an Interruption that schedules the operation of the machines by different
 # from SimPy.Simulation import Process, Resource, SimEvent
 import simpy
 
-from OperatorRouter import Router
+from OperatorRouter import Router, EndOfTimestep
 # from SimPy.Simulation import waituntil, now, hold, request, release, waitevent
 
 
@@ -84,13 +84,8 @@ class RouterManaged(Router):
             self.printTrace('','=-'*15)
             self.printTrace('','router received event')
             # wait till there are no more events, the machines must be blocked
-            while 1:
-                if self.env.now==self.env.peek():
-                    self.printTrace('', 'there are MORE events for now')
-                    yield self.env.timeout(0)
-                else:
-                    self.printTrace('','there are NO more events for now')
-                    break
+            yield EndOfTimestep(self.env)
+            self.printTrace('','there are NO more events for now')
             self.printTrace('','=-'*15)
             
             # entry actions
@@ -172,11 +167,13 @@ class RouterManaged(Router):
                         and (not operator in self.conflictingOperators)\
                         and operator.candidateEntity.candidateReceiver:
                         # assign an operator to the priorityObject
-                        self.printTrace('router', 'will assign '+operator.id+' to -->  '+operator.candidateEntity.candidateReceiver.id)
+                        if self.isTraced():
+                            self.printTrace('router', 'will assign '+operator.id+' to -->  '+operator.candidateEntity.candidateReceiver.id)
                         operator.assignTo(operator.candidateEntity.candidateReceiver)
                         if not operator.candidateEntity.currentStation in self.toBeSignalled:
                             self.toBeSignalled.append(operator.candidateEntity.currentStation)
-        self.printTrace('objects to be signalled:'+' '*11, [str(object.id) for object in self.toBeSignalled])
+        if self.isTraced():
+            self.printTrace('objects to be signalled:'+' '*11, [str(object.id) for object in self.toBeSignalled])
     
     #===========================================================================
     # signal stations that wait for load operators
@@ -189,7 +186,8 @@ class RouterManaged(Router):
                 # if the router deals with simple entities
                 if station in self.pendingMachines and station in self.toBeSignalled:
                     # signal this station's broker that the resource is available
-                    self.printTrace('router','signalling broker of'+' '*50+operator.isAssignedTo().id)
+                    if self.isTraced():
+                        self.printTrace('router','signalling broker of'+' '*50+operator.isAssignedTo().id)
                     if operator.isAssignedTo().broker.expectedSignals['resourceAvailable']:
                         self.sendSignal(receiver=operator.isAssignedTo().broker, signal=operator.isAssignedTo().broker.resourceAvailable)
                 elif (not station in self.pendingMachines) or (not station in self.toBeSignalled):
@@ -200,7 +198,8 @@ class RouterManaged(Router):
                         and any(type=='Load' for type in operator.candidateEntity.candidateReceiver.multOperationTypeList):
                         # if the station is already is already signalled then do not send event
                         if not operator.candidateEntity.currentStation.loadOperatorAvailable.triggered:
-                            self.printTrace('router','signalling queue'+' '*50+operator.candidateEntity.currentStation.id)
+                            if self.isTraced():
+                                self.printTrace('router','signalling queue'+' '*50+operator.candidateEntity.currentStation.id)
                             if operator.candidateEntity.currentStation.expectedSignals['loadOperatorAvailable']:
                                 self.sendSignal(receiver=operator.candidateEntity.currentStation, signal=operator.candidateEntity.currentStation.loadOperatorAvailable)
     
@@ -209,20 +208,22 @@ class RouterManaged(Router):
     #===========================================================================
     def findPendingObjects(self):
         from Globals import G
+        machines=set(G.MachineList)
         for entity in G.pendingEntities:
-            if entity.currentStation in G.MachineList:
+            if entity.currentStation in machines:
                 if entity.currentStation.broker.waitForOperator:
                     self.pendingMachines.append(entity.currentStation)
             for machine in entity.currentStation.next:
-                if machine in G.MachineList:
+                if machine in machines:
                     if any(type=='Load' for type in machine.multOperationTypeList) and not entity.currentStation in self.pendingQueues:
                         self.pendingQueues.append(entity.currentStation)
                         self.pendingObjects.append(entity.currentStation)
                         break
         self.pendingObjects=self.pendingQueues+self.pendingMachines
-        self.printTrace('router found pending objects'+'-'*6+'>', [str(object.id) for object in self.pendingObjects])
-        self.printTrace('pendingMachines'+'-'*19+'>', [str(object.id) for object in self.pendingMachines])
-        self.printTrace('pendingQueues'+'-'*21+'>', [str(object.id) for object in self.pendingQueues])
+        if self.isTraced():
+            self.printTrace('router found pending objects'+'-'*6+'>', [str(object.id) for object in self.pendingObjects])
+            self.printTrace('pendingMachines'+'-'*19+'>', [str(object.id) for object in self.pendingMachines])
+            self.printTrace('pendingQueues'+'-'*21+'>', [str(object.id) for object in self.pendingQueues])
     
     #===========================================================================
     # finding the entities that require manager now
@@ -232,13 +233,15 @@ class RouterManaged(Router):
         self.pending=[]             # list of entities that are pending
         for machine in self.pendingMachines:
             self.pending.append(machine.currentEntity)
+        queuesAndSources=set(G.QueueList+G.SourceList)
         for entity in G.pendingEntities:
-            if entity.currentStation in G.QueueList or entity.currentStation in G.SourceList:
+            if entity.currentStation in queuesAndSources:
                 for machine in entity.currentStation.next:
                     if any(type=='Load' for type in machine.multOperationTypeList):
                         self.pending.append(entity)
                         break
-        self.printTrace('found pending entities'+'-'*12+'>', [str(entity.id) for entity in self.pending if not entity.type=='Part'])
+        if self.isTraced():
+            self.printTrace('found pending entities'+'-'*12+'>', [str(entity.id) for entity in self.pending if not entity.type=='Part'])
         
     #========================================================================
     # Find candidate Operators
@@ -262,8 +265,9 @@ class RouterManaged(Router):
         # TODO: check if preemption can be implemented for the managed case
             # find the candidateEntities for each operator
             self.findCandidateEntities()
-        self.printTrace('router found candidate operators'+' '*3,
-                        [(operator.id, [station.id for station in operator.candidateStations]) for operator in self.candidateOperators])
+        if self.isTraced():
+            self.printTrace('router found candidate operators'+' '*3,
+                            [(operator.id, [station.id for station in operator.candidateStations]) for operator in self.candidateOperators])
     
     #===========================================================================
     # find the candidate entities for each candidateOperator
@@ -288,9 +292,10 @@ class RouterManaged(Router):
         for operator in [x for x in self.candidateOperators if x.candidateEntities]:
             operator.sortEntities()
         
-        self.printTrace('candidateEntities for each operator',\
-                        [(str(operator.id),[str(x.id) for x in operator.candidateEntities])
-                        for operator in self.candidateOperators])
+        if self.isTraced():
+            self.printTrace('candidateEntities for each operator',\
+                            [(str(operator.id),[str(x.id) for x in operator.candidateEntities])
+                            for operator in self.candidateOperators])
          
     #=======================================================================
     # Find candidate entities and their receivers
@@ -339,7 +344,8 @@ class RouterManaged(Router):
                     if conflictingGroup.index(operator)!=0:
                         self.candidateOperators.remove(operator)
             
-        self.printTrace('candidateReceivers for each entity ',[(str(entity.id),\
-                                                                            str(entity.candidateReceiver.id))
-                                                                            for entity in self.pending if entity.candidateReceiver])
+        if self.isTraced():
+            self.printTrace('candidateReceivers for each entity ',[(str(entity.id),\
+                                                                                str(entity.candidateReceiver.id))
+                                                                                for entity in self.pending if entity.candidateReceiver])
         
\ No newline at end of file
@@ -33,6 +33,7 @@ from Job import Job
 # =======================================================================
 class Order(Job):
     type="Order"
+    registryCategory='Order'
     # XX define which are the valid assembly types - for which components should the order be searching for 
     assemblyValidTypes=set(['Mold Base', 'Mold Insert', 'Slider', 'Misc', 'Z-standards', 'K-Standards'])
     assemblyInvalidTypes=set(['Mold','Injection Molding Part'])
@@ -33,6 +33,7 @@ from Entity import Entity
 #The part object
 class Part(Entity):
     type="Part"
+    __slots__=()
     def __init__(self, id=None, name=None, remainingProcessingTime=0,currentStation=None,**kw):
         Entity.__init__(self, id, name, remainingProcessingTime=remainingProcessingTime,currentStation=currentStation) 
 
@@ -36,8 +36,8 @@ class PeriodicMaintenance(ObjectInterruption):
     
     def __init__(self, id='',name='',victim=None, distribution=None, index=0, repairman=None,**kw):
         ObjectInterruption.__init__(self,id,name,victim=victim)
-        self.rngTTF=RandomNumberGenerator(self, distribution.get('TTF',{'Fixed':{'mean':100}}))
-        self.rngTTR=RandomNumberGenerator(self, distribution.get('TTR',{'Fixed':{'mean':10}}))
+        self.rngTTF=RandomNumberGenerator(self, distribution.get('TTF',{'Fixed':{'mean':100}}), purpose='TTF')
+        self.rngTTR=RandomNumberGenerator(self, distribution.get('TTR',{'Fixed':{'mean':10}}), purpose='TTR')
         self.name="F"+str(index)
         self.repairman=repairman        # the resource that may be needed to fix the failure
                                         # if now resource is needed this will be "None" 
@@ -83,7 +83,7 @@ class PeriodicMaintenance(ObjectInterruption):
                     self.sendSignal(receiver=oi, signal=oi.victimFailed)
             self.victim.Up=False
             self.victim.timeLastFailure=self.env.now           
-            self.outputTrace(self.victim.name,"is down")
+            self.outputTrace(self.victim.name,"is down", kind='failure')
             # update the failure time
             failTime=self.env.now    
             if(self.repairman and self.repairman!="None"):     # if the failure needs a resource to be fixed, 
@@ -100,7 +100,7 @@ class PeriodicMaintenance(ObjectInterruption):
                     self.victim.totalFailureTime+=self.env.now-failTime    
                     self.reactivateVictim()                     # since repairing is over, the Machine is reactivated
                     self.victim.Up=True              
-                    self.outputTrace(self.victim.name,"is up")
+                    self.outputTrace(self.victim.name,"is up", kind='repair')
                     
                     self.repairman.totalWorkingTime+=self.env.now-timeOperationStarted   
                 continue
@@ -125,4 +125,4 @@ class PeriodicMaintenance(ObjectInterruption):
                 self.victim.totalFailureTime+=self.env.now-failTime   
             self.reactivateVictim()                     # since repairing is over, the Machine is reactivated
             self.victim.Up=True              
-            self.outputTrace(self.victim.name,"is up")
+            self.outputTrace(self.victim.name,"is up", kind='repair')
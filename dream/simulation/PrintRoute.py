@@ -1,6 +1,6 @@
 import Globals
-import xlwt
 from Globals import G
+from TraceSink import RouteTable
 
 import OrderComponent
 import Mould
@@ -55,9 +55,8 @@ def outputRoute():
     
     if G.trace=='Yes':
         if G.JobList:
-            G.routeSheetIndex=G.sheetIndex+1
-            # add one more sheet to the trace file
-            G.routeTraceSheet=G.traceFile.add_sheet('sheet '+str(G.routeSheetIndex)+' route', cell_overwrite_ok=True)
+            # the table of the routes, written to the trace sink at the end
+            G.routeTraceSheet=RouteTable()
             number_of_machines=len(G.MachineList)
             sortMachines()  # sort the machines according to the priority specified in JOB_SHOP_TECHNOLOGY_SEQ
             # get the events list
@@ -102,4 +101,4 @@ def outputRoute():
                 if job.schedule:
                     G.routeTraceSheet.write(number_of_events+2+j, 0, job.id)
                     G.routeTraceSheet.write(number_of_events+2+j, 1, job.alias)
-            
\ No newline at end of file
+            G.traceSink.writeRoute(G.routeTraceSheet)
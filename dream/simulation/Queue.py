@@ -28,6 +28,7 @@ Models a FIFO queue where entities can wait in order to get into a server
 
 import simpy
 from CoreObject import CoreObject
+from SchedulingRules import sortByRules, getSupportedSchedulingRules
 # ===========================================================================
 #                            the Queue object
 # ===========================================================================
@@ -38,7 +39,7 @@ class Queue(CoreObject):
     # the __init__ method of the Queue
     #===========================================================================
     def __init__(self, id='', name='', capacity=1, isDummy=False, schedulingRule="FIFO", 
-                 level=None, gatherWipStat=False, **kw):
+                 level=None, gatherWipStat=False, wipStatOptions=None, **kw):
         self.type="Queue"           # String that shows the type of object
         CoreObject.__init__(self, id, name)
         capacity=float(capacity)
@@ -62,6 +63,8 @@ class Queue(CoreObject):
               (scheduling_rule, id))
 
         self.gatherWipStat=gatherWipStat
+        # options of the WipStatRecorder, e.g. {'changeOnly':1, 'interval':60, 'maxLength':10000}
+        self.wipStatOptions=dict(wipStatOptions or {})
         # trigger level for the reallocation of operators
         if level:
             assert level<=self.capacity, "the level cannot be bigger than the capacity of the queue"
@@ -71,8 +74,7 @@ class Queue(CoreObject):
             
     @staticmethod
     def getSupportedSchedulingRules():
-        return ("FIFO", "Priority", "EDD", "EOD",
-            "NumStages", "RPC", "LPT", "SPT", "MS", "WINQ")
+        return getSupportedSchedulingRules('Queue')
     
     #===========================================================================
     # the initialize method of the Queue class
@@ -237,10 +239,9 @@ class Queue(CoreObject):
     #    sorts the Entities of the Queue according to the scheduling rule
     # =======================================================================
     def sortEntities(self):
-        #if we have sorting according to multiple criteria we have to call the sorter many times
+        #if we have sorting according to multiple criteria they are all applied in one sort
         if self.schedulingRule=="MC":
-            for criterion in reversed(self.multipleCriterionList):
-               self.activeQSorter(criterion=criterion) 
+            sortByRules(self.Res.users, self.multipleCriterionList, self)
         #else we just use the default scheduling rule
         else:
             self.activeQSorter()
@@ -249,74 +250,9 @@ class Queue(CoreObject):
     #    sorts the Entities of the Queue according to the scheduling rule
     # =======================================================================
     def activeQSorter(self, criterion=None):
-        activeObjectQ=self.Res.users
         if criterion==None:
-            criterion=self.schedulingRule           
-        #if the schedulingRule is first in first out
-        if criterion=="FIFO": 
-            pass
-        #if the schedulingRule is based on a pre-defined priority
-        elif criterion=="Priority":
-            activeObjectQ.sort(key=lambda x: x.priority)
-        #if the schedulingRule is earliest due date
-        elif criterion=="EDD":
-            activeObjectQ.sort(key=lambda x: x.dueDate)   
-        #if the schedulingRule is earliest order date
-        elif criterion=="EOD":
-            activeObjectQ.sort(key=lambda x: x.orderDate)      
-        #if the schedulingRule is to sort Entities according to the stations they have to visit
-        elif criterion=="NumStages":
-            activeObjectQ.sort(key=lambda x: len(x.remainingRoute), reverse=True)  
-        #if the schedulingRule is to sort Entities according to the their remaining processing time in the system
-        elif criterion=="RPC":
-            for entity in activeObjectQ:
-                RPT=0
-                for step in entity.remainingRoute:
-                    processingTime=step.get('processingTime',None)
-                    if processingTime:
-                        RPT+=float(processingTime.get('Fixed',{}).get('mean',0))               
-                entity.remainingProcessingTime=RPT
-            activeObjectQ.sort(key=lambda x: x.remainingProcessingTime, reverse=True)     
-        #if the schedulingRule is to sort Entities according to longest processing time first in the next station
-        elif criterion=="LPT":
-            for entity in activeObjectQ:
-                processingTime = entity.remainingRoute[0].get('processingTime',None)
-                if processingTime:
-                    entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                else:
-                    entity.processingTimeInNextStation=0
-            activeObjectQ.sort(key=lambda x: x.processingTimeInNextStation, reverse=True)             
-        #if the schedulingRule is to sort Entities according to shortest processing time first in the next station
-        elif criterion=="SPT":
-            for entity in activeObjectQ:
-                processingTime = entity.remainingRoute[0].get('processingTime',None)
-                if processingTime:
-                    entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                else:
-                    entity.processingTimeInNextStation=0
-            activeObjectQ.sort(key=lambda x: x.processingTimeInNextStation) 
-        #if the schedulingRule is to sort Entities based on the minimum slackness
-        elif criterion=="MS":
-            for entity in activeObjectQ:
-                RPT=0
-                for step in entity.remainingRoute:
-                    processingTime=step.get('processingTime',None)
-                    if processingTime:
-                        RPT+=float(processingTime.get('Fixed',{}).get('mean',0))              
-                entity.remainingProcessingTime=RPT
-            activeObjectQ.sort(key=lambda x: (x.dueDate-x.remainingProcessingTime))  
-        #if the schedulingRule is to sort Entities based on the length of the following Queue
-        elif criterion=="WINQ":
-            from Globals import G
-            for entity in activeObjectQ:
-                nextObjIds=entity.remainingRoute[1].get('stationIdsList',[])
-                for obj in G.ObjList:
-                    if obj.id in nextObjIds:
-                        nextObject=obj
-                entity.nextQueueLength=len(nextObject.Res.users)           
-            activeObjectQ.sort(key=lambda x: x.nextQueueLength)
-        else:
-            assert False, "Unknown scheduling criterion %r" % (criterion, )
+            criterion=self.schedulingRule
+        sortByRules(self.Res.users, [criterion], self)
 
     def outputResultsJSON(self):
         from Globals import G
@@ -325,5 +261,5 @@ class Queue(CoreObject):
                 'family': self.family,
                 'results': {} }
         if self.gatherWipStat:
-            json['results']['wip_stat_list']=self.WipStat
+            json['results']['wip_stat_list']=[wipStat.tolist() for wipStat in self.WipStat]
         G.outputJSON['elementList'].append(json)
@@ -27,6 +27,9 @@ holds methods for generations of numbers from different distributions
 '''
 
 import math
+import os
+import hashlib
+import numpy
 
 class RandomNumberGenerator(object):
     # data should be given as a dict:
@@ -37,7 +40,9 @@ class RandomNumberGenerator(object):
 #             "parameterX":X,
 #            ...
 #         },
-    def __init__(self, obj, distribution):   
+    # purpose names the use of the numbers by obj (e.g. 'processing', 'TTF'), so that
+    # with common random numbers every use of every object has its own stream
+    def __init__(self, obj, distribution, purpose=None):   
         # if the distribution is not given as a dictionary throw error
         if not isinstance(distribution, dict):
             raise ValueError("distribution must be given as a dict")             
@@ -83,64 +88,252 @@ class RandomNumberGenerator(object):
         self.location=float(parameters.get('location',0))
         self.rate=float(parameters.get('rate',0))
         self.obj = obj
+        self.purpose = purpose
 
+    # =======================================================================
+    # returns a number from the distribution. The sampler of the distribution
+    # is compiled on the first call and then replaces this method
+    # =======================================================================
     def generateNumber(self):
+        self.generateNumber=self.compileSampler()
+        return self.generateNumber()
+
+    # =======================================================================
+    # returns a function without arguments returning numbers from the distribution.
+    # The parameters are checked and prepared once here. If the model asks for
+    # vectorised random numbers the numbers are drawn in blocks from numpy
+    # =======================================================================
+    def compileSampler(self):
         from Globals import G
-        if(self.distributionType=="Fixed"):     #if the distribution is Fixed 
-            return self.mean
-        elif(self.distributionType=="Exp"):     #if the distribution is Exponential
-            return G.Rnd.expovariate(1.0/(self.mean))
-        elif(self.distributionType=="Normal"):      #if the distribution is Normal
-            if self.max < self.min:
-                 raise ValueError("Normal distribution for %s uses wrong "
-                                  "parameters. max (%s) > min (%s)" % (
-                                    self.obj.id, self.max, self.min))
-            while 1:
-                number=G.Rnd.normalvariate(self.mean, self.stdev)
-                if number>self.max or number<self.min and max!=0:  #if the number is out of bounds repeat the process                                                                      #if max=0 this means that we did not have time "time" bounds             
-                    continue
-                else:           #if the number is in the limits stop the process
-                    return number
-        elif self.distributionType=="Gamma" or self.distributionType=="Erlang":    #if the distribution is gamma or erlang
+        if self.distributionType=="Normal" and self.max < self.min:
+            raise ValueError("Normal distribution for %s uses wrong "
+                             "parameters. max (%s) > min (%s)" % (
+                               self.obj.id, self.max, self.min))
+        if self.distributionType=="Fixed":      #if the distribution is Fixed
+            mean=self.mean
+            return lambda: mean
+        if self.distributionType in ("Gamma", "Erlang"):
             # in case shape is given instead of alpha
             if not self.alpha:
                 self.alpha=self.shape
             # in case rate is given instead of beta
             if not self.beta:
-                self.beta=1/float(self.rate)          
-            return G.Rnd.gammavariate(self.alpha, self.beta)
-        elif(self.distributionType=="Logistic"):     #if the distribution is Logistic
-            # XXX from http://stackoverflow.com/questions/3955877/generating-samples-from-the-logistic-distribution
-            # to check
-            while 1:
-                x = G.Rnd.random()
-                number=self.location + self.scale * math.log(x / (1-x))
-                if number>0:
-                    return number
-                else:
-                    continue
-        elif(self.distributionType=="Geometric"):     #if the distribution is Geometric
-            return G.numpyRnd.random.geometric(self.probability)
-        elif(self.distributionType=="Lognormal"):     #if the distribution is Lognormal
-            # XXX from the files lognormvariate(mu, sigma)
-            # it would be better to use same mean,stdev
-            return G.Rnd.lognormvariate(self.logmean, self.logsd)
-        elif(self.distributionType=="Weibull"):     #if the distribution is Weibull
-            return G.Rnd.weibullvariate(self.scale, self.shape)
-        elif(self.distributionType=="Cauchy"):     #if the distribution is Cauchy
-            # XXX from http://www.johndcook.com/python_cauchy_rng.html
-            while 1:
-                p = 0.0
-                while p == 0.0:
-                    p = G.Rnd.random()     
-                number=self.location + self.scale*math.tan(math.pi*(p - 0.5))
-                if number>0:
-                    return number
-                else:
-                    continue
-        elif(self.distributionType=="Triangular"):     #if the distribution is Triangular
-            return G.numpyRnd.random.triangular(left=self.min, right=self.max, mode=self.mean)
-        else:
+                self.beta=1/float(self.rate)
+        if self.distributionType not in self.scalarSamplers:
             raise ValueError("Unknown distribution %r used in %s %s" %
                             (self.distributionType, self.obj.__class__, self.obj.id))
+        if G.commonRandomNumbers or G.vectorisedRandomNumbers:
+            # the generators of an object with the same purpose and distribution (e.g. the ones
+            # built for every operation of a MachineJobShop) share their sampler, so that the
+            # numbers left in its block are not dropped with the generator. The samplers
+            # of the other random number modes are not shared
+            key=(self.getStreamKey(), self.getParameters(), G.commonRandomNumbers,
+                 G.vectorisedRandomNumbers, G.randomNumberBlockSize)
+            sampler=G.samplers.get(key)
+            if sampler is None:
+                if G.commonRandomNumbers:
+                    blockSize=1
+                    if G.vectorisedRandomNumbers:
+                        blockSize=G.randomNumberBlockSize
+                    sampler=SubstreamSampler(self, blockSize)
+                else:
+                    sampler=VectorisedSampler(self, G.randomNumberBlockSize)
+                G.samplers[key]=sampler
+            return sampler
+        sampler=self.scalarSamplers[self.distributionType]
+        return lambda: sampler(self, G)
+
+    # =======================================================================
+    # returns the distribution and its parameters as a tuple
+    # =======================================================================
+    def getParameters(self):
+        return (self.distributionType, self.mean, self.stdev, self.min, self.max,
+                self.alpha, self.beta, self.logmean, self.logsd, self.probability,
+                self.shape, self.scale, self.location, self.rate)
+
+    # =======================================================================
+    # returns the key of the random stream of this generator: the object
+    # (and the victim of interruptions) and the purpose. The ids of the
+    # interruptions are random if they are not given, so an interruption
+    # is known by its position among the interruptions of its victim
+    # =======================================================================
+    def getStreamKey(self):
+        victim=getattr(self.obj, 'victim', None)
+        objectKey=self.obj.id
+        interruptions=getattr(victim, 'objectInterruptions', None)
+        if interruptions and self.obj in interruptions:
+            objectKey=interruptions.index(self.obj)
+        return (self.obj.__class__.__name__, objectKey,
+                getattr(victim, 'id', None), self.purpose)
+
+    # =======================================================================
+    # the samplers drawing one number at a time from G.Rnd (and G.numpyRnd)
+    # =======================================================================
+    def sampleExp(self, G):
+        return G.Rnd.expovariate(1.0/(self.mean))
+
+    def sampleNormal(self, G):
+        while 1:
+            number=G.Rnd.normalvariate(self.mean, self.stdev)
+            if number>self.max or number<self.min and max!=0:  #if the number is out of bounds repeat the process                                                                      #if max=0 this means that we did not have time "time" bounds             
+                continue
+            else:           #if the number is in the limits stop the process
+                return number
+
+    def sampleGamma(self, G):
+        return G.Rnd.gammavariate(self.alpha, self.beta)
 
+    def sampleLogistic(self, G):
+        # XXX from http://stackoverflow.com/questions/3955877/generating-samples-from-the-logistic-distribution
+        # to check
+        while 1:
+            x = G.Rnd.random()
+            number=self.location + self.scale * math.log(x / (1-x))
+            if number>0:
+                return number
+
+    def sampleGeometric(self, G):
+        return G.numpyRnd.random.geometric(self.probability)
+
+    def sampleLognormal(self, G):
+        # XXX from the files lognormvariate(mu, sigma)
+        # it would be better to use same mean,stdev
+        return G.Rnd.lognormvariate(self.logmean, self.logsd)
+
+    def sampleWeibull(self, G):
+        return G.Rnd.weibullvariate(self.scale, self.shape)
+
+    def sampleCauchy(self, G):
+        # XXX from http://www.johndcook.com/python_cauchy_rng.html
+        while 1:
+            p = 0.0
+            while p == 0.0:
+                p = G.Rnd.random()
+            number=self.location + self.scale*math.tan(math.pi*(p - 0.5))
+            if number>0:
+                return number
+
+    def sampleTriangular(self, G):
+        return G.numpyRnd.random.triangular(left=self.min, right=self.max, mode=self.mean)
+
+    scalarSamplers={"Exp": sampleExp,
+                    "Normal": sampleNormal,
+                    "Gamma": sampleGamma,
+                    "Erlang": sampleGamma,
+                    "Logistic": sampleLogistic,
+                    "Geometric": sampleGeometric,
+                    "Lognormal": sampleLognormal,
+                    "Weibull": sampleWeibull,
+                    "Cauchy": sampleCauchy,
+                    "Triangular": sampleTriangular}
+
+# ===========================================================================
+# draws the numbers of a distribution from numpy in blocks. The block grows
+# from a few numbers up to blockSize, so that generators used only a few
+# times do not draw large blocks. The truncated distributions (Normal,
+# Logistic, Cauchy) reject the numbers out of bounds a block at a time.
+# The block is dropped at the start of a new replication
+# ===========================================================================
+class VectorisedSampler(object):
+    initialBlockSize=16
+
+    def __init__(self, rng, blockSize=1024):
+        self.rng=rng
+        self.blockSize=max(int(blockSize), 1)
+        self.nextBlockSize=min(self.initialBlockSize, self.blockSize)
+        self.block=[]
+        self.position=0
+        self.environment=None           # the environment of the replication the block was drawn in
+
+    def __call__(self):
+        from Globals import G
+        if self.environment is not G.env:
+            # a new replication, the numbers are drawn again from its stream
+            self.environment=G.env
+            self.block=[]
+            self.position=0
+            self.nextBlockSize=min(self.initialBlockSize, self.blockSize)
+        if self.position>=len(self.block):
+            self.block=self.drawBlock(self.getStream(), self.nextBlockSize)
+            self.position=0
+            self.nextBlockSize=min(2*self.nextBlockSize, self.blockSize)
+        number=self.block[self.position]
+        self.position+=1
+        return number
+
+    # =======================================================================
+    # returns the numpy RandomState the numbers are drawn from
+    # =======================================================================
+    def getStream(self):
+        from Globals import G
+        return G.numpyRnd.random
+
+    # =======================================================================
+    # returns a list of at least one number drawn from the distribution
+    # =======================================================================
+    def drawBlock(self, stream, size):
+        rng=self.rng
+        distributionType=rng.distributionType
+        while 1:
+            if distributionType=="Exp":
+                block=stream.exponential(rng.mean, size)
+            elif distributionType=="Normal":
+                block=stream.normal(rng.mean, rng.stdev, size)
+                block=block[(block>=rng.min)&(block<=rng.max)]
+            elif distributionType in ("Gamma", "Erlang"):
+                block=stream.gamma(rng.alpha, rng.beta, size)
+            elif distributionType=="Logistic":
+                block=stream.logistic(rng.location, rng.scale, size)
+                block=block[block>0]
+            elif distributionType=="Geometric":
+                block=stream.geometric(rng.probability, size)
+            elif distributionType=="Lognormal":
+                block=stream.lognormal(rng.logmean, rng.logsd, size)
+            elif distributionType=="Weibull":
+                block=rng.scale*stream.weibull(rng.shape, size)
+            elif distributionType=="Cauchy":
+                block=rng.location+rng.scale*stream.standard_cauchy(size)
+                block=block[block>0]
+            elif distributionType=="Triangular":
+                block=stream.triangular(rng.min, rng.mean, rng.max, size)
+            if len(block):
+                return block.tolist()
+
+# ===========================================================================
+# draws the numbers from the substream of the generator (see RandomStreams),
+# one at a time or in blocks if blockSize is more than 1
+# ===========================================================================
+class SubstreamSampler(VectorisedSampler):
+    def getStream(self):
+        from Globals import G
+        return G.randomStreams.getStream(self.rng.getStreamKey())
+
+# ===========================================================================
+# the independent random streams of a replication. The stream of a key is
+# seeded from the seed of the model, the replication and the key, so that an
+# object draws the same numbers in every scenario run with the same seed
+# (common random numbers), whatever the other objects draw
+# ===========================================================================
+class RandomStreams(object):
+    def __init__(self, seed=None, replication=0):
+        if not seed:
+            # without a seed the streams are still independent, but not reproducible
+            seed=os.urandom(16).encode('hex')
+        self.seed=seed
+        self.replication=replication
+        self.streams={}
+
+    def getStream(self, key):
+        stream=self.streams.get(key)
+        if stream is None:
+            stream=numpy.random.RandomState(getReplicationSeed(self.seed, self.replication, key))
+            self.streams[key]=stream
+        return stream
+
+# ===========================================================================
+# returns the numpy seed of the replication of a model run with the given
+# seed, different in every replication (and for every key)
+# ===========================================================================
+def getReplicationSeed(seed, replication, key=None):
+    digest=hashlib.sha1(repr((str(seed), replication, key))).digest()
+    return numpy.frombuffer(digest[:16], dtype=numpy.uint32)
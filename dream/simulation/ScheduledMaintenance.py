@@ -109,7 +109,7 @@ class ScheduledMaintenance(ObjectInterruption):
                     self.interruptVictim()
             self.victim.Up=False
             self.victim.timeLastFailure=self.env.now
-            self.outputTrace(self.victim.name,"is down")
+            self.outputTrace(self.victim.name,"is down", kind='failure')
         except AttributeError:
             print "AttributeError1"
             
@@ -120,7 +120,7 @@ class ScheduledMaintenance(ObjectInterruption):
             if(len(self.getVictimQueue())>0):
                 self.reactivateVictim()                 # since the maintenance is over, the victim is reactivated
             self.victim.Up=True              
-            self.outputTrace(self.victim.name,"is up")                                           
+            self.outputTrace(self.victim.name,"is up", kind='repair')                                           
         except AttributeError:
             print "AttributeError2"    
         
@@ -0,0 +1,239 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+the scheduling rules used by the Queues and the Operators to sort their entities.
+Every rule gives a key per entity. The keys that only depend on the remaining route
+of the entity are computed once per step of the route and kept in the entity.
+Multiple criteria (MC) are sorted in one pass with a composite key.
+New rules are added with registerSchedulingRule
+'''
+
+# ===========================================================================
+# the base scheduling rule
+# ===========================================================================
+class SchedulingRule(object):
+    reverse=False           # if True the entities with the biggest key come first.
+                            # The keys of such rules must be numbers
+    routeDependent=False    # if True the key only depends on the remaining route of the entity
+    appliesTo=('Queue', 'Operator')     # the kinds of objects that support the rule
+
+    def __init__(self, name):
+        self.name=name
+
+    # =======================================================================
+    # returns the key of the entity, owner is the Queue or Operator sorting
+    # =======================================================================
+    def key(self, entity, owner):
+        raise NotImplementedError("Subclass must define 'key' method")
+
+    # =======================================================================
+    # returns the key of the entity, read from the entity if the rule is
+    # route dependent and the key was already computed for its current step
+    # =======================================================================
+    def cachedKey(self, entity, owner):
+        if not self.routeDependent:
+            return self.key(entity, owner)
+        route=entity.remainingRoute
+        # the remaining route is consumed from its start as the entity moves
+        signature=(id(route), len(route), route and id(route[0]))
+        cache=entity.schedulingKeyCache
+        if cache is None:
+            cache=entity.schedulingKeyCache={}
+        cached=cache.get(self.name)
+        if cached and cached[0]==signature:
+            return cached[1]
+        value=self.key(entity, owner)
+        cache[self.name]=(signature, value)
+        return value
+
+    # =======================================================================
+    # returns the key of the entity for an ascending sort
+    # =======================================================================
+    def sortKey(self, entity, owner):
+        if self.reverse:
+            return -self.cachedKey(entity, owner)
+        return self.cachedKey(entity, owner)
+
+# ===========================================================================
+# first in first out, the entities are left in the order they arrived
+# ===========================================================================
+class FIFORule(SchedulingRule):
+    def key(self, entity, owner):
+        return 0
+
+# ===========================================================================
+# rules sorting according to an attribute of the entity
+# ===========================================================================
+class AttributeRule(SchedulingRule):
+    def __init__(self, name, attribute):
+        SchedulingRule.__init__(self, name)
+        self.attribute=attribute
+
+    def key(self, entity, owner):
+        return getattr(entity, self.attribute)
+
+# ===========================================================================
+# the time the station of the entity is waiting (used by the Operators)
+# ===========================================================================
+class WaitingTimeRule(SchedulingRule):
+    reverse=True
+    appliesTo=('Operator',)
+
+    def key(self, entity, owner):
+        if entity.schedule:
+            return owner.env.now-entity.schedule[-1][1]
+        return 0
+
+# ===========================================================================
+# the number of stations the entity has still to visit
+# ===========================================================================
+class NumStagesRule(SchedulingRule):
+    reverse=True
+    routeDependent=True
+
+    def key(self, entity, owner):
+        return len(entity.remainingRoute)
+
+# ===========================================================================
+# returns the fixed processing time of a step of a route
+# ===========================================================================
+def getStepProcessingTime(step):
+    processingTime=step.get('processingTime',None)
+    if processingTime:
+        return float(processingTime.get('Fixed',{}).get('mean',0))
+    return 0
+
+# ===========================================================================
+# the remaining processing time of the entity in the system
+# ===========================================================================
+class RemainingProcessingTimeRule(SchedulingRule):
+    reverse=True
+    routeDependent=True
+
+    def key(self, entity, owner):
+        # read from the compiled route of the Job if its remaining route is the end of the route
+        compiledRoute=getattr(entity, 'compiledRoute', None)
+        if compiledRoute is not None:
+            RPT=compiledRoute.getRemainingProcessingTime(entity.remainingRoute)
+            if RPT is not None:
+                return RPT
+        RPT=0
+        for step in entity.remainingRoute:
+            RPT+=getStepProcessingTime(step)
+        return RPT
+
+# ===========================================================================
+# the processing time in the next station, longest (LPT) or shortest (SPT) first
+# ===========================================================================
+class NextProcessingTimeRule(SchedulingRule):
+    routeDependent=True
+
+    def __init__(self, name, reverse=False):
+        SchedulingRule.__init__(self, name)
+        self.reverse=reverse
+
+    def key(self, entity, owner):
+        return getStepProcessingTime(entity.remainingRoute[0])
+
+# ===========================================================================
+# the minimum slackness, the due date minus the remaining processing time
+# ===========================================================================
+class MinimumSlacknessRule(SchedulingRule):
+    def key(self, entity, owner):
+        return entity.dueDate-schedulingRules['RPC'].cachedKey(entity, owner)
+
+# ===========================================================================
+# the number of entities in the queue of the next station of the entity
+# ===========================================================================
+class WorkInNextQueueRule(SchedulingRule):
+    def key(self, entity, owner):
+        from Globals import G
+        nextStep=entity.remainingRoute[1]
+        nextObjects=None
+        compiledRoute=getattr(entity, 'compiledRoute', None)
+        if compiledRoute is not None:
+            nextObjects=compiledRoute.getStations(nextStep)
+        if nextObjects is None:
+            nextObjects=[]
+            for id in nextStep.get('stationIdsList',[]):
+                obj=G.registry.find(id, 'CoreObject')
+                if obj is not None:
+                    nextObjects.append(obj)
+        else:
+            nextObjects=list(nextObjects)
+        # if more than one station is possible the last one of G.ObjList is taken
+        if len(nextObjects)>1:
+            nextObjects.sort(key=G.ObjList.index)
+        nextObject=nextObjects[-1]
+        return len(nextObject.getActiveObjectQueue())
+
+# ===========================================================================
+# the registry of the scheduling rules, in the order they are offered
+# ===========================================================================
+schedulingRules={}
+schedulingRuleNames=[]
+
+def registerSchedulingRule(rule):
+    if rule.name not in schedulingRules:
+        schedulingRuleNames.append(rule.name)
+    schedulingRules[rule.name]=rule
+
+def getSchedulingRule(name):
+    rule=schedulingRules.get(name)
+    if rule is None:
+        raise ValueError("Unknown scheduling criterion %r" % (name, ))
+    return rule
+
+# ===========================================================================
+# returns the names of the rules supported by the given kind of object
+# ===========================================================================
+def getSupportedSchedulingRules(kind):
+    return tuple([name for name in schedulingRuleNames
+                  if kind in schedulingRules[name].appliesTo])
+
+registerSchedulingRule(FIFORule('FIFO'))
+registerSchedulingRule(AttributeRule('Priority', 'priority'))
+registerSchedulingRule(WaitingTimeRule('WT'))
+registerSchedulingRule(AttributeRule('EDD', 'dueDate'))
+registerSchedulingRule(AttributeRule('EOD', 'orderDate'))
+registerSchedulingRule(NumStagesRule('NumStages'))
+registerSchedulingRule(RemainingProcessingTimeRule('RPC'))
+registerSchedulingRule(NextProcessingTimeRule('LPT', reverse=True))
+registerSchedulingRule(NextProcessingTimeRule('SPT'))
+registerSchedulingRule(MinimumSlacknessRule('MS'))
+registerSchedulingRule(WorkInNextQueueRule('WINQ'))
+
+# ===========================================================================
+# sorts the entityList according to the criteria, the first criterion being
+# the most important. The sort is stable, FIFO criteria leave the order as is
+# ===========================================================================
+def sortByRules(entityList, criterionList, owner):
+    rules=[getSchedulingRule(criterion) for criterion in criterionList]
+    rules=[rule for rule in rules if not isinstance(rule, FIFORule)]
+    if not rules or len(entityList)<2:
+        return
+    if len(rules)==1:
+        rule=rules[0]
+        entityList.sort(key=lambda entity: rule.sortKey(entity, owner))
+    else:
+        entityList.sort(key=lambda entity: tuple([rule.sortKey(entity, owner) for rule in rules]))
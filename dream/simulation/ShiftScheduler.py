@@ -82,7 +82,7 @@ class ShiftScheduler(ObjectInterruption):
 
             self.victim.timeLastShiftEnded=self.env.now
             self.victim.endShiftTimes.append(self.env.now)
-            self.outputTrace(self.victim.name,"is off shift")
+            self.outputTrace(self.victim.name,"is off shift", kind='offShift')
 
         while 1:
             if not self.victim.onShift:
@@ -93,7 +93,7 @@ class ShiftScheduler(ObjectInterruption):
                 self.victim.totalOffShiftTime+=self.env.now-self.victim.timeLastShiftEnded
                 self.victim.timeLastShiftStarted=self.env.now
                 self.victim.startShiftTimes.append(self.env.now)
-                self.outputTrace(self.victim.name,"is on shift")
+                self.outputTrace(self.victim.name,"is on shift", kind='onShift')
                 startShift=self.env.now
                 if issubclass(self.victim.__class__, CoreObject): 
                     self.reactivateVictim()                 # re-activate the victim in case it was interrupted
@@ -160,7 +160,7 @@ class ShiftScheduler(ObjectInterruption):
                 self.victim.onShift=False                        # get the victim off-shift
                 self.victim.timeLastShiftEnded=self.env.now
                 self.victim.endShiftTimes.append(self.env.now)
-                self.outputTrace(self.victim.name,"is off shift")
+                self.outputTrace(self.victim.name,"is off shift", kind='offShift')
                 
                 self.remainingShiftPattern.pop(0)
             # if there is no more shift data break the loop
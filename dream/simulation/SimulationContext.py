@@ -0,0 +1,272 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+the state of one simulation run. All the mutable globals that the ManPy objects read and write 
+through Globals.G live in a SimulationContext. G forwards its attributes to the context that 
+is active in the current thread, so that several simulations can run in one process 
+(one after another or in different threads) without sharing their state.
+Every ManPyObject keeps the context it was created in as its attribute context: the code 
+that runs for every event (the moves of the entities) reads the state from self.context, 
+going through G costs a call of ContextProxy.__getattr__ and a thread local lookup.
+The DemandPlanning application does not use this module: its G 
+(applications/DemandPlanning/Globals.py) is a plain class, shared by the whole process 
+(see STATEFUL_MODULES in dream/platform/workerpool.py)
+'''
+
+import threading
+import weakref
+from random import Random
+import xlwt
+import numpy
+import simpy
+from TraceSink import MemoryTraceSink
+from Tracing import Tracer
+
+# ===========================================================================
+# registry of the ManPy objects keyed by id. Every ManPyObject registers in
+# the sub-index of its registryCategory on construction. The sub-indexes are
+# searched in the order that findObjectById used to search the global lists
+# ===========================================================================
+class ObjectRegistry(object):
+    categories=('CoreObject', 'ObjectResource', 'Entity', 'ObjectInterruption', 'Order')
+    
+    def __init__(self):
+        self.index={}
+        for category in self.categories:
+            self.clear(category)
+    
+    # =======================================================================
+    # empties the sub-index of a category (of all categories if None is given)
+    # =======================================================================
+    def clear(self, category=None):
+        if category is None:
+            for category in self.categories:
+                self.clear(category)
+            return
+        # entities are created throughout the simulation, a weak reference lets
+        # the ones that are not held anywhere else (e.g. disposed Parts) be collected
+        if category=='Entity':
+            self.index[category]=weakref.WeakValueDictionary()
+        else:
+            self.index[category]={}
+    
+    # =======================================================================
+    # adds an object to the sub-index of its category. If an object with the same id
+    # is already registered the first one is kept, as the linear search did
+    # =======================================================================
+    def register(self, obj, category=None):
+        category=category or getattr(obj, 'registryCategory', None)
+        if category not in self.index:
+            return
+        subIndex=self.index[category]
+        if subIndex.get(obj.id, None) is None:
+            subIndex[obj.id]=obj
+    
+    # =======================================================================
+    # removes an object from the registry
+    # =======================================================================
+    def unregister(self, obj):
+        for subIndex in self.index.values():
+            if subIndex.get(obj.id, None) is obj:
+                del subIndex[obj.id]
+    
+    # =======================================================================
+    # returns the object with the given id. If category is given only its sub-index is searched
+    # =======================================================================
+    def find(self, id, category=None):
+        if category:
+            return self.index[category].get(id, None)
+        for category in self.categories:
+            obj=self.index[category].get(id, None)
+            if obj is not None:
+                return obj
+        return None
+
+# ===========================================================================
+# numpy random numbers of a context. Exposes a RandomState as the attribute 
+# random, so that it is used as the numpy module (numpyRnd.random.triangular)
+# ===========================================================================
+class NumpyRandom(object):
+    def __init__(self):
+        self.random=numpy.random.RandomState()
+
+# ===========================================================================
+# the context of a simulation run
+# ===========================================================================
+class SimulationContext(object):
+    
+    def __init__(self):
+        self.seed=1450                       #the seed of the random number generator
+        self.Rnd=Random(self.seed)              #random number generator
+        self.numpyRnd=NumpyRandom()         #numpy random number generator, used as numpy (numpyRnd.random)
+        self.vectorisedRandomNumbers=False  #if True the random numbers are drawn from numpy in blocks
+        self.randomNumberBlockSize=1024     #the maximum size of these blocks
+        self.commonRandomNumbers=False      #if True every object draws from its own random streams
+        self.randomStreams=None             #the random streams of the replication (see RandomNumberGenerator.RandomStreams)
+        self.samplers={}                    #the block samplers of the generators, by stream key and distribution
+
+        self.ObjList=[]                      #a list that holds all the CoreObjects
+        self.EntityList=[]                   #a list that holds all the Entities
+        self.ObjectResourceList=[]
+        self.ObjectInterruptionList=[]
+        self.registry=ObjectRegistry()       # id -> object index of all the ManPy objects
+
+        self.numberOfReplications=1          #the number of replications default=1git
+        self.numberOfProcesses=1             #the number of processes the replications run on default=1
+        self.confidenceLevel=0.9             #the confidence level default=90%
+        self.Base=1                          #the Base time unit. Default =1 minute
+        self.maxSimTime=0                    #the total simulation time
+        self.stopConditions=[]               #the conditions that stop a replication before maxSimTime (see StopCondition)
+        self.stopCheckInterval=1             #the time between two checks of these conditions
+        self.stopMonitor=None                #the StopMonitor of the running replication (None if there are no conditions)
+        self.timeLastEntityExited=0          #the last time an entity left an exit in the running replication
+
+        # flag for printing in console
+        self.console=""
+        self.tracer=Tracer()                 #the tracer of the console messages, disabled by default (see Tracing)
+
+        # data for the trace output
+        self.trace=""                        #this is written from input. If it is "Yes" then you write to trace, else we do not
+        self.traceSink=MemoryTraceSink()     #the sink the trace is written to (see TraceSink)
+        self.traceFormat='csv.gz'            #the format of the trace files of LineGenerationJSON
+        self.traceDirectory=None             #the directory these files are kept in (None for temporary files)
+
+
+        # variables for excel output
+        self.outputIndex=0                   #index that shows in what row we are
+        self.sheetIndex=1                    #index that shows in what sheet we are
+        self.outputFile=xlwt.Workbook()    #create excel file
+        self.outputSheet=self.outputFile.add_sheet('sheet '+str(self.sheetIndex), cell_overwrite_ok=True)  #create excel sheet
+
+        #variables for json output
+        self.outputJSON={}
+        self.outputJSONFile=None
+
+        self.numberOfEntities=0
+
+        #object that routes the operators in the model
+        self.Router=None
+
+        # index of the edges of the model graph (see TopologyIndex)
+        self.topologyIndex=None
+
+        #                define the lists of each object type
+        self.SourceList=[]
+        self.MachineList=[]
+        self.ExitList=[]
+        self.QueueList=[]
+        self.RepairmanList=[]
+        self.AssemblyList=[]
+        self.DismantleList=[]
+        self.ConveyerList=[]
+        self.MachineJobShopList=[]
+        self.QueueJobShopList=[]
+        self.ExitJobShopList=[]
+        self.BatchDecompositionList=[]
+        self.BatchSourceList=[]
+        self.BatchReassemblyList=[]
+        self.LineClearanceList=[]
+        self.EventGeneratorList=[]
+        self.OperatorsList=[]
+        self.OperatorManagedJobsList=[]
+        self.OperatorPoolsList=[]
+        self.BrokersList=[]
+        self.OperatedMachineList=[]
+        self.BatchScrapMachineList=[]
+        self.OrderDecompositionList=[]
+        self.ConditionalBufferList=[]
+        self.MouldAssemblyBufferList=[]
+        self.MouldAssemblyList=[]
+        self.MachineManagedJobList=[]
+        self.QueueManagedJobList=[]
+        self.ModelResourceList=[]
+
+        self.JobList=[]
+        self.WipList=[]
+        self.EntityList=[]
+        self.PartList=[]
+        self.OrderComponentList=[]
+        self.OrderList=[]
+        self.MouldList=[]
+        self.BatchList=[]
+        self.SubBatchList=[]
+        # entities that just finished processing in a station 
+        # and have to enter the next machine 
+        self.pendingEntities=[]
+        self.env=simpy.Environment()
+
+    # =======================================================================
+    # makes the context the active one of the current thread
+    # =======================================================================
+    def activate(self):
+        _local.stack.append(_local.context)
+        _local.context=self
+        return self
+    
+    # =======================================================================
+    # restores the context that was active before the call to activate
+    # =======================================================================
+    def deactivate(self):
+        assert _local.context is self, 'the context is not the active one'
+        _local.context=_local.stack.pop()
+    
+    def __enter__(self):
+        return self.activate()
+    
+    def __exit__(self, *exc_info):
+        self.deactivate()
+        return False
+
+# the context used by threads where no context is activated
+defaultContext=SimulationContext()
+
+# ===========================================================================
+# the active context of each thread (defaultContext if none is activated) 
+# and the contexts that were active before it
+# ===========================================================================
+class ThreadContext(threading.local):
+    context=defaultContext
+    
+    def __init__(self):
+        self.stack=[]
+
+_local=ThreadContext()
+
+# ===========================================================================
+# returns the context that is active in the current thread
+# ===========================================================================
+def getCurrentContext():
+    return _local.context
+
+# ===========================================================================
+# metaclass of Globals.G, forwards the attributes of G to the active context
+# ===========================================================================
+class ContextProxy(type):
+    def __getattr__(cls, name):
+        return getattr(_local.context, name)
+    
+    def __setattr__(cls, name, value):
+        setattr(_local.context, name, value)
+    
+    def __delattr__(cls, name):
+        delattr(_local.context, name)
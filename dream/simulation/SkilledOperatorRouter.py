@@ -27,8 +27,8 @@ Models an Interruption that schedules the operation of the machines by different
 '''
 import simpy
 
-from OperatorRouter import Router
-from opAss_LPmethod import opAss_LP
+from OperatorRouter import Router, EndOfTimestep
+from OperatorAssignment import OperatorAssignment
 
 # ===========================================================================
 #               Class that handles the Operator Behavior
@@ -48,6 +48,8 @@ class SkilledRouter(Router):
         self.allocation=False
         # Flag used to notify the need to wait for endedLastProcessing signal
         waitEndProcess=False
+        # the engine solving the assignment of the operators (its solutions are cached across the replications)
+        self.operatorAssignment=OperatorAssignment()
         
     #===========================================================================
     #                         the initialize method
@@ -80,13 +82,8 @@ class SkilledRouter(Router):
             self.printTrace('','=-'*15)
             self.printTrace('','router received event')
             # wait till there are no more events, the machines must be blocked
-            while 1:
-                if self.env.now==self.env.peek():
-                    self.printTrace('', 'there are MORE events for now')
-                    yield self.env.timeout(0)
-                else:
-                    self.printTrace('','there are NO more events for now')
-                    break
+            yield EndOfTimestep(self.env)
+            self.printTrace('','there are NO more events for now')
             self.printTrace('','=-'*15)
             
             from Globals import G
@@ -194,7 +191,7 @@ class SkilledRouter(Router):
                 # TODO: a constant integer must be added to all WIP before provided to the opAss_LP
                 #     as it doesn't support zero WIP levels
                 #===================================================================
-                solution=opAss_LP(self.availableStationsDict, self.availableOperatorList, 
+                solution=self.operatorAssignment.solve(self.availableStationsDict, self.availableOperatorList, 
                                   self.operators, previousAssignment=self.previousSolution)
 #                 print '-------'
 #                 print self.env.now, solution
@@ -294,7 +291,8 @@ class SkilledRouter(Router):
         if station.broker.waitForOperator:
             if station.broker.expectedSignals['resourceAvailable']:
                 self.sendSignal(receiver=station.broker, signal=station.broker.resourceAvailable)
-                self.printTrace('router', 'signalling broker of'+' '*50+station.id)
+                if self.isTraced():
+                    self.printTrace('router', 'signalling broker of'+' '*50+station.id)
                 self.toBeSignalled.remove(station)
         # signal the queue proceeding the station
         else:         
@@ -302,7 +300,8 @@ class SkilledRouter(Router):
                     and any(type=='Load' for type in station.multOperationTypeList):
                 if station.expectedSignals['loadOperatorAvailable']:
                     self.sendSignal(receiver=station, signal=station.loadOperatorAvailable)
-                    self.printTrace('router', 'signalling'+' '*50+station.id)
+                    if self.isTraced():
+                        self.printTrace('router', 'signalling'+' '*50+station.id)
                     self.toBeSignalled.remove(station)      
                     
     # =======================================================================
@@ -50,6 +50,7 @@ class EntityGenerator(object):
     # the generator of the EntitiesGenerator
     #===========================================================================
     def run(self): 
+        context=self.victim.context
         while 1:
             # if the Source is empty create the Entity
             if len(self.victim.getActiveObjectQueue())==0:
@@ -57,11 +58,11 @@ class EntityGenerator(object):
                 entity.creationTime=self.env.now                               # assign the current simulation time as the Entity's creation time 
                 entity.startTime=self.env.now                                  # assign the current simulation time as the Entity's start time 
                 entity.currentStation=self.victim                            # update the current station of the Entity
-                G.EntityList.append(entity)
-                self.victim.outputTrace(entity.name, "generated")       # output the trace
+                context.EntityList.append(entity)
+                self.victim.outputTrace(entity.name, "generated", kind='create')       # output the trace
                 self.victim.getActiveObjectQueue().append(entity)            # append the entity to the resource 
                 self.victim.numberOfArrivals+=1                              # we have one new arrival
-                G.numberOfEntities+=1
+                context.numberOfEntities+=1
                 self.victim.appendEntity(entity)
                 if self.victim.expectedSignals['entityCreated']:
                     succeedTupple=(entity,self.env.now)
@@ -69,9 +70,9 @@ class EntityGenerator(object):
                     self.victim.expectedSignals['entityCreated']=0
             # else put it on the time list for scheduled Entities
             else:
-                entityCounter=G.numberOfEntities+len(self.victim.scheduledEntities) # this is used just ot output the trace correctly
+                entityCounter=context.numberOfEntities+len(self.victim.scheduledEntities) # this is used just ot output the trace correctly
                 self.victim.scheduledEntities.append(self.env.now)
-                self.victim.outputTrace(self.victim.item.type+str(entityCounter), "generated")       # output the trace
+                self.victim.outputTrace(self.victim.item.type+str(entityCounter), "generated", kind='create')       # output the trace
             yield self.env.timeout(self.victim.calculateInterArrivalTime()) # wait until the next arrival
 
 #============================================================================
@@ -95,7 +96,7 @@ class Source(CoreObject):
         self.numberOfArrivals = 0                       # the number of entities that were created
 
         self.type="Source"                              #String that shows the type of object
-        self.rng = RandomNumberGenerator(self, interArrivalTime)
+        self.rng = RandomNumberGenerator(self, interArrivalTime, purpose='interArrival')
 
         self.item=Globals.getClassFromName(entity)      #the type of object that the Source will generate
                
@@ -164,12 +165,11 @@ class Source(CoreObject):
     # add newly created entity to pendingEntities
     #===========================================================================
     def appendEntity(self, entity):
-        from Globals import G
         assert entity, 'cannot append None entity'
         activeEntity=entity
-        if G.Router:
+        if self.context.Router:
             # at the newly created entity to the pendingEntities
-            G.pendingEntities.append(activeEntity)
+            self.context.pendingEntities.append(activeEntity)
 
     #============================================================================
     #            sets the routing out element for the Source
@@ -181,7 +181,7 @@ class Source(CoreObject):
     #============================================================================
     def createEntity(self):
         self.printTrace(self.id, create='')
-        return self.item(id = self.item.type+str(G.numberOfEntities), name = self.item.type+str(self.numberOfArrivals)) #return the newly created Entity
+        return self.item(id = self.item.type+str(self.context.numberOfEntities), name = self.item.type+str(self.numberOfArrivals)) #return the newly created Entity
     #============================================================================
     #                    calculates the processing time
     #============================================================================
@@ -198,10 +198,10 @@ class Source(CoreObject):
             newEntity.startTime=newEntity.creationTime                                # assign the current simulation time as the Entity's start time
             #print self.env.now, 'getting from the list. StartTime=',newEntity.startTime
             newEntity.currentStation=self                            # update the current station of the Entity
-            G.EntityList.append(newEntity)
+            self.context.EntityList.append(newEntity)
             self.getActiveObjectQueue().append(newEntity)            # append the entity to the resource 
             self.numberOfArrivals+=1                              # we have one new arrival
-            G.numberOfEntities+=1
+            self.context.numberOfEntities+=1
             self.appendEntity(newEntity)  
         activeEntity=CoreObject.removeEntity(self, entity)          # run the default method  
         if len(self.getActiveObjectQueue())==1:
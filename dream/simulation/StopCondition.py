@@ -0,0 +1,321 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+conditions that stop a replication before maxSimTime. The StopMonitor runs the replication
+until maxSimTime (or until no events are left if maxSimTime is -1) or until one of its
+conditions is met. The conditions are told about every entity that leaves the model
+(entityExited) and are checked every checkInterval time units (check), so that a
+condition costs nothing between these calls
+'''
+
+import time
+from math import sqrt
+
+from simpy.core import StopSimulation
+from simpy.events import Event, URGENT
+
+# the two-sided critical values of the t distribution, for the degrees of freedom of T_DEGREES
+T_DEGREES=range(1, 31)+[40, 60, 120]
+T_CRITICAL_VALUES={
+    0.90: [6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+           1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+           1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697,
+           1.684, 1.671, 1.658, 1.645],
+    0.95: [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+           2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+           2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+           2.021, 2.000, 1.980, 1.960],
+    0.99: [63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+           3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+           2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750,
+           2.704, 2.660, 2.617, 2.576]}
+
+# ===========================================================================
+# returns the critical value of the t distribution for the confidence level. Between
+# the tabulated degrees of freedom the value of the lower one is used (it is larger)
+# ===========================================================================
+def getTCriticalValue(confidenceLevel, degreesOfFreedom):
+    values=T_CRITICAL_VALUES.get(round(confidenceLevel, 2))
+    if values is None:
+        raise ValueError("Unsupported confidence level %r, supported levels are %s"
+                         % (confidenceLevel, sorted(T_CRITICAL_VALUES)))
+    if degreesOfFreedom>T_DEGREES[-1]:
+        return values[-1]
+    index=0
+    for (i, degrees) in enumerate(T_DEGREES):
+        if degrees<=degreesOfFreedom:
+            index=i
+    return values[index]
+
+# ===========================================================================
+# the base stop condition
+# ===========================================================================
+class StopCondition(object):
+    def __init__(self, exitIds=None):
+        self.exitIds=None               # the ids of the exits the condition counts (None for all)
+        if exitIds:
+            self.exitIds=frozenset(exitIds)
+
+    # =======================================================================
+    # prepares the condition for a new replication
+    # =======================================================================
+    def initialize(self, env):
+        self.env=env
+
+    # =======================================================================
+    # returns True if the entity that left the exit meets the condition
+    # =======================================================================
+    def entityExited(self, exit, entity):
+        return False
+
+    # =======================================================================
+    # returns True if the condition is met, called every checkInterval
+    # =======================================================================
+    def check(self):
+        return False
+
+    # =======================================================================
+    # returns True if the condition counts the entities of the exit
+    # =======================================================================
+    def countsExit(self, exit):
+        return self.exitIds is None or exit.id in self.exitIds
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__,
+                ', '.join(['%s=%r' % (key, value) for (key, value) in sorted(self.__dict__.items())
+                           if key!='env' and not key.startswith('_')]))
+
+    # =======================================================================
+    # creates a stop condition from its json definition,
+    # e.g. {"type": "EntityCount", "target": 1000}
+    # =======================================================================
+    @staticmethod
+    def fromDict(data):
+        data=dict(data)
+        conditionType=data.pop('type', None)
+        conditionClass={'EntityCount': EntityCount,
+                        'ConfidenceInterval': ConfidenceInterval,
+                        'WallClock': WallClock}.get(conditionType)
+        if conditionClass is None:
+            raise ValueError("Unknown stop condition %r" % (conditionType, ))
+        return conditionClass(**dict((str(key), value) for (key, value) in data.items()))
+
+# ===========================================================================
+# stops when target entities (or units if units is True) have left the exits
+# ===========================================================================
+class EntityCount(StopCondition):
+    def __init__(self, target, exitIds=None, units=False):
+        StopCondition.__init__(self, exitIds)
+        self.target=target
+        self.units=units
+
+    def initialize(self, env):
+        StopCondition.initialize(self, env)
+        self._count=0
+
+    def entityExited(self, exit, entity):
+        if self.countsExit(exit):
+            if self.units:
+                self._count+=entity.numberOfUnits
+            else:
+                self._count+=1
+        return self._count>=self.target
+
+# ===========================================================================
+# stops when the half-width of the confidence interval of a kpi of the exits,
+# relative to its mean, is at most halfWidth. The kpi ('throughput' per time unit
+# or mean 'lifespan') is measured in batches of checkInterval (batch means),
+# the first warmUpBatches being discarded. The throughput is measured from
+# the first exit on, and a replication never stops while the mean is 0
+# ===========================================================================
+class ConfidenceInterval(StopCondition):
+    kpis=('throughput', 'lifespan')
+
+    def __init__(self, kpi='throughput', halfWidth=0.05, confidenceLevel=0.95,
+                 minBatches=10, warmUpBatches=0, exitIds=None):
+        StopCondition.__init__(self, exitIds)
+        if kpi not in self.kpis:
+            raise ValueError("Unknown kpi %r, supported kpis are %s" % (kpi, self.kpis))
+        getTCriticalValue(confidenceLevel, 1)       # check the confidence level
+        self.kpi=kpi
+        self.halfWidth=halfWidth
+        self.confidenceLevel=confidenceLevel
+        self.minBatches=max(minBatches, 2)
+        self.warmUpBatches=warmUpBatches
+
+    def initialize(self, env):
+        StopCondition.initialize(self, env)
+        self._batchStart=env.now
+        self._batchExits=0
+        self._batchLifespan=0
+        self._batchIndex=0
+        self._exited=False              # True once an entity left the exits
+        # the sums of the batch means
+        self._n=0
+        self._sum=0.0
+        self._sumOfSquares=0.0
+
+    def entityExited(self, exit, entity):
+        if self.countsExit(exit):
+            self._exited=True
+            self._batchExits+=1
+            self._batchLifespan+=self.env.now-entity.startTime
+        return False
+
+    def check(self):
+        now=self.env.now
+        if self.kpi=='throughput':
+            value=None
+            # the empty batches before the first exit are the start-up of the model
+            if self._exited and now>self._batchStart:
+                value=self._batchExits/float(now-self._batchStart)
+        else:
+            value=None
+            if self._batchExits:
+                value=self._batchLifespan/float(self._batchExits)
+        self._batchStart=now
+        self._batchExits=0
+        self._batchLifespan=0
+        if value is None:
+            return False
+        self._batchIndex+=1
+        if self._batchIndex<=self.warmUpBatches:
+            return False
+        self._n+=1
+        self._sum+=value
+        self._sumOfSquares+=value*value
+        halfWidth=self.getHalfWidth()
+        mean=self.getMean()
+        return halfWidth is not None and mean>0 and halfWidth<=self.halfWidth*mean
+
+    # =======================================================================
+    # returns the mean of the batches
+    # =======================================================================
+    def getMean(self):
+        if not self._n:
+            return None
+        return self._sum/self._n
+
+    # =======================================================================
+    # returns the half-width of the confidence interval of the mean,
+    # None before minBatches batches
+    # =======================================================================
+    def getHalfWidth(self):
+        n=self._n
+        if n<self.minBatches:
+            return None
+        variance=max((self._sumOfSquares-self._sum*self._sum/n)/(n-1), 0)
+        return getTCriticalValue(self.confidenceLevel, n-1)*sqrt(variance/n)
+
+# ===========================================================================
+# stops when the replication has run for seconds of wall-clock time
+# ===========================================================================
+class WallClock(StopCondition):
+    def __init__(self, seconds):
+        StopCondition.__init__(self)
+        self.seconds=seconds
+
+    def initialize(self, env):
+        StopCondition.initialize(self, env)
+        self._start=time.time()
+
+    def check(self):
+        return time.time()-self._start>=self.seconds
+
+# ===========================================================================
+# stops when predicate(env) returns True. If onExit is True the predicate is
+# called for every entity that leaves the model, otherwise every checkInterval
+# ===========================================================================
+class Predicate(StopCondition):
+    def __init__(self, predicate, onExit=False):
+        StopCondition.__init__(self)
+        self.predicate=predicate
+        self.onExit=onExit
+
+    def entityExited(self, exit, entity):
+        return self.onExit and self.predicate(self.env)
+
+    def check(self):
+        return not self.onExit and self.predicate(self.env)
+
+# ===========================================================================
+# runs a replication until one of the conditions is met
+# ===========================================================================
+class StopMonitor(object):
+    def __init__(self, conditions, checkInterval=1):
+        self.conditions=list(conditions)
+        self.checkInterval=checkInterval
+        self.stoppedBy=None             # the condition that stopped the replication (None if none did)
+
+    # =======================================================================
+    # runs the replication until the time until (inf for no events left),
+    # or until a condition is met
+    # =======================================================================
+    def run(self, env, until):
+        self.env=env
+        self.stoppedBy=None
+        self.stopEvent=env.event()
+        for condition in self.conditions:
+            condition.initialize(env)
+        # the end of the replication, before the other events at until as in env.run
+        end=Event(env)
+        end._ok=True
+        end._value=None
+        env.schedule(end, URGENT, until-env.now)
+        end.callbacks.append(StopSimulation.callback)
+        self.stopEvent.callbacks.append(StopSimulation.callback)
+        # the conditions that are only told about the entities need no checks
+        if [condition for condition in self.conditions if type(condition).check.__func__ is not StopCondition.check.__func__]:
+            env.process(self.checkConditions())
+        env.run()
+
+    # =======================================================================
+    # checks the conditions every checkInterval while there are events other
+    # than the end of the replication
+    # =======================================================================
+    def checkConditions(self):
+        while 1:
+            yield self.env.timeout(self.checkInterval)
+            for condition in self.conditions:
+                if condition.check():
+                    self.stop(condition)
+                    return
+            if self.env.peek()==float('inf'):
+                return
+
+    # =======================================================================
+    # called by the exits for every entity that leaves the model
+    # =======================================================================
+    def entityExited(self, exit, entity):
+        for condition in self.conditions:
+            if condition.entityExited(exit, entity):
+                self.stop(condition)
+                return
+
+    # =======================================================================
+    # stops the replication at the current time
+    # =======================================================================
+    def stop(self, condition):
+        if not self.stopEvent.triggered:
+            self.stoppedBy=condition
+            self.stopEvent.succeed(condition)
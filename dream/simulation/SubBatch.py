@@ -30,6 +30,7 @@ from Entity import Entity
 #The batch object
 class SubBatch(Entity):
     type="SubBatch"
+    __slots__=('parentBatch', 'unitsToProcess', 'batchId', 'receiver')
 
     def __init__(self, id, name, numberOfUnits=1, parentBatch=None, parentBatchName=None, parentBatchId=None,
                  remainingProcessingTime=0, currentStation=None, unitsToProcess=0,receiver=None,**kw):
@@ -0,0 +1,110 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+index of the graph of a model. The edges are read once and kept in adjacency maps
+keyed by source and by destination, so that successors and predecessors of a node
+are found without scanning all the edges of the model
+'''
+
+# ===========================================================================
+# the topology index
+# ===========================================================================
+class TopologyIndex(object):
+
+    def __init__(self, edges={}):
+        self.successors={}          # dict source id -> list of (destination, edge_class, edge_data)
+        self.predecessors={}        # dict destination id -> list of (source, edge_class, edge_data)
+        self.objectsById={}         # dict id -> object, filled by indexObjects
+        for edge in edges.values():
+            source=edge["source"]
+            destination=edge["destination"]
+            edge_class=edge["_class"]
+            edge_data=edge.get("data", {})
+            self.successors.setdefault(source, []).append((destination, edge_class, edge_data))
+            self.predecessors.setdefault(destination, []).append((source, edge_class, edge_data))
+
+    #===========================================================================
+    # filters the adjacency list of a node. edge_class and entity restrict the
+    # edges to the ones of the given class or carrying the given entity type,
+    # predicate (source, destination, edge_class, edge_data) can be used for any other check
+    #===========================================================================
+    @staticmethod
+    def filterAdjacent(node_id, adjacent, edge_class=None, entity=None, predicate=None, reverse=False):
+        result=[]
+        for (other, other_class, edge_data) in adjacent:
+            if edge_class is not None and other_class!=edge_class:
+                continue
+            if entity is not None and edge_data.get('entity',{})!=entity:
+                continue
+            if predicate:
+                if reverse:
+                    source, destination=other, node_id
+                else:
+                    source, destination=node_id, other
+                if not predicate(source, destination, other_class, edge_data):
+                    continue
+            result.append(other)
+        # XXX We should probably not need to sort, but there is a bug that
+        # prevents Topology10 to work if this sort is not used.
+        result.sort()
+        return result
+
+    #===========================================================================
+    # returns the sorted list of the ids of the successors of the node with ID = node_id
+    #===========================================================================
+    def getSuccessorList(self, node_id, edge_class=None, entity=None, predicate=None):
+        return self.filterAdjacent(node_id, self.successors.get(node_id, []),
+                                   edge_class=edge_class, entity=entity, predicate=predicate)
+
+    #===========================================================================
+    # returns the sorted list of the ids of the predecessors of the node with ID = node_id
+    #===========================================================================
+    def getPredecessorList(self, node_id, edge_class=None, entity=None, predicate=None):
+        return self.filterAdjacent(node_id, self.predecessors.get(node_id, []),
+                                   edge_class=edge_class, entity=entity, predicate=predicate, reverse=True)
+
+    #===========================================================================
+    # adds the given objects to the id->object dict. If an id is already
+    # indexed the first object is kept, as the linear searches used to do
+    #===========================================================================
+    def indexObjects(self, objectList=[]):
+        for obj in objectList:
+            self.objectsById.setdefault(obj.id, obj)
+
+    #===========================================================================
+    # returns the indexed object with the given id (None if not found)
+    #===========================================================================
+    def getObject(self, id):
+        return self.objectsById.get(id, None)
+
+    #===========================================================================
+    # returns the objects corresponding to a list of ids. Ids that do not
+    # correspond to an indexed object are skipped
+    #===========================================================================
+    def getObjects(self, idList=[]):
+        objects=[]
+        for id in idList:
+            obj=self.objectsById.get(id, None)
+            if obj is not None:
+                objects.append(obj)
+        return objects
@@ -0,0 +1,263 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+the sinks the trace of the simulation is written to. Every record of the trace has the
+fields of TRACE_FIELDS. The file sinks stream the records to a CSV or a JSON lines file
+(compressed with gzip if the format ends with .gz), so that the trace is not kept in memory.
+The route table of PrintRoute is written next to the trace as a json file.
+The export to Excel is a separate step (exportToExcel) that needs xlwt
+'''
+
+import csv
+import json
+import gzip
+
+# the fields of a record of the trace
+TRACE_FIELDS=('time', 'objectId', 'entityName', 'kind', 'message')
+# the formats of the file sinks
+TRACE_FORMATS=('csv', 'csv.gz', 'jsonl', 'jsonl.gz')
+
+# ===========================================================================
+# returns the value as a str, unicode is encoded as utf-8
+# ===========================================================================
+def encode(value):
+    if value is None:
+        return ''
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return str(value)
+
+# ===========================================================================
+# the table of the routes of the Jobs output by PrintRoute. The cells are
+# written as in an excel sheet, with write and write_merge
+# ===========================================================================
+class RouteTable(object):
+    def __init__(self, cells=None, merges=None):
+        self.cells=cells or {}          # dict (row, column) -> value
+        self.merges=merges or []        # list of (first row, last row, first column, last column, value)
+
+    def write(self, row, column, value):
+        self.cells[(row, column)]=value
+
+    def write_merge(self, firstRow, lastRow, firstColumn, lastColumn, value):
+        self.merges.append((firstRow, lastRow, firstColumn, lastColumn, value))
+
+    def toDict(self):
+        return {'cells': [[row, column, value] for ((row, column), value) in sorted(self.cells.items())],
+                'merges': [list(merge) for merge in self.merges]}
+
+    @staticmethod
+    def fromDict(data):
+        cells={}
+        for (row, column, value) in data.get('cells', []):
+            cells[(row, column)]=value
+        return RouteTable(cells, [tuple(merge) for merge in data.get('merges', [])])
+
+# ===========================================================================
+# the base trace sink
+# ===========================================================================
+class TraceSink(object):
+    def __init__(self):
+        self.route=None             # the RouteTable of the run, if any
+
+    # =======================================================================
+    # writes a record of the trace
+    # =======================================================================
+    def write(self, time, objectId, entityName, kind, message):
+        raise NotImplementedError("Subclass must define 'write' method")
+
+    # =======================================================================
+    # writes the route table of the run
+    # =======================================================================
+    def writeRoute(self, route):
+        self.route=route
+
+    # =======================================================================
+    # returns the records written so far, as dicts
+    # =======================================================================
+    def readRecords(self):
+        raise NotImplementedError("Subclass must define 'readRecords' method")
+
+    def close(self):
+        pass
+
+# ===========================================================================
+# keeps the records in memory, used when no file is given (e.g. runSimulation)
+# ===========================================================================
+class MemoryTraceSink(TraceSink):
+    def __init__(self):
+        TraceSink.__init__(self)
+        self.records=[]
+
+    def write(self, time, objectId, entityName, kind, message):
+        self.records.append((time, objectId, entityName, kind, message))
+
+    def readRecords(self):
+        return [dict(zip(TRACE_FIELDS, record)) for record in self.records]
+
+# ===========================================================================
+# the lines written by a csv writer, kept until they are written to the file
+# ===========================================================================
+class LineBuffer(list):
+    write=list.append
+
+# ===========================================================================
+# streams the records to a file, bufferSize records at a time
+# ===========================================================================
+class FileTraceSink(TraceSink):
+    def __init__(self, path, format='csv.gz', bufferSize=1000):
+        TraceSink.__init__(self)
+        if format not in TRACE_FORMATS:
+            raise ValueError("Unknown trace format %r, supported formats are %s" % (format, TRACE_FORMATS))
+        self.path=path
+        self.format=format
+        self.routePath=getRoutePath(path, format)
+        self.bufferSize=bufferSize
+        self.buffer=LineBuffer()
+        self.csvWriter=None
+        if format.startswith('csv'):
+            self.csvWriter=csv.writer(self.buffer)
+            self.csvWriter.writerow(TRACE_FIELDS)
+        self.file=openTraceFile(path, format, 'wb')
+        self.closed=False
+
+    def write(self, time, objectId, entityName, kind, message):
+        if self.csvWriter:
+            self.csvWriter.writerow((repr(float(time)), encode(objectId), encode(entityName),
+                                     encode(kind), encode(message)))
+        else:
+            self.buffer.append(json.dumps(dict(zip(TRACE_FIELDS,
+                        (time, objectId, entityName, kind, message))))+'\n')
+        if len(self.buffer)>=self.bufferSize:
+            self.flush()
+
+    # =======================================================================
+    # writes the buffered lines to the file
+    # =======================================================================
+    def flush(self):
+        if self.buffer:
+            self.file.write(''.join(self.buffer))
+            del self.buffer[:]
+
+    def writeRoute(self, route):
+        TraceSink.writeRoute(self, route)
+        routeFile=openTraceFile(self.routePath, self.format, 'wb')
+        try:
+            json.dump(route.toDict(), routeFile)
+        finally:
+            routeFile.close()
+
+    # =======================================================================
+    # closes the sink and reads the records back from the file
+    # =======================================================================
+    def readRecords(self):
+        self.close()
+        return list(readTrace(self.path, self.format))
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+            self.file.close()
+            self.closed=True
+
+# ===========================================================================
+# opens a trace file (or route file) of the format, compressed if the format ends with .gz.
+# fileOrPath may also be an open file
+# ===========================================================================
+def openTraceFile(fileOrPath, format, mode='rb'):
+    if format.endswith('.gz'):
+        if isinstance(fileOrPath, basestring):
+            return gzip.open(fileOrPath, mode)
+        return gzip.GzipFile(fileobj=fileOrPath, mode=mode)
+    if isinstance(fileOrPath, basestring):
+        return open(fileOrPath, mode)
+    return fileOrPath
+
+# ===========================================================================
+# returns the path of the route file written next to the trace file
+# ===========================================================================
+def getRoutePath(path, format):
+    suffix='.'+format
+    if path.endswith(suffix):
+        path=path[:-len(suffix)]
+    routeFormat='json'
+    if format.endswith('.gz'):
+        routeFormat+='.gz'
+    return path+'.route.'+routeFormat
+
+# ===========================================================================
+# generates the records of a trace file as dicts
+# ===========================================================================
+def readTrace(fileOrPath, format='csv.gz'):
+    traceFile=openTraceFile(fileOrPath, format)
+    try:
+        if format.startswith('csv'):
+            reader=csv.reader(traceFile)
+            fields=next(reader)
+            for row in reader:
+                record=dict(zip(fields, [value.decode('utf-8') for value in row]))
+                record['time']=float(record['time'])
+                yield record
+        else:
+            for line in traceFile:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        traceFile.close()
+
+# ===========================================================================
+# reads the RouteTable from a route file
+# ===========================================================================
+def readRoute(fileOrPath, format='csv.gz'):
+    routeFile=openTraceFile(fileOrPath, format)
+    try:
+        return RouteTable.fromDict(json.load(routeFile))
+    finally:
+        routeFile.close()
+
+# ===========================================================================
+# returns an xlwt Workbook with the records (Simulation Time | Entity or Frame Name | message),
+# in sheets of 65536 rows (excel limitation), and the route table in a last sheet
+# ===========================================================================
+def exportToExcel(records, route=None):
+    import xlwt
+    traceFile=xlwt.Workbook()
+    sheetIndex=1
+    traceSheet=traceFile.add_sheet('sheet '+str(sheetIndex), cell_overwrite_ok=True)
+    traceIndex=0
+    for record in records:
+        traceSheet.write(traceIndex,0,str(record['time']))
+        traceSheet.write(traceIndex,1,record['entityName'])
+        traceSheet.write(traceIndex,2,record['message'])
+        traceIndex+=1
+        if traceIndex==65536:
+            traceIndex=0
+            sheetIndex+=1
+            traceSheet=traceFile.add_sheet('sheet '+str(sheetIndex), cell_overwrite_ok=True)
+    if route is not None:
+        routeSheet=traceFile.add_sheet('sheet '+str(sheetIndex+1)+' route', cell_overwrite_ok=True)
+        for ((row, column), value) in sorted(route.cells.items()):
+            routeSheet.write(row, column, value)
+        for (firstRow, lastRow, firstColumn, lastColumn, value) in route.merges:
+            routeSheet.write_merge(firstRow, lastRow, firstColumn, lastColumn, value)
+    return traceFile
@@ -0,0 +1,188 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+the tracer of the console messages (printTrace). Every message has a category and a
+level. A disabled tracer is checked with one attribute, and the messages are only
+formatted if they are output. The messages are printed (as before), sent to the
+logging module or kept in a ring buffer of the last messages
+'''
+
+import logging
+from collections import deque
+
+# ===========================================================================
+# the phrases of the keywords of ManPyObject.printTrace
+# ===========================================================================
+PHRASES={'create':{'phrase':'created an entity'},
+        "destroy":{'phrase':'destroyed at', 'suffix':' * '},
+        'signal':{'phrase':'signalling'},
+        'signalGiver':{'phrase':'signalling giver', 'prefix':'_'},
+        'signalReceiver':{'phrase':'signalling receiver','prefix':'_'},
+        'attemptSignal':{'phrase':'will try to signal'},
+        'attemptSignalGiver':{'phrase':'will try to signal a giver'},
+        'attemptSignalReceiver':{'phrase':'will try to signal a receiver'},
+        'preempt': {'phrase':'preempts','suffix':' .'},
+        'preempted': {'phrase':'is being preempted','suffix':'. '},
+        'startWork':{'phrase':'started working in'},
+        'finishWork':{'phrase':'finished working in'},
+        'processEnd':{'phrase':'ended processing in'},
+        'interrupted':{'phrase':'interrupted at','suffix':' .'},
+        'enter':{'phrase':'got into','suffix':'='},
+        'waitEvent':{'phrase':'will wait for event'},
+        'received':{'phrase':'received event'},
+        'isRequested':{'phrase':'received an isRequested event from'},
+        'canDispose':{'phrase':'received an canDispose event'},
+        'interruptionEnd':{'phrase':'received an interruptionEnd event at'},
+        "loadOperatorAvailable":{'phrase':'received a loadOperatorAvailable event at'},
+        "resourceAvailable":{'phrase':'received a resourceAvailable event'},
+        "entityRemoved":{'phrase':'received an entityRemoved event from'},
+        'moveEnd':{'phrase':'received a moveEnd event'},
+        "conveyerEnd":{'phrase':'has reached conveyer End', 'suffix':'.!'},
+        'conveyerFull':{'phrase':'is now Full, No of units:', 'suffix':'(*)'}}
+
+# the keywords of ManPyObject.printTrace, in the order they were introduced
+SUPPORTED_KEYWORDS=("create",
+            "signal", "signalReceiver", "signalGiver",
+            "attemptSignal","attemptSignalGiver", "attemptSignalReceiver",
+            "preempt", "preempted",
+            "startWork", "finishWork",
+            "processEnd", "interrupted",
+            "enter", "destroy",
+            "waitEvent", "received", "isRequested","canDispose",
+            "interruptionEnd", "loadOperatorAvailable", "resourceAvailable","entityRemoved",
+            'conveyerEnd', 'conveyerFull','moveEnd')
+
+# ===========================================================================
+# the categories of the messages and their levels. The keywords of printTrace
+# are in the categories signal, event, entity and operator. The messages of the
+# ObjectInterruptions are in the category of their class (traceCategory)
+# ===========================================================================
+KEYWORD_CATEGORIES={}
+for keyword in ("signal", "signalReceiver", "signalGiver",
+                "attemptSignal", "attemptSignalGiver", "attemptSignalReceiver"):
+    KEYWORD_CATEGORIES[keyword]='signal'
+for keyword in ("waitEvent", "received", "isRequested", "canDispose", "interruptionEnd",
+                "loadOperatorAvailable", "resourceAvailable", "entityRemoved", "moveEnd"):
+    KEYWORD_CATEGORIES[keyword]='event'
+for keyword in ("create", "destroy", "enter", "processEnd", "interrupted",
+                "preempt", "preempted", "conveyerEnd", "conveyerFull"):
+    KEYWORD_CATEGORIES[keyword]='entity'
+for keyword in ("startWork", "finishWork"):
+    KEYWORD_CATEGORIES[keyword]='operator'
+
+CATEGORY_LEVELS={'signal':logging.DEBUG,
+                 'event':logging.DEBUG,
+                 'router':logging.DEBUG,
+                 'entity':logging.INFO,
+                 'operator':logging.INFO,
+                 'interruption':logging.INFO}
+
+# ===========================================================================
+# formats a message of ManPyObject.printTrace, as it used to be printed
+# ===========================================================================
+def formatKeywordMessage(time, entity, key, arg):
+    charLimit=60
+    remainingChar=charLimit-len(entity)-len(str(time))
+    element=PHRASES[key]
+    phrase=element['phrase']
+    prefix=element.get('prefix',None)
+    suffix=element.get('suffix',None)
+    if prefix:
+        words=(time, entity, prefix*remainingChar, phrase, arg)
+    elif suffix:
+        remainingChar-=len(phrase)+len(arg)
+        suffix*=remainingChar
+        if key=='enter':
+            suffix=suffix+'>'
+        words=(time, entity, phrase, arg, suffix)
+    else:
+        words=(time, entity, phrase, arg)
+    return ' '.join([unicode(word) for word in words])
+
+# ===========================================================================
+# the tracer of a simulation run
+# ===========================================================================
+class Tracer(object):
+    outputs=('print', 'logging', 'ringBuffer')
+
+    def __init__(self, enabled=False, level=logging.DEBUG, categories=None, objectIds=None,
+                 output='print', bufferSize=10000, logger=None):
+        if output not in self.outputs:
+            raise ValueError("Unknown trace output %r, supported outputs are %s" % (output, self.outputs))
+        self.enabled=enabled            # if False nothing is traced
+        self.level=level                # the messages below this level are not traced
+        self.categories=None            # the traced categories (None for all)
+        if categories:
+            self.categories=frozenset(categories)
+        self.objectIds=None             # the ids of the traced objects (None for all)
+        if objectIds:
+            self.objectIds=frozenset(objectIds)
+        self.output=output
+        self.logger=logger or logging.getLogger('dream.simulation.trace')
+        self.buffer=deque(maxlen=bufferSize)    # the last messages, if output is ringBuffer
+
+    # =======================================================================
+    # creates the tracer from the general properties of the model
+    # =======================================================================
+    @staticmethod
+    def fromGeneralInput(general):
+        level=general.get('consoleLevel', 'DEBUG')
+        if not isinstance(level, int):
+            level=logging.getLevelName(str(level).upper())
+            if not isinstance(level, int):
+                raise ValueError("Unknown console level %r" % (general.get('consoleLevel'), ))
+        return Tracer(enabled=(general.get('console', 'No')=='Yes'),
+                      level=level,
+                      categories=general.get('consoleCategories'),
+                      objectIds=general.get('consoleObjects'),
+                      output=general.get('consoleOutput', 'print'),
+                      bufferSize=int(general.get('consoleBufferSize', 10000)))
+
+    # =======================================================================
+    # returns True if the messages of obj in category are traced
+    # =======================================================================
+    def isEnabledFor(self, obj, category):
+        if not self.enabled:
+            return False
+        if self.categories is not None and category not in self.categories:
+            return False
+        if self.objectIds is not None and getattr(obj, 'id', None) not in self.objectIds:
+            return False
+        return CATEGORY_LEVELS.get(category, logging.DEBUG)>=self.level
+
+    # =======================================================================
+    # outputs a formatted message
+    # =======================================================================
+    def emit(self, category, message):
+        if self.output=='print':
+            print message
+        elif self.output=='logging':
+            self.logger.log(CATEGORY_LEVELS.get(category, logging.DEBUG), message)
+        else:
+            self.buffer.append(message)
+
+    # =======================================================================
+    # returns the messages of the ring buffer
+    # =======================================================================
+    def getMessages(self):
+        return list(self.buffer)
@@ -0,0 +1,105 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 18 Oct 2026
+
+'''
+'''
+records the WIP of a station as a time series of [time, wip] rows. The rows are kept in a
+preallocated numpy buffer that doubles its size when full, so that appending is amortised O(1)
+'''
+
+import numpy
+
+# ===========================================================================
+# the WIP statistics recorder
+# ===========================================================================
+class WipStatRecorder(object):
+
+    def __init__(self, changeOnly=False, interval=None, maxLength=None, initialCapacity=64):
+        self.changeOnly=bool(changeOnly)    # if True a row is recorded only if the wip changed
+        self.interval=None                  # if given a row is recorded at most once per interval,
+        if interval:                        # changes within the interval update the wip of the last row
+            self.interval=float(interval)
+        self.maxLength=None                 # if given only the last maxLength rows are kept (ring buffer)
+        if maxLength:
+            self.maxLength=int(maxLength)
+            initialCapacity=min(initialCapacity, self.maxLength)
+        self.buffer=numpy.empty((max(int(initialCapacity), 1), 2))
+        self.start=0                        # index of the oldest row in the buffer
+        self.length=0                       # number of rows held
+        # the series starts with an empty station at time 0
+        self.record(0, 0)
+
+    def __len__(self):
+        return self.length
+
+    # =======================================================================
+    # index in the buffer of the i-th row
+    # =======================================================================
+    def _position(self, i):
+        return (self.start+i)%len(self.buffer)
+
+    # =======================================================================
+    # records the wip of the station at the given time
+    # =======================================================================
+    def record(self, time, wip):
+        if self.length:
+            last=self.buffer[self._position(self.length-1)]
+            if self.changeOnly and last[1]==wip:
+                return
+            if self.interval and time<last[0]+self.interval:
+                last[1]=wip
+                return
+        if self.maxLength and self.length==self.maxLength:
+            # overwrite the oldest row
+            self.buffer[self.start]=(time, wip)
+            self.start=(self.start+1)%len(self.buffer)
+            return
+        if self.length==len(self.buffer):
+            self._grow()
+        self.buffer[self._position(self.length)]=(time, wip)
+        self.length+=1
+
+    # =======================================================================
+    # doubles the size of the buffer (bounded by maxLength if given)
+    # =======================================================================
+    def _grow(self):
+        capacity=2*len(self.buffer)
+        if self.maxLength:
+            capacity=min(capacity, self.maxLength)
+        buffer=numpy.empty((capacity, 2))
+        buffer[:self.length]=self.toArray()
+        self.buffer=buffer
+        self.start=0
+
+    # =======================================================================
+    # returns the recorded rows as a (length x 2) array, oldest first
+    # =======================================================================
+    def toArray(self):
+        end=self.start+self.length
+        if end<=len(self.buffer):
+            return self.buffer[self.start:end]
+        return numpy.concatenate((self.buffer[self.start:], self.buffer[:end-len(self.buffer)]))
+
+    # =======================================================================
+    # returns the recorded rows as a list of [time, wip] lists, as used in the JSON output
+    # =======================================================================
+    def toList(self):
+        return self.toArray().tolist()
@@ -25,8 +25,6 @@ Created on 12 Dec 2014
 
 from Globals import G
 from pulp import *
-from os import remove 
-from glob import glob
 
 def Allocation_IP(item, week, previousAss, capacity, weightFactor):
     
@@ -77,7 +75,7 @@ def Allocation_IP(item, week, previousAss, capacity, weightFactor):
             if bottleneck in G.RouteDict[ma]:
                 requiredCapacity[bottleneck].append(G.RouteDict[ma][bottleneck][week] * MA_var[ma] * G.BatchSize[ma][week])
 
-        capDict_obj[bottleneck] = lpSum([-1*capacity[bottleneck][week]]+[requiredCapacity[bottleneck]]+[G.Capacity[bottleneck][week]['OriginalCapacity']])
+        capDict_obj[bottleneck] = lpSum([-1*float(G.capacityModel.get(capacity, bottleneck, week))]+[requiredCapacity[bottleneck]]+[G.Capacity[bottleneck][week]['OriginalCapacity']])
 
         utilisation[bottleneck] = 1.0/float(G.Capacity[bottleneck][week]['OriginalCapacity']) *capDict_obj[bottleneck] 
         Util[bottleneck] = utilisation[bottleneck]*-1
@@ -134,25 +132,12 @@ def Allocation_IP(item, week, previousAss, capacity, weightFactor):
             
     # capacity constraints
     for bottleneck in G.Bottlenecks:                
-        prob += lpSum([MA_var[ma]*G.RouteDict[ma][bottleneck][week]*G.BatchSize[ma][week] for ma in MAlist if bottleneck in G.RouteDict[ma]]) <= capacity[bottleneck][week]- 0.1
+        prob += lpSum([MA_var[ma]*G.RouteDict[ma][bottleneck][week]*G.BatchSize[ma][week] for ma in MAlist if bottleneck in G.RouteDict[ma]]) <= float(G.capacityModel.get(capacity, bottleneck, week))- 0.1
     
-    #_______________________________________    
-    # write the problem data to an .lp file.
-    prob.writeLP("IPifx.lp") 
     prob.solve()
     
     allocation = {}
     for ma in MAlist:
         allocation[ma] = MA_var[ma].varValue * G.BatchSize[ma][week]
-        
-        
-    # remove lp files
-    files = glob('*.mps')
-    for f in files:
-        remove(f)
-        
-    files = glob('*.lp')
-    for f in files:
-        remove(f)
     
     return allocation
@@ -46,7 +46,7 @@ def AllocationRoutine2(initialWeek, itemList, itemType):
         step = 1
         ind = G.WeekList.index(initialWeek)
         weekList = [initialWeek]
-        capacity = deepcopy(G.CurrentCapacityDict)
+        capacity = G.CurrentCapacity
         qty = item['Qty']
         Allocation = []
         earliness = 0
@@ -69,14 +69,14 @@ def AllocationRoutine2(initialWeek, itemList, itemType):
             for ma in item['MAlist']:
                 
                 if step > 1:                    
-                    capacity = deepcopy(Results[ma]['remainingCap'])
+                    capacity = Results[ma]['remainingCap']
                     qty = deepcopy(Results[ma]['remainingUnits'])
                     Allocation = deepcopy(Results[ma]['Allocation'])
                     earliness = deepcopy(Results[ma]['earliness'])
                     lateness = deepcopy(Results[ma]['lateness'])
                 
                 else:
-                    capacity = deepcopy(G.CurrentCapacityDict)
+                    capacity = G.CurrentCapacity
                     qty = item['Qty']
                     Allocation = []
                     earliness = 0
@@ -95,7 +95,7 @@ def AllocationRoutine2(initialWeek, itemList, itemType):
                             
             # confirm the solution
             if chosenMA != None:
-                G.CurrentCapacityDict = Results[chosenMA]['remainingCap']
+                G.CurrentCapacity = Results[chosenMA]['remainingCap']
                 G.incompleteBatches = Results[chosenMA]['remUnits']
                 G.Earliness[initialWeek][chosenMA]['qty'].append(item['Qty'])
                 G.Earliness[initialWeek][chosenMA]['earliness'].append(float(Results[chosenMA]['earliness'])/item['Qty'])
@@ -183,7 +183,7 @@ def choseMA2(allResults, possibleSolutions, weeklist):      # more similar to AC
                 minU = []
                 targetU = []
                 for week in weeklist:
-                    utilisation = float(G.Capacity[bottleneck][week]['OriginalCapacity'] - allResults[ma]['remainingCap'][bottleneck][week])/G.Capacity[bottleneck][week]['OriginalCapacity']
+                    utilisation = float(G.Capacity[bottleneck][week]['OriginalCapacity'] - G.capacityModel.get(allResults[ma]['remainingCap'], bottleneck, week))/G.Capacity[bottleneck][week]['OriginalCapacity']
                     minU.append(max(0, (G.Capacity[bottleneck][week]['minUtilisation']-utilisation)/G.Capacity[bottleneck][week]['minUtilisation']))
                     targetU.append((utilisation - G.Capacity[bottleneck][week]['targetUtilisation'])/G.Capacity[bottleneck][week]['targetUtilisation'])
                     
@@ -27,20 +27,79 @@ from Globals import G
 from Allocation_3 import Allocation2
 from UtilisationCalculation import utilisationCalc2, utilisationCalc1
 from copy import deepcopy
+import sys
+
+# trie of the MA choices of the evaluated ants, along the order of the items. The node of a prefix
+# keeps the state of the allocation after its items (checkpoint), so that an ant sharing the prefix
+# resumes from there. The checkpoints take at most about maxBytes (every process evaluating ants
+# has its own trie), the shortest prefixes being added first
+class PrefixCheckpoints(object):
+    
+    def __init__(self, maxBytes=64*2**20):
+        self.maxBytes = maxBytes
+        self.size = 0               # the number of bytes taken by the checkpoints
+        self.root = [None, {}]      # [state, {MA: child node}]
+        
+    # returns the number of choices of the deepest prefix of choices in the trie, and its node
+    def find(self, choices):
+        node = self.root
+        depth = 0
+        for choice in choices:
+            child = node[1].get(choice)
+            if child is None:
+                break
+            node = child
+            depth += 1
+        return depth, node
+    
+    # returns the number of bytes a child of the node with the state takes. The capacity and incomplete
+    # batches are not counted if they are the ones of the node (the item was not allocated)
+    def getSize(self, node, state):
+        excess, capacity, incompleteBatches, earliness, lateness = state
+        size = sys.getsizeof(state) + 2*sys.getsizeof([None, {}])
+        if node[0] is None or capacity is not node[0][1]:
+            size += sys.getsizeof(capacity)
+        if node[0] is None or incompleteBatches is not node[0][2]:
+            size += sys.getsizeof(incompleteBatches)
+        return size
+    
+    # adds the child of the node for the choice with the state, returns it (None if the trie is full)
+    def add(self, node, choice, state):
+        if node is None:
+            return None
+        size = self.getSize(node, state)
+        if self.size + size > self.maxBytes:
+            return None
+        child = [state, {}]
+        node[1][choice] = child
+        self.size += size
+        return child
 
 # allocates orders of a give week/priority level implementing the ant choice for MAs
+# if G.ACOcheckpoints is set, the allocation resumes from the checkpoint of the longest prefix of
+# the ant already evaluated. The capacity and incomplete batches are not changed after they are
+# created, so the checkpoints keep them without copies
 def AllocationRoutine_ACO(initialWeek, itemList, itemType, ant):
         
     ACOexcess = 0
-    ACOcapacityDict = deepcopy(G.CurrentCapacityDict)
+    ACOcapacity = G.CurrentCapacity
     ACOincompleteBatches = deepcopy(G.incompleteBatches)
     ACOearliness = 0
     ACOlateness = 0
     ACOtargetUtil = 0
     ACOminUtil = 0
+    ind = G.WeekList.index(initialWeek)
+    
+    choices = [ant[item['orderID']] for item in itemList]
+    start = 0
+    node = None
+    if G.ACOcheckpoints is not None:
+        start, node = G.ACOcheckpoints.find(choices)
+        if start:
+            ACOexcess, ACOcapacity, ACOincompleteBatches, ACOearliness, ACOlateness = node[0]
     
     # repeat allocation procedure for all items in the list
-    for item in itemList:
+    for item in itemList[start:]:
         
         #================================================
         # Allocation step 1...allocation at current Week
@@ -48,9 +107,8 @@ def AllocationRoutine_ACO(initialWeek, itemList, itemType, ant):
         
         Results = {}
         step = 1
-        ind = G.WeekList.index(initialWeek)
         weekList = [initialWeek]
-        capacity = deepcopy(ACOcapacityDict)
+        capacity = ACOcapacity
         qty = item['Qty']
         Allocation = []
         earliness = 0
@@ -73,7 +131,7 @@ def AllocationRoutine_ACO(initialWeek, itemList, itemType, ant):
             
             # check different MAs
             if step > 1:                    
-                capacity = deepcopy(Results[ma]['remainingCap'])
+                capacity = Results[ma]['remainingCap']
                 inBatches = deepcopy(Results[ma]['remUnits'])
                 qty = deepcopy(Results[ma]['remainingUnits'])
                 Allocation = deepcopy(Results[ma]['Allocation'])
@@ -81,7 +139,7 @@ def AllocationRoutine_ACO(initialWeek, itemList, itemType, ant):
                 lateness = deepcopy(Results[ma]['lateness'])
             
             else:
-                capacity = deepcopy(ACOcapacityDict)
+                capacity = ACOcapacity
                 inBatches = deepcopy(ACOincompleteBatches)
                 qty = item['Qty']
                 Allocation = []
@@ -95,7 +153,7 @@ def AllocationRoutine_ACO(initialWeek, itemList, itemType, ant):
                             
             # confirm the solution
             if chosenMA != None:
-                ACOcapacityDict = Results[chosenMA]['remainingCap']
+                ACOcapacity = Results[chosenMA]['remainingCap']
                 ACOincompleteBatches = Results[chosenMA]['remUnits']
                 ACOearliness += Results[chosenMA]['earliness']/item['Qty'] 
                 ACOlateness += Results[chosenMA]['lateness']/item['Qty'] 
@@ -105,11 +163,15 @@ def AllocationRoutine_ACO(initialWeek, itemList, itemType, ant):
         
         if chosenMA == None:
             ACOexcess += item['Qty'] 
+        
+        # checkpoint the state after the item
+        if G.ACOcheckpoints is not None:
+            node = G.ACOcheckpoints.add(node, ma, (ACOexcess, ACOcapacity, ACOincompleteBatches, ACOearliness, ACOlateness))
     
     if G.minDeltaUt:
-        ACOtargetUtil, ACOminUtil = utilisationCalc1(ACOcapacityDict, initialWeek, ind)
+        ACOtargetUtil, ACOminUtil = utilisationCalc1(ACOcapacity, initialWeek, ind)
     else:
-        ACOtargetUtil, ACOminUtil = utilisationCalc2(ACOcapacityDict, initialWeek, ind)
+        ACOtargetUtil, ACOminUtil = utilisationCalc2(ACOcapacity, initialWeek, ind)
         
     return {'ant':ant, 'excess':ACOexcess, 'earliness':ACOearliness, 'lateness':ACOlateness, 'targetUtil':ACOtargetUtil, 'minUtil':ACOminUtil}
 
@@ -43,7 +43,7 @@ def AllocationRoutine_Final(initialWeek, itemList, itemType, ant):
         step = 1
         ind = G.WeekList.index(initialWeek)
         weekList = [initialWeek]
-        capacity = deepcopy(G.CurrentCapacityDict)
+        capacity = G.CurrentCapacity
         qty = item['Qty']
         Allocation = []
         earliness = 0
@@ -64,14 +64,14 @@ def AllocationRoutine_Final(initialWeek, itemList, itemType, ant):
                 continue
             
             if step > 1:                    
-                capacity = deepcopy(Results[ma]['remainingCap'])
+                capacity = Results[ma]['remainingCap']
                 qty = deepcopy(Results[ma]['remainingUnits'])
                 Allocation = deepcopy(Results[ma]['Allocation'])
                 earliness = deepcopy(Results[ma]['earliness'])
                 lateness = deepcopy(Results[ma]['lateness'])
             
             else:
-                capacity = deepcopy(G.CurrentCapacityDict)
+                capacity = G.CurrentCapacity
                 qty = item['Qty']
                 Allocation = []
                 earliness = 0
@@ -84,7 +84,7 @@ def AllocationRoutine_Final(initialWeek, itemList, itemType, ant):
                            
             # confirm the solution
             if chosenMA != None:
-                G.CurrentCapacityDict = Results[chosenMA]['remainingCap']
+                G.CurrentCapacity = Results[chosenMA]['remainingCap']
                 G.incompleteBatches = Results[chosenMA]['remUnits']
                 G.Earliness[initialWeek][chosenMA]['qty'].append(item['Qty'])
                 G.Earliness[initialWeek][chosenMA]['earliness'].append(float(Results[chosenMA]['earliness'])/item['Qty'])
@@ -47,7 +47,7 @@ def AllocationRoutine_Forecast(initialWeek, itemList, itemType, seq):
         step = 1
         ind = G.WeekList.index(initialWeek)
         weekList = [initialWeek]
-        capacity = deepcopy(G.CurrentCapacityDict)
+        capacity = G.CurrentCapacity
         qty = item['Qty']
         Allocation = []
         earliness = 0
@@ -83,7 +83,7 @@ def AllocationRoutine_Forecast(initialWeek, itemList, itemType, seq):
                         assert (Results['remainingUnits'] == 0)
                         
                         # update variables
-                        capacity = deepcopy(Results['remainingCap'])
+                        capacity = Results['remainingCap']
                         qty -= spAllocation[ma]
                         Allocation = deepcopy(Results['Allocation'])
                         earliness = deepcopy(Results['earliness'])
@@ -103,7 +103,7 @@ def AllocationRoutine_Forecast(initialWeek, itemList, itemType, seq):
         
         # confirm results 
         if qty <= 0:
-            G.CurrentCapacityDict = Results['remainingCap']
+            G.CurrentCapacity = Results['remainingCap']
             G.incompleteBatches = Results['remUnits']
 #            print initialWeek, G.Earliness
             for maT in EarlinessMA:
@@ -38,7 +38,7 @@ def AllocationRoutine_ForecastGA(initialWeek, itemList, itemType, chromo):
     LatenessMA = {}
 
     GAexcess = 0
-    GAcapacityDict = deepcopy(G.CurrentCapacityDict)
+    GAcapacity = G.CurrentCapacity
     GAincompleteBatches = deepcopy(G.incompleteBatches)
     GAearliness = 0
     GAlateness = 0
@@ -62,7 +62,7 @@ def AllocationRoutine_ForecastGA(initialWeek, itemList, itemType, chromo):
         step = 1
         ind = G.WeekList.index(initialWeek)
         weekList = [initialWeek]
-        capacity = deepcopy(GAcapacityDict)
+        capacity = GAcapacity
         inBatches = deepcopy(GAincompleteBatches)
         qty = item['Qty']
         Allocation = []
@@ -99,7 +99,7 @@ def AllocationRoutine_ForecastGA(initialWeek, itemList, itemType, chromo):
                         assert (Results['remainingUnits'] == 0)
                         
                         # update order variables
-                        capacity = deepcopy(Results['remainingCap'])
+                        capacity = Results['remainingCap']
                         inBatches = deepcopy(Results['remUnits'])
                         qty -= spAllocation[ma]
                         Allocation = deepcopy(Results['Allocation'])
@@ -115,7 +115,7 @@ def AllocationRoutine_ForecastGA(initialWeek, itemList, itemType, chromo):
                 
                 # if order has been fully allocated update GA variables        
                 if qty <= 0:
-                    GAcapacityDict = deepcopy(capacity)
+                    GAcapacity = capacity
                     GAincompleteBatches = inBatches
                     GAearliness += earliness/item['Qty']
                     GAlateness += lateness/item['Qty']                    
@@ -128,9 +128,9 @@ def AllocationRoutine_ForecastGA(initialWeek, itemList, itemType, chromo):
             GAexcess += item['Qty']
     
     if G.minDeltaUt:       
-        GAtargetUtil, GAminUtil = utilisationCalc1(GAcapacityDict, initialWeek, ind)
+        GAtargetUtil, GAminUtil = utilisationCalc1(GAcapacity, initialWeek, ind)
     else:
-        GAtargetUtil, GAminUtil = utilisationCalc2(GAcapacityDict, initialWeek, ind)
+        GAtargetUtil, GAminUtil = utilisationCalc2(GAcapacity, initialWeek, ind)
         
     return {'chromo':chromo, 'excess':GAexcess, 'earliness':GAearliness, 'lateness':GAlateness, 'targetUtil':GAtargetUtil, 'minUtil':GAminUtil}
 
@@ -23,9 +23,10 @@ Created on 28 Jan 2015
 @author: Anna
 '''
 from Globals import G
-from math import ceil, fabs
-from copy import deepcopy
+from math import ceil
 
+# allocates the qty of the MA in the weeks of weekList. capIn is the remaining capacity
+# (bottleneck x week array of G.capacityModel), it is copied and not changed
 def Allocation2(currentMA, qty, weekList, capIn, inBatches, earliness, lateness, Allocation, demandWeek):
     
     # allocate item on its own route    
@@ -34,8 +35,10 @@ def Allocation2(currentMA, qty, weekList, capIn, inBatches, earliness, lateness,
     remainingUnits = qty
     
 #        Allocation = [] #reports allocation results in the form of dcitionaries ('allocatedQty':..,'week':..) 
-    currentCapacity = deepcopy(capIn)
-    remUnits = deepcopy(inBatches)
+    model = G.capacityModel
+    currentCapacity = capIn.copy()
+    remUnits = dict(inBatches)
+    routeBottlenecks = model.routeBottlenecks[currentMA]
     utilisation = {}
     for bottleneck in G.RouteDict[currentMA]:
         utilisation[bottleneck] = {}
@@ -71,27 +74,27 @@ def Allocation2(currentMA, qty, weekList, capIn, inBatches, earliness, lateness,
 #                # FIXME: maybe excess units should be defined here
 #                break
 
-        # read the capacity that the MA requires
-        requiredCapacity={}
-        for x in G.RouteDict[currentMA]:
-            requiredCapacity[x]=G.RouteDict[currentMA][x][currentWeek]*correctedQty
+        # read the capacity that the MA requires (for the bottlenecks of its route)
+        weekIndex = model.weekIndex[currentWeek]
+        loadFactor = model.getRouteLoad(currentMA, currentWeek)
+        requiredCapacity = loadFactor*correctedQty
 
         # read the remaining capacity for the given week and subtract the required from it
-        remainingCapacity={}
-        for bottleneck in G.RouteDict[currentMA]:
-            remainingCapacity[bottleneck]=currentCapacity[bottleneck][currentWeek]-requiredCapacity[bottleneck]
-            # if we dropped below zero then the capacity is not sufficient
-            if remainingCapacity[bottleneck]<0:
-                sufficient=False           
+        remainingCapacity = currentCapacity[routeBottlenecks, weekIndex]-requiredCapacity
+        # if we dropped below zero then the capacity is not sufficient
+        if (remainingCapacity<0).any():
+            sufficient=False           
         
         # check if there is sufficient capacity to process the order
         if sufficient:       
             
             remainingUnits = 0  
             #remainingUnits = max(remainingUnits, 0)
-            for bottleneck in G.RouteDict[currentMA]:
-                currentCapacity[bottleneck][currentWeek]=remainingCapacity[bottleneck]
-                utilisation[bottleneck][currentWeek] = float(G.Capacity[bottleneck][currentWeek]['OriginalCapacity'] - currentCapacity[bottleneck][currentWeek])/G.Capacity[bottleneck][currentWeek]['OriginalCapacity']
+            currentCapacity[routeBottlenecks, weekIndex] = remainingCapacity
+            originalCapacity = model.originalCapacity[routeBottlenecks, weekIndex]
+            routeUtilisation = (originalCapacity-remainingCapacity)/originalCapacity
+            for (bottleneck, value) in zip(G.RouteDict[currentMA], routeUtilisation):
+                utilisation[bottleneck][currentWeek] = float(value)
             Allocation.append({'ma':currentMA, 'units':correctedQty, 'week':currentWeek})   
             lateness += max([0, currentWeek - demandWeek])*correctedQty
             earliness += max([0, demandWeek - currentWeek])*correctedQty
@@ -110,13 +113,11 @@ def Allocation2(currentMA, qty, weekList, capIn, inBatches, earliness, lateness,
         else:             
 
             # calculate max qty allocable
-            excessUnits=0
             excess=0
-            for bottleneck in remainingCapacity:
-                if requiredCapacity[bottleneck]>0 and remainingCapacity[bottleneck]<0:
-                    excessUnits = remainingCapacity[bottleneck]/G.RouteDict[currentMA][bottleneck][currentWeek]
-                    if ceil(fabs(excessUnits))>excess:
-                        excess = ceil(fabs(excessUnits))
+            exceeded = (requiredCapacity>0)&(remainingCapacity<0)
+            if exceeded.any():
+                excessUnits = remainingCapacity[exceeded]/loadFactor[exceeded]
+                excess = max(excess, ceil(abs(excessUnits).max()))
                         
             # update remaining capacity
             assert(excess <= correctedQty)
@@ -127,8 +128,7 @@ def Allocation2(currentMA, qty, weekList, capIn, inBatches, earliness, lateness,
             remainingUnits -= allocableQty 
             assert(remainingUnits>0)               
             
-            for bottleneck in G.RouteDict[currentMA]:
-                currentCapacity[bottleneck][currentWeek]-=allocableQty*G.RouteDict[currentMA][bottleneck][currentWeek]
+            currentCapacity[routeBottlenecks, weekIndex] -= allocableQty*loadFactor
             
             Allocation.append({'ma':currentMA,'units':allocableQty, 'week':currentWeek})
             lateness += max([0, currentWeek - demandWeek])*allocableQty
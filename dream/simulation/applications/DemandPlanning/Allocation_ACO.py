@@ -25,8 +25,10 @@ Created on 8 Dec 2014
 
 ''' implements ACO for the allocation of orders/forecast of a certain week/priority level '''
 
-from AllocationRoutine_ACO2 import AllocationRoutine_ACO
+from AllocationRoutine_ACO2 import AllocationRoutine_ACO, PrefixCheckpoints
 from AllocationRoutine_Final import AllocationRoutine_Final
+from BatchEvaluation import BatchEvaluator
+from dream.simulation.Fingerprint import FingerprintSet
 from Globals import G
 from random import choice
 from operator import itemgetter
@@ -146,51 +148,62 @@ def Allocation_ACO(initialWeek, itemList, itemType,ACOresults):
         antDictionary[item['orderID']] = deepcopy(item['MAlist'])
     
     ants = []   #list of ants that are being evaluated, an ant is a combination of different weighting factors for multi-obj optimisation (PB assignment)
-    testedAnts = []
+    testedAnts = FingerprintSet(excludedKeys=['antID'])    # the ants are identified by their MAs, not by their ID
     
     antID = 1
     
-    for gen in range(G.noGen):
+    # the ants share the checkpoints of their common prefixes (the items are allocated in the same order)
+    if G.ACOcheckpointsMaxBytes:
+        G.ACOcheckpoints = PrefixCheckpoints(G.ACOcheckpointsMaxBytes)
+    
+    # the ants of all the generations are evaluated on the same workers
+    with BatchEvaluator(AllocationRoutine_ACO) as evaluator:
+        for gen in range(G.noGen):
         
-        print 'generation', gen
+            print 'generation', gen
         
-        for rep in range(G.popSize):
-            print 'ant', rep
+            newAnts = []
+            reps = []
+            for rep in range(G.popSize):
+                print 'ant', rep
             
-            # create an ant
-            ant = {}
-            for item in itemList:
-                ant[item['orderID']] = choice(antDictionary[item['orderID']])
+                # create an ant
+                ant = {}
+                for item in itemList:
+                    ant[item['orderID']] = choice(antDictionary[item['orderID']])
             
-            if ant in testedAnts:       
-                continue
-
-            # record ant
-            testedAnts.append(ant)
+                # record ant
+                if not testedAnts.add(ant):       
+                    continue
             
-            ant['antID'] = antID            
+                ant['antID'] = antID            
+                newAnts.append(ant)
+                reps.append(rep)
             
-            # simulate ant
-            resultAnt = AllocationRoutine_ACO(initialWeek, itemList, itemType, ant)
-            ants.append(resultAnt)
+                antID += 1
             
-            antID += 1
+            # simulate the ants of the generation
+            resultAnts = evaluator.evaluateBatch([(initialWeek, itemList, itemType, ant) for ant in newAnts])
+            for antRep, resultAnt in zip(reps, resultAnts):
+                ants.append(resultAnt)
             
-            # save ants results
-            ACOresults.append((initialWeek, gen, rep, resultAnt['ant']['antID'],resultAnt['excess'], resultAnt['lateness'], resultAnt['earliness'], resultAnt['targetUtil'], resultAnt['minUtil'] ))
+                # save ants results
+                ACOresults.append((initialWeek, gen, antRep, resultAnt['ant']['antID'],resultAnt['excess'], resultAnt['lateness'], resultAnt['earliness'], resultAnt['targetUtil'], resultAnt['minUtil'] ))
             
-        # rank ants and select best ones
-        ants, termCond = ranking(ants,10)
-        
-        if termCond == 'Terminate':
-            break
+            # rank ants and select best ones
+            ants, termCond = ranking(ants,10)
         
-        # update weights
-        for x in range(len(ants)):
-            for orderID in ants[x]['ant'].keys():
-                if orderID != 'antID':
-                    antDictionary[orderID].append(ants[x]['ant'][orderID])
+            if termCond == 'Terminate':
+                break
         
+            # update weights
+            for x in range(len(ants)):
+                for orderID in ants[x]['ant'].keys():
+                    if orderID != 'antID':
+                        antDictionary[orderID].append(ants[x]['ant'][orderID])
+    
+    G.ACOcheckpoints = None
+    
     # selection of final solution and results recording    
     print 'final allocation'    
     ant = finalRanking(ants)
@@ -28,6 +28,8 @@ Equivalent of Allocation_ACO for orders disaggregation
 
 from AllocationRoutine_ForecastGA import AllocationRoutine_ForecastGA
 from AllocationRoutine_Forecast import AllocationRoutine_Forecast
+from BatchEvaluation import BatchEvaluator
+from dream.simulation.Fingerprint import FingerprintSet
 from Globals import G
 from RankingAlgorithms import rankingElitist, compareChromosomes, finalRanking
 from GAoperators import order2x, displacement
@@ -38,7 +40,7 @@ from copy import deepcopy
 def Allocation_GA(initialWeek, itemList, itemType,GAresults):
 
     chromosomes = []   #list of ants that are being evaluated, an ant is a combination of different weighting factors for multi-obj optimisation (PB assignment)
-    testedChrom = []
+    testedChrom = FingerprintSet()
     bestChromosome = []     # record best chromosome for current generation
     
     chromoID = 0
@@ -50,85 +52,94 @@ def Allocation_GA(initialWeek, itemList, itemType,GAresults):
         orderList[item['orderID']]=item        
         orderIDlist.append(item['orderID']) 
     
-    #===========================
-    # generate first population
-    #===========================
-    print 'generation 0'
-    while chromoID < G.popSizeGA:        
+    # the chromosomes of all the generations are evaluated on the same workers
+    with BatchEvaluator(AllocationRoutine_ForecastGA) as evaluator:
+        #===========================
+        # generate first population
+        #===========================
+        print 'generation 0'
+        newChromosomes = []
+        while chromoID < G.popSizeGA:        
         
-        # generate new order sequence
-        if chromoID == 0:
-            chromo = {'cID': chromoID, 'seq':orderIDlist}
-        else:
-            chromo = {'cID':chromoID, 'seq':list(random.permutation(orderIDlist))}
+            # generate new order sequence
+            if chromoID == 0:
+                chromo = {'cID': chromoID, 'seq':orderIDlist}
+            else:
+                chromo = {'cID':chromoID, 'seq':list(random.permutation(orderIDlist))}
         
-        # verify whether the sequence has already being tested
-        if chromo['seq'] in testedChrom:
-            continue
+            # verify whether the sequence has already being tested and record it
+            if not testedChrom.add(chromo['seq']):
+                continue
         
-        # record chromosome
-        testedChrom.append(chromo['seq'])
+            # record chromosome
+            newChromosomes.append(chromo)
+            chromoID += 1
         
-        # simulate chromosome
-        resultGA = AllocationRoutine_ForecastGA(initialWeek, orderList, itemType,chromo)
-        chromosomes.append(resultGA)
-        chromoID += 1
+        # simulate the chromosomes
+        resultsGA = evaluator.evaluateBatch([(initialWeek, orderList, itemType, chromo) for chromo in newChromosomes])
+        for (i, resultGA) in enumerate(resultsGA):
+            chromosomes.append(resultGA)
         
-        # save chromosomes results
-        GAresults.append((initialWeek, 0, chromoID, resultGA['chromo']['cID'], resultGA['excess'], resultGA['lateness'], \
-                          resultGA['earliness'], resultGA['targetUtil'], resultGA['minUtil'],chromo['seq'] ))
+            # save chromosomes results
+            GAresults.append((initialWeek, 0, i+1, resultGA['chromo']['cID'], resultGA['excess'], resultGA['lateness'], \
+                              resultGA['earliness'], resultGA['targetUtil'], resultGA['minUtil'],resultGA['chromo']['seq'] ))
             
         
-    # start optimisation cycle    
-    for gen in range(1,G.noGenGA):
+        # start optimisation cycle    
+        for gen in range(1,G.noGenGA):
         
-        print 'generation', gen
+            print 'generation', gen
         
-        # selection: elitist selection with linear ranking procedure for completing the population
-        chromosomes, bc = rankingElitist(chromosomes,G.elitistSelection)
+            # selection: elitist selection with linear ranking procedure for completing the population
+            chromosomes, bc = rankingElitist(chromosomes,G.elitistSelection)
         
-        # save best chromosome for previous generation
-        bestChromosome.append(deepcopy(bc))
+            # save best chromosome for previous generation
+            bestChromosome.append(deepcopy(bc))
         
-        # check if the solution is different or the termination criterion is reached...done here to avoid ranking the results multiple times
-        if compareChromosomes(bestChromosome,G.terminationGA):
-            break
+            # check if the solution is different or the termination criterion is reached...done here to avoid ranking the results multiple times
+            if compareChromosomes(bestChromosome,G.terminationGA):
+                break
         
-        # keep track of chromosomes with changes...for these chromosomes allocation would be required
-        changeC = [0]*G.popSizeGA
+            # keep track of chromosomes with changes...for these chromosomes allocation would be required
+            changeC = [0]*G.popSizeGA
+            newChromosomes = []
         
-        # cross-over: order2 cross-over is applied
-        for item in range(G.popSizeGA):
+            # cross-over: order2 cross-over is applied
+            for item in range(G.popSizeGA):
             
-            # apply X-over based on X-over probability
-            xOver = random.random()
-            if  item < G.popSizeGA-1 and xOver <= G.probXover:
+                # apply X-over based on X-over probability
+                xOver = random.random()
+                if  item < G.popSizeGA-1 and xOver <= G.probXover:
                 
-                chromosomes[item]['chromo']['seq'], chromosomes[item+1]['chromo']['seq'] = order2x(chromosomes[item]['chromo']['seq'], chromosomes[item+1]['chromo']['seq'])
-                changeC[item] = 1   # both chromosomes have changes and they should be reassessed
-                changeC[item+1] = 1
+                    chromosomes[item]['chromo']['seq'], chromosomes[item+1]['chromo']['seq'] = order2x(chromosomes[item]['chromo']['seq'], chromosomes[item+1]['chromo']['seq'])
+                    changeC[item] = 1   # both chromosomes have changes and they should be reassessed
+                    changeC[item+1] = 1
                 
-            mutation = random.random()
-            # apply mutation based on mutation probability
-            if mutation <= G.probMutation:
+                mutation = random.random()
+                # apply mutation based on mutation probability
+                if mutation <= G.probMutation:
                 
-                chromosomes[item]['chromo']['seq'] = displacement(chromosomes[item]['chromo']['seq'])
-                changeC[item] = 1
+                    chromosomes[item]['chromo']['seq'] = displacement(chromosomes[item]['chromo']['seq'])
+                    changeC[item] = 1
                 
-            # reassess the chromosome if it has been changed and has never been investigated (does not belong to testedChromosomes)
-            #if changeC[item] and chromosomes[item]['chromo']['seq'] not in testedChrom:   #FIXME: se e`in tested non si hanno i risultati...si possono lasciare in bianco perche`counque non e`il milgiore cromosoma : 
+                # reassess the chromosome if it has been changed and has never been investigated (does not belong to testedChromosomes)
+                #if changeC[item] and chromosomes[item]['chromo']['seq'] not in testedChrom:   #FIXME: se e`in tested non si hanno i risultati...si possono lasciare in bianco perche`counque non e`il milgiore cromosoma : 
                 
-            testedChrom.append(chromosomes[item]['chromo']['seq'])
-            chromosomes[item]['chromo']['cID'] = chromoID
-            chromoID += 1
+                testedChrom.add(chromosomes[item]['chromo']['seq'])
+                chromosomes[item]['chromo']['cID'] = chromoID
+                chromoID += 1
             
-            # simulate chromosome
-            resultGA = AllocationRoutine_ForecastGA(initialWeek, orderList, itemType,chromosomes[item]['chromo'])
-            chromosomes[item] = deepcopy(resultGA)
+                # the chromosome as it is now (the next cross-over can change the same chromosome if it was selected twice)
+                newChromosomes.append(deepcopy(chromosomes[item]['chromo']))
+            
+            # simulate the chromosomes
+            resultsGA = evaluator.evaluateBatch([(initialWeek, orderList, itemType, chromo) for chromo in newChromosomes])
+            for (item, resultGA) in enumerate(resultsGA):
+                chromosomes[item] = deepcopy(resultGA)
                 
-            # save chromosomes results
-            GAresults.append((initialWeek, gen, item, chromosomes[item]['chromo']['cID'], chromosomes[item]['excess'], chromosomes[item]['lateness'], \
-                              chromosomes[item]['earliness'], chromosomes[item]['targetUtil'], chromosomes[item]['minUtil'], chromosomes[item]['chromo']['seq']))
+                # save chromosomes results
+                GAresults.append((initialWeek, gen, item, chromosomes[item]['chromo']['cID'], chromosomes[item]['excess'], chromosomes[item]['lateness'], \
+                                  chromosomes[item]['earliness'], chromosomes[item]['targetUtil'], chromosomes[item]['minUtil'], chromosomes[item]['chromo']['seq']))
         
     # final ranking
     bestC = finalRanking(chromosomes+bestChromosome)
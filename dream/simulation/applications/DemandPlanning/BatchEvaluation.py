@@ -0,0 +1,83 @@
+# ===========================================================================
+# Copyright 2015 Dublin City University
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+'''
+Created on 18 Oct 2026
+
+evaluates the candidates of the generations of an optimisation (ants or chromosomes) on a pool of
+G.noWorkers processes. The pool is forked when the first generation is evaluated and kept until the
+end of the optimisation, so that the workers read the planning data (G), which the optimisation does
+not change, without copying it. The results are returned in the order of the candidates, they do not
+depend on the number of workers
+'''
+
+from Globals import G
+import multiprocessing
+import os
+
+# the evaluation function of the current optimisation, set before the workers are forked
+_evaluate = None
+
+def _evaluateCandidate(args):
+    return _evaluate(*args)
+
+class BatchEvaluator(object):
+    
+    def __init__(self, evaluate):
+        self.evaluate = evaluate
+        self.pool = None
+        self.poolCreated = False
+        
+    # returns a pool of G.noWorkers processes, or None if the candidates are evaluated in this process
+    def createPool(self):
+        global _evaluate
+        if (G.noWorkers or 1) <= 1:
+            return None
+        # without fork the workers would not share the planning data
+        if not hasattr(os, 'fork'):
+            return None
+        # daemonic processes (e.g. the ones of a pool) are not allowed to have children
+        if multiprocessing.current_process().daemon:
+            print 'the candidates cannot be evaluated in parallel in a daemonic process'
+            return None
+        _evaluate = self.evaluate
+        return multiprocessing.Pool(G.noWorkers)
+    
+    # returns [evaluate(*args) for args in argsList]
+    def evaluateBatch(self, argsList):
+        if not self.poolCreated:
+            self.pool = self.createPool()
+            self.poolCreated = True
+        if self.pool is None or len(argsList) <= 1:
+            return [self.evaluate(*args) for args in argsList]
+        return self.pool.map(_evaluateCandidate, argsList, chunksize=1)
+    
+    def close(self):
+        global _evaluate
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+            _evaluate = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,84 @@
+# ===========================================================================
+# Copyright 2015 Dublin City University
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+'''
+Created on 18 Oct 2026
+
+dense representation of the capacity of the bottlenecks and of the load factors of the MAs.
+The capacity is a bottleneck x week array, indexed by the integer index maps built once
+when the input is imported, so that a copy of the capacity is a copy of one array
+'''
+
+from numpy import zeros, array
+
+class CapacityModel(object):
+
+    def __init__(self, bottlenecks, weeks, capacity, routeDict):
+        self.bottlenecks = list(bottlenecks)
+        self.weeks = list(weeks)
+        self.MAs = sorted(routeDict.keys())
+        # integer index maps
+        self.bottleneckIndex = dict((bottleneck, i) for (i, bottleneck) in enumerate(self.bottlenecks))
+        self.weekIndex = dict((week, j) for (j, week) in enumerate(self.weeks))
+        self.maIndex = dict((ma, k) for (k, ma) in enumerate(self.MAs))
+
+        # bottleneck x week arrays of the capacity data
+        shape = (len(self.bottlenecks), len(self.weeks))
+        self.originalCapacity = zeros(shape)
+        self.minUtilisation = zeros(shape)
+        self.targetUtilisation = zeros(shape)
+        for (i, bottleneck) in enumerate(self.bottlenecks):
+            for (j, week) in enumerate(self.weeks):
+                self.originalCapacity[i, j] = capacity[bottleneck][week]['OriginalCapacity']
+                self.minUtilisation[i, j] = capacity[bottleneck][week]['minUtilisation']
+                self.targetUtilisation[i, j] = capacity[bottleneck][week]['targetUtilisation']
+
+        # MA x bottleneck x week load factors (0 for the bottlenecks that are not in the route of the MA)
+        self.loadFactor = zeros((len(self.MAs),)+shape)
+        # the indices of the bottlenecks of the route of every MA, in the order of RouteDict
+        self.routeBottlenecks = {}
+        for ma in self.MAs:
+            k = self.maIndex[ma]
+            self.routeBottlenecks[ma] = array([self.bottleneckIndex[bottleneck] for bottleneck in routeDict[ma]], dtype=int)
+            for bottleneck in routeDict[ma]:
+                i = self.bottleneckIndex[bottleneck]
+                for (week, loadFactor) in routeDict[ma][bottleneck].items():
+                    if week in self.weekIndex:
+                        self.loadFactor[k, i, self.weekIndex[week]] = loadFactor
+
+    # returns the capacity of the bottleneck in the week
+    def get(self, capacity, bottleneck, week):
+        return capacity[self.bottleneckIndex[bottleneck], self.weekIndex[week]]
+
+    # returns the load factors of the route of the MA in the week, in the order of routeBottlenecks
+    def getRouteLoad(self, ma, week):
+        return self.loadFactor[self.maIndex[ma], self.routeBottlenecks[ma], self.weekIndex[week]]
+
+    # returns the utilisation of the capacity (bottleneck x week array)
+    def getUtilisation(self, capacity):
+        return (self.originalCapacity - capacity)/self.originalCapacity
+
+    # returns the capacity as a dict {bottleneck: {week: capacity}}
+    def toDict(self, capacity):
+        capacityDict = {}
+        for (i, bottleneck) in enumerate(self.bottlenecks):
+            capacityDict[bottleneck] = {}
+            for (j, week) in enumerate(self.weeks):
+                capacityDict[bottleneck][week] = float(capacity[i, j])
+        return capacityDict
@@ -24,6 +24,9 @@ Created on 5 Sep 2013
 '''
 import tablib
 
+# the state of the DemandPlanning application. Unlike the G of the simulation it is not
+# kept in a SimulationContext: it is shared by the whole process and never reset, so a
+# process runs one DemandPlanning request only (see STATEFUL_MODULES in dream/platform/workerpool.py)
 class G:
     Capacity = {}
     RouteDict = {}
@@ -31,7 +34,8 @@ class G:
     maxLateness = 0         # max number of weeks for lateness
     planningHorizon =0      # for future demand purposes
 #    demandFile = None
-    CurrentCapacityDict = {}
+    capacityModel = None    # CapacityModel with the index maps of the bottlenecks and weeks
+    CurrentCapacity = None  # bottleneck x week array of the remaining capacity
     Bottlenecks = []
     SPlist = {}
     SPs = []
@@ -58,6 +62,13 @@ class G:
     noGenGA = 5
     popSizeGA = 8
     probXover = 0.6
+    
+    # number of processes evaluating the ants/chromosomes of a generation
+    noWorkers = 1
+    
+    # the checkpoints of the ants of the current ACO (PrefixCheckpoints)
+    ACOcheckpoints = None
+    ACOcheckpointsMaxBytes = 64*2**20   # max memory of the checkpoints of a process (0 for no checkpoints)
     probMutation = 0.1
     elitistSelection = 1
     terminationGA = 4
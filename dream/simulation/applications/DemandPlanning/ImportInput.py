@@ -24,6 +24,7 @@ Created on 24 Nov 2014
 '''
 
 from Globals import G
+from CapacityModel import CapacityModel
 import xlrd
 
 def withoutFormat(row,col,sheet,integer):
@@ -74,6 +75,9 @@ def ImportInput(input, algorithmAttributes):
     G.probXover =algorithmAttributes.get('XOver',None)
     G.probMutation =algorithmAttributes.get('mutationProbability',None)
     
+    # number of processes evaluating the ants/chromosomes of a generation
+    G.noWorkers =algorithmAttributes.get('numberOfWorkers',1)
+    
     # Import capacity information...capacity = {Resource: {week {'originalCapacity':, 'remainingCapacity', 'minUtilisation'}
     sh = wbin.sheet_by_name('BN_Capa')
     rows = sh.nrows
@@ -90,11 +94,9 @@ def ImportInput(input, algorithmAttributes):
         G.Bottlenecks.append(bn)
         
         G.Capacity[bn] = {}#{'OriginalCapacity':{}, 'RemainingCapacity':{}, 'minUtilisation':{}, 'targetUtilisation':{}}
-        G.CurrentCapacityDict[bn] = {}
         
         for week in range(2,sh.ncols):
             G.Capacity[bn][Weeks[week]]={'OriginalCapacity':withoutFormat(row,week,sh,1), 'RemainingCapacity':withoutFormat(row+1,week,sh,1), 'minUtilisation':withoutFormat(row+2,week,sh,0), 'targetUtilisation':withoutFormat(row+3,week,sh,0)}
-            G.CurrentCapacityDict[bn][Weeks[week]] = withoutFormat(row,week,sh,1)
     
             
             
@@ -144,6 +146,10 @@ def ImportInput(input, algorithmAttributes):
         for week in range(2,sh.ncols):
             G.BatchSize[ma][Weeks[week]] = withoutFormat(row,week,sh,0)
 #            G.incompleteBatches[ma][Weeks[week]] = 0 
+    
+    # dense capacity and load factors, the remaining capacity starts from the original capacity
+    G.capacityModel = CapacityModel(G.Bottlenecks, G.WeekList, G.Capacity, G.RouteDict)
+    G.CurrentCapacity = G.capacityModel.originalCapacity.copy()
             
             
     # Import order 
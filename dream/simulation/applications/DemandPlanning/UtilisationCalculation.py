@@ -24,9 +24,18 @@ Created on 30 Jan 2015
 '''
 
 from Globals import G
-from numpy import array, mean, std, absolute
+from numpy import mean, std, absolute
 
-def utilisationCalc1(ACOcapacityDict, initialWeek, ind):
+# returns the utilisation, min utilisation and target utilisation (bottleneck x week arrays)
+# for the demand week (index ind in G.WeekList) and the earlier weeks
+def weekUtilisation(capacity, ind):
+    model = G.capacityModel
+    weekIndices = [ind] + range(ind-1, max(-1,ind-G.maxEarliness-1), -1)
+    originalCapacity = model.originalCapacity[:, weekIndices]
+    utilisation = (originalCapacity-capacity[:, weekIndices])/originalCapacity
+    return utilisation, model.minUtilisation[:, weekIndices], model.targetUtilisation[:, weekIndices]
+
+def utilisationCalc1(capacity, initialWeek, ind):
 #==============================================   
 # calculate min and target utilisation metrics
 #==============================================
@@ -42,44 +51,30 @@ def utilisationCalc1(ACOcapacityDict, initialWeek, ind):
 # for each bottleneck the mean value is calculated (across weeks)
 # the global mean (across bottlenecks) is returned
 
-    minUtil = []
-    targetUtil = []   
-    for bottleneck in G.Bottlenecks:
-        weekList = [initialWeek] + [G.WeekList[i] for i in range(ind-1, max(-1,ind-G.maxEarliness-1), -1)]
-        minU = []
-        targetU = []
-        for week in weekList:
-            utilisation = float(G.Capacity[bottleneck][week]['OriginalCapacity']-ACOcapacityDict[bottleneck][week])/G.Capacity[bottleneck][week]['OriginalCapacity'] 
-            minU.append(utilisation > G.Capacity[bottleneck][week]['minUtilisation'])
-            targetU.append(float(utilisation - G.Capacity[bottleneck][week]['targetUtilisation'])/G.Capacity[bottleneck][week]['targetUtilisation'])                
-            
-        minUtil.append(mean(array(minU)))
-        targetUtil.append(mean(absolute(targetU)))
+    utilisation, minUtilisation, targetUtilisation = weekUtilisation(capacity, ind)
+    minUtil = mean(utilisation > minUtilisation, axis=1)
+    targetUtil = mean(absolute((utilisation - targetUtilisation)/targetUtilisation), axis=1)
         
-    ACOtargetUtil = mean(array(targetUtil))
-    ACOminUtil = mean(array(minUtil))*-1
+    ACOtargetUtil = mean(targetUtil)
+    ACOminUtil = mean(minUtil)*-1
     
     return ACOtargetUtil, ACOminUtil
 
 
 
-def utilisationCalc2(ACOcapacityDict, initialWeek, ind):
+def utilisationCalc2(capacity, initialWeek, ind):
 #==============================================   
 # calculate min and target utilisation metrics
 #==============================================
 # similar to chosenMA logic
 
-    minUtil = []
-    targetUtil = []   
-    for bottleneck in G.Bottlenecks:
-        weekList = [initialWeek] + [G.WeekList[i] for i in range(ind-1, max(-1,ind-G.maxEarliness-1), -1)]
-        for week in weekList:
-            utilisation = float(G.Capacity[bottleneck][week]['OriginalCapacity']-ACOcapacityDict[bottleneck][week])/G.Capacity[bottleneck][week]['OriginalCapacity'] 
-            minUtil.append(utilisation > G.Capacity[bottleneck][week]['minUtilisation'])
-            targetUtil.append(float(utilisation - G.Capacity[bottleneck][week]['targetUtilisation'])/G.Capacity[bottleneck][week]['targetUtilisation'])                
+    # the bottlenecks in turn, as the weeks of every bottleneck
+    utilisation, minUtilisation, targetUtilisation = weekUtilisation(capacity, ind)
+    minUtil = (utilisation > minUtilisation).ravel()
+    targetUtil = ((utilisation - targetUtilisation)/targetUtilisation).ravel()
             
-    ACOtargetUtil = std(array(targetUtil))
-    ACOminUtil = mean(array(minUtil))*-1
+    ACOtargetUtil = std(targetUtil)
+    ACOminUtil = mean(minUtil)*-1
     
     return ACOtargetUtil, ACOminUtil
 
@@ -35,11 +35,14 @@ def outputResults():
     head = ['Resource_List', 'Values'] + G.WeekList
     head = tuple(head)
     G.CapacityResults.headers = head
+    currentCapacity = G.capacityModel.toDict(G.CurrentCapacity)
     for bottleneck in G.Bottlenecks:
         initialCap = [G.Capacity[bottleneck][week]['OriginalCapacity'] for week in G.WeekList]
+        # the load of every week is a float (toDict returns float capacities)
+        load = [float(G.Capacity[bottleneck][week]['OriginalCapacity']-currentCapacity[bottleneck][week]) for week in G.WeekList]
         G.CapacityResults.append([bottleneck, 'Capa Pegging Resource Capacity (UoM)',]+initialCap)
-        G.CapacityResults.append(['', 'Capa Pegging Resource Total Load (UoM)',]+[G.Capacity[bottleneck][week]['OriginalCapacity']-G.CurrentCapacityDict[bottleneck][week] for week in G.WeekList])
-        G.CapacityResults.append(['', 'Capa Pegging Resource Total Util (Percent)',]+[float(G.Capacity[bottleneck][week]['OriginalCapacity']-G.CurrentCapacityDict[bottleneck][week])/G.Capacity[bottleneck][week]['OriginalCapacity']*100 for week in G.WeekList])       
+        G.CapacityResults.append(['', 'Capa Pegging Resource Total Load (UoM)',]+load)
+        G.CapacityResults.append(['', 'Capa Pegging Resource Total Util (Percent)',]+[float(load[i])/initialCap[i]*100 for i in range(len(G.WeekList))])       
 
     # report allocation results
     head = ['PPOS', 'Demand_Items_Product_DCBNO - SP', 'Demand_Items_Product_DCBNO - MA', 'Demand_Type - Group', 'Priority','Values'] + G.WeekList
@@ -9,8 +9,6 @@ def opAss_LP(machineList, PBlist, PBskills, previousAssignment={}, weightFactors
     from pulp import LpProblem, LpMaximize, LpVariable, LpBinary, lpSum, LpStatus
     import pulp
     import copy
-    import glob
-    import os 
 
     machines = machineList.keys()
     sumWIP = float(sum([machineList[mach]['WIP'] for mach in machines ]))
@@ -162,9 +160,6 @@ def opAss_LP(machineList, PBlist, PBskills, previousAssignment={}, weightFactors
         prob += lpSum([PB_ass[(operator,machine)] for machine in machines if machineList[machine]['stationID'] in PBskills[operator]]) <= 1
             
             
-    # write the problem data to an .lp file.
-    prob.writeLP("PBassignment.lp") 
-    
     prob.solve()
     
     if LpStatus[prob.status] != 'Optimal':
@@ -177,15 +172,7 @@ def opAss_LP(machineList, PBlist, PBskills, previousAssignment={}, weightFactors
             if machineList[mach]['stationID'] in PBskills[oper]:
                 if PB_ass[(oper,mach)].varValue > 0.00001:
                     PBallocation[oper]=mach
-            
-    files = glob.glob('*.mps')
-    for f in files:
-        os.remove(f)
-        
-    files = glob.glob('*.lp')
-    for f in files:
-        os.remove(f)
-        
+
     return PBallocation
     
         
@@ -0,0 +1,58 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.plugins.plugin import PluginRegistry
+import json
+import os
+import random
+import logging
+from unittest import TestCase
+
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+class ACOTestCase(TestCase):
+
+  def runACO(self, numberOfProcesses):
+    file_path = os.path.join(project_path, "dream", "simulation",
+                             "JSONInputs", "Topology18.json")
+    input_file = open(file_path, "r")
+    data = json.loads(input_file.read())
+    input_file.close()
+    data['general'].update(numberOfProcesses=numberOfProcesses,
+                           numberOfGenerations=2,
+                           numberOfAntsPerGenerations=8,
+                           numberOfSolutions=3)
+    data['application_configuration'] = {
+      'pre_processing': {'plugin_list': []},
+      'post_processing': {'plugin_list': []},
+      'processing_plugin': {'_class': 'dream.plugins.ACO.ACO'}}
+    data['result'] = {'result_list': []}
+    random.seed(1)
+    registry = PluginRegistry(logging.getLogger(), data)
+    result_list = registry.run(data)['result']['result_list']
+    for result in result_list:
+      result['general'].pop('totalExecutionTime', None)
+    return result_list
+
+  def testLocalPool(self):
+    """The ants evaluated on a local pool of processes give the same results,
+    in the same order, as when they are evaluated one after another.
+    """
+    self.assertEquals(self.runACO(1), self.runACO(3))
@@ -0,0 +1,85 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation.CompiledRoute import CompiledRoute
+from dream.simulation.SimulationContext import SimulationContext
+from unittest import TestCase
+
+route = [
+  {'stationIdsList': ['Q1'], 'sequence': 0},
+  {'stationIdsList': ['M1', 'M2'], 'sequence': 1, 'operator': 'OP1',
+   'requiredParts': ['P1', 'P2']},
+  {'stationIdsList': ['M1'], 'sequence': 2, 'operator': 'OP2'},
+]
+
+class DummyObject(object):
+  registryCategory = 'Entity'
+  def __init__(self, id):
+    self.id = id
+
+class CompiledRouteTestCase(TestCase):
+
+  def testStepLookup(self):
+    compiled = CompiledRoute(route)
+    # the first step with the station is used
+    self.assertEquals(compiled.getSequence('M1'), 1)
+    self.assertEquals(compiled.getSequence('M2'), 1)
+    self.assertEquals(compiled.getSequence('E1'), 0)
+    self.assertEquals(compiled.getOperator('M1'), 'OP1')
+    self.assertEquals(compiled.getOperator('Q1'), None)
+    self.assertEquals(compiled.getStepIndex('M2'), 1)
+
+  def testRequiredParts(self):
+    compiled = CompiledRoute(route)
+    with SimulationContext() as context:
+      p1 = DummyObject('P1')
+      context.registry.register(p1)
+      # P2 does not exist yet, so the parts are resolved again later
+      self.assertEquals(compiled.getRequiredParts(route[1]), [p1, None])
+      p2 = DummyObject('P2')
+      context.registry.register(p2)
+      self.assertEquals(compiled.getRequiredParts(route[1]), [p1, p2])
+    self.assertEquals(compiled.getRequiredParts(route[1]), [p1, p2])
+    self.assertEquals(compiled.getRequiredParts(route[2]), [])
+
+  def testRemainingProcessingTime(self):
+    timedRoute = [
+      {'stationIdsList': ['M1'], 'processingTime': {'Fixed': {'mean': 1.5}}},
+      {'stationIdsList': ['M2']},
+      {'stationIdsList': ['M1'], 'processingTime': {'Fixed': {'mean': '2'}}},
+    ]
+    compiled = CompiledRoute(timedRoute)
+    self.assertEquals(compiled.remainingProcessingTimes, [3.5, 2, 2])
+    self.assertEquals(compiled.getRemainingProcessingTime(timedRoute[1:]), 2)
+    self.assertEquals(compiled.getRemainingProcessingTime([]), 0)
+    # a step inserted at the start of the remaining route is not in the table
+    insertedStep = dict(timedRoute[1])
+    self.assertEquals(compiled.getRemainingProcessingTime(
+      [insertedStep] + timedRoute[2:]), None)
+    self.assertEquals(compiled.getRemainingProcessingTime(timedRoute[:2]), None)
+
+  def testStations(self):
+    with SimulationContext() as context:
+      m1 = DummyObject('M1')
+      context.registry.register(m1)
+      compiled = CompiledRoute(route)
+      # the stations that do not exist are left out
+      self.assertEquals(compiled.getStations(route[1]), [m1])
+      self.assertEquals(compiled.getStations(route[0]), [])
+      self.assertEquals(compiled.getStations(dict(route[1])), None)
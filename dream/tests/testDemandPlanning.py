@@ -0,0 +1,234 @@
+# ===========================================================================
+# Copyright 2015 Dublin City University
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import random
+import sys
+import multiprocessing
+from unittest import TestCase
+
+from dream.simulation.applications.DemandPlanning.Globals import G
+from dream.simulation.applications.DemandPlanning.CapacityModel import CapacityModel
+from dream.simulation.applications.DemandPlanning.Allocation_ACO import Allocation_ACO
+from dream.simulation.applications.DemandPlanning.AllocationRoutine_ACO2 import PrefixCheckpoints
+from dream.simulation.applications.DemandPlanning.BatchEvaluation import BatchEvaluator
+from dream.simulation.applications.DemandPlanning.Allocation_3 import Allocation2
+from dream.simulation.applications.DemandPlanning.UtilisationCalculation import utilisationCalc1, utilisationCalc2
+
+week_list = [1, 2, 3, 4]
+bottleneck_list = ['B1', 'B2']
+route_dict = {
+  'MA1': {'B1': dict.fromkeys(week_list, 1.0)},
+  'MA2': {'B1': dict.fromkeys(week_list, 0.5), 'B2': dict.fromkeys(week_list, 1.0)},
+  'MA3': {'B2': dict.fromkeys(week_list, 2.0)},
+}
+item_list = [
+  {'orderID': 1, 'sp': 'SP1', 'MAlist': ['MA1', 'MA2'], 'Qty': 40, 'priority': 1},
+  {'orderID': 2, 'sp': 'SP1', 'MAlist': ['MA2', 'MA3'], 'Qty': 35, 'priority': 1},
+  {'orderID': 3, 'sp': 'SP2', 'MAlist': ['MA1', 'MA3'], 'Qty': 60, 'priority': 1},
+  {'orderID': 4, 'sp': 'SP2', 'MAlist': ['MA1', 'MA2', 'MA3'], 'Qty': 25, 'priority': 1},
+  {'orderID': 5, 'sp': 'SP1', 'MAlist': ['MA2', 'MA3'], 'Qty': 50, 'priority': 1},
+]
+
+# the results of the dict based Allocation2 and utilisationCalc1/2 (before the
+# capacity was kept in an array) for allocations at the demand week 2:
+# (ma, qty, weeks, incomplete batches of the ma), (remainingUnits, Allocation,
+# earliness, lateness, remUnits of the ma), utilisation, remaining capacity,
+# utilisationCalc1, utilisationCalc2
+allocation_list = [
+  (('MA2', 40, [2], 0),
+   (0, [{'units': 40, 'week': 2, 'ma': 'MA2'}], 0, 0, 0),
+   {'B1': {2: 0.2857142857142857}, 'B2': {2: 0.5}},
+   {'B1': {1: 65, 2: 50.0, 3: 75, 4: 80}, 'B2': {1: 75, 2: 40.0, 3: 85, 4: 90}},
+   (0.7544642857142857, -0.0), (0.2631657616640981, -0.0)),
+  (('MA3', 37, [2], 0),
+   (0, [{'units': 40, 'week': 2, 'ma': 'MA3'}], 0, 0, 3),
+   {'B2': {2: 1.0}},
+   {'B1': {1: 65, 2: 70, 3: 75, 4: 80}, 'B2': {1: 75, 2: 0.0, 3: 85, 4: 90}},
+   (0.8125, -0.25), (0.5412658773652742, -0.25)),
+  (('MA3', 37, [2], 3),
+   (0, [{'units': 35, 'week': 2, 'ma': 'MA3'}], 0, 0, 1),
+   {'B2': {2: 0.875}},
+   {'B1': {1: 65, 2: 70, 3: 75, 4: 80}, 'B2': {1: 75, 2: 10.0, 3: 85, 4: 90}},
+   (0.7734375, -0.25), (0.47360764269461486, -0.25)),
+  (('MA1', 100, [2, 1], 0),
+   (0, [{'units': 70.0, 'week': 2, 'ma': 'MA1'},
+        {'units': 30.0, 'week': 1, 'ma': 'MA1'}], 30.0, 0.0, 0),
+   {'B1': {1: 0.46153846153846156}},
+   {'B1': {1: 35.0, 2: 0.0, 3: 75, 4: 80}, 'B2': {1: 75, 2: 80, 3: 85, 4: 90}},
+   (0.6682692307692307, -0.25), (0.5150068578276094, -0.25)),
+  (('MA2', 200, [2, 1, 3], 0),
+   (0, [{'units': 80.0, 'week': 2, 'ma': 'MA2'},
+        {'units': 75.0, 'week': 1, 'ma': 'MA2'},
+        {'units': 45.0, 'week': 3, 'ma': 'MA2'}], 75.0, 45.0, 0),
+   {'B1': {3: 0.3}, 'B2': {3: 0.5294117647058824}},
+   {'B1': {1: 27.5, 2: 30.0, 3: 52.5, 4: 80}, 'B2': {1: 0.0, 2: 0.0, 3: 40.0, 4: 90}},
+   (0.26614010989010994, -1.0), (0.26615118729162107, -1.0)),
+]
+
+def double(x):
+  return 2 * x
+
+def evaluateInDaemon(noWorkers):
+  G.noWorkers = noWorkers
+  with BatchEvaluator(double) as evaluator:
+    return evaluator.evaluateBatch([(1,), (2,), (3,)]), evaluator.pool is None
+
+class DemandPlanningTestCase(TestCase):
+  """Runs the allocation on a small synthetic planning, set in G as
+  ImportInput would set it.
+  """
+
+  def setUp(self):
+    self.saved_state = dict((name, value) for (name, value) in vars(G).items()
+                            if not name.startswith('__'))
+    G.WeekList = list(week_list)
+    G.planningHorizon = len(week_list)
+    G.maxEarliness = 1
+    G.maxLateness = 1
+    G.minDeltaUt = 0
+    G.Bottlenecks = list(bottleneck_list)
+    G.Capacity = {}
+    for (i, bottleneck) in enumerate(bottleneck_list):
+      G.Capacity[bottleneck] = {}
+      for week in week_list:
+        G.Capacity[bottleneck][week] = {'OriginalCapacity': 60 + 10*i + 5*week,
+                                        'minUtilisation': 0.5,
+                                        'targetUtilisation': 0.8}
+    G.RouteDict = route_dict
+    G.BatchSize = dict((ma, dict.fromkeys(week_list, 5)) for ma in route_dict)
+    G.incompleteBatches = dict.fromkeys(route_dict, 0)
+    G.capacityModel = CapacityModel(G.Bottlenecks, G.WeekList, G.Capacity, G.RouteDict)
+    G.CurrentCapacity = G.capacityModel.originalCapacity.copy()
+    G.orders = {}
+    G.Earliness = {}
+    G.Lateness = {}
+    G.globalMAAllocation = {}
+    for week in week_list:
+      G.Earliness[week] = dict((ma, {'qty': [], 'earliness': []}) for ma in route_dict)
+      G.Lateness[week] = dict((ma, {'qty': [], 'lateness': []}) for ma in route_dict)
+    for ma in route_dict:
+      G.globalMAAllocation[ma] = dict((week, {'order': {1: 0}}) for week in week_list)
+    G.Excess = dict((sp, dict.fromkeys(week_list, 0)) for sp in ('SP1', 'SP2'))
+    G.OrderResults = []
+    G.noGen = 3
+    G.popSize = 6
+
+  def tearDown(self):
+    for name in vars(G).keys():
+      if not name.startswith('__') and name not in self.saved_state:
+        delattr(G, name)
+    for (name, value) in self.saved_state.items():
+      setattr(G, name, value)
+
+  def runACO(self, noWorkers):
+    G.noWorkers = noWorkers
+    G.CurrentCapacity = G.capacityModel.originalCapacity.copy()
+    G.incompleteBatches = dict.fromkeys(route_dict, 0)
+    itemList = [dict(item, Week=2, ppos=0, Customer=None) for item in item_list]
+    for item in itemList:
+      G.orders[item['orderID']] = item
+    G.OrderResults = []
+    random.seed(1)
+    ACOresults = Allocation_ACO(2, itemList, 'order', [])
+    return (ACOresults, G.OrderResults, G.CurrentCapacity.tolist(),
+            dict(G.incompleteBatches))
+
+  def testWorkers(self):
+    """The ants evaluated on a pool of workers give the same results, in the
+    same order, as when they are evaluated one after another.
+    """
+    self.assertEquals(self.runACO(1), self.runACO(3))
+
+  def testCheckpoints(self):
+    """The ants resuming from the checkpoints of their prefixes give the same
+    results as the ants allocating all the items.
+    """
+    G.ACOcheckpointsMaxBytes = 0
+    withoutCheckpoints = self.runACO(1)
+    G.ACOcheckpointsMaxBytes = 64 * 2**20
+    self.assertEquals(withoutCheckpoints, self.runACO(1))
+    # only some of the checkpoints fit
+    G.ACOcheckpointsMaxBytes = 2000
+    self.assertEquals(withoutCheckpoints, self.runACO(1))
+
+  def testCheckpointsSize(self):
+    checkpoints = PrefixCheckpoints(maxBytes=2000)
+    capacity = G.capacityModel.originalCapacity.copy()
+    node = checkpoints.root
+    depth = 0
+    while node is not None:
+      capacity = capacity.copy()
+      node = checkpoints.add(node, 'MA1', (0, capacity, {'MA1': 0}, 0, 0))
+      depth += 1
+    self.assertTrue(0 < checkpoints.size <= 2000)
+    self.assertEquals(depth - 1, checkpoints.find(['MA1'] * depth)[0])
+    # the capacity and incomplete batches of an item that is not allocated are
+    # the ones of its parent, they are not counted again
+    checkpoints = PrefixCheckpoints(maxBytes=2000)
+    state = (0, capacity, {'MA1': 0}, 0, 0)
+    child = checkpoints.add(checkpoints.root, 'MA1', state)
+    size = checkpoints.size
+    checkpoints.add(child, 'MA2', state)
+    self.assertEquals(size - sys.getsizeof(capacity) - sys.getsizeof(state[2]),
+                      checkpoints.size - size)
+
+  def testDaemonicProcess(self):
+    """A daemonic process, which cannot have children, evaluates the
+    candidates itself.
+    """
+    pool = multiprocessing.Pool(1)
+    try:
+      self.assertEquals(([2, 4, 6], True), pool.apply(evaluateInDaemon, (3,)))
+    finally:
+      pool.close()
+      pool.join()
+
+  def testCapacityModel(self):
+    model = G.capacityModel
+    self.assertEquals({'B1': {1: 65, 2: 70, 3: 75, 4: 80},
+                       'B2': {1: 75, 2: 80, 3: 85, 4: 90}},
+                      model.toDict(model.originalCapacity))
+    self.assertEquals(80, model.get(model.originalCapacity, 'B2', 2))
+    self.assertEquals([0.5, 1.0], list(model.getRouteLoad('MA2', 2)))
+    self.assertEquals([2.0], list(model.getRouteLoad('MA3', 4)))
+    capacity = model.originalCapacity.copy()
+    capacity[model.bottleneckIndex['B1'], model.weekIndex[3]] = 60
+    self.assertEquals(0.2, model.getUtilisation(capacity)[0, 2])
+
+  def testAllocation(self):
+    """Allocation2 and utilisationCalc1/2 give the results of the dict based
+    implementation, and do not change the capacity they are given.
+    """
+    for (call, result, utilisation, capacity, util1, util2) in allocation_list:
+      ma, qty, weekList, incompleteBatches = call
+      inBatches = dict(G.incompleteBatches)
+      inBatches[ma] = incompleteBatches
+      Results = Allocation2(ma, qty, weekList, G.CurrentCapacity, inBatches,
+                            0, 0, [], 2)
+      self.assertEquals(result, (Results['remainingUnits'], Results['Allocation'],
+                                 Results['earliness'], Results['lateness'],
+                                 Results['remUnits'][ma]))
+      self.assertEquals(utilisation, Results['utilisation'])
+      self.assertEquals(capacity, G.capacityModel.toDict(Results['remainingCap']))
+      for (expected, value) in zip(util1 + util2,
+          utilisationCalc1(Results['remainingCap'], 2, 1) +
+          utilisationCalc2(Results['remainingCap'], 2, 1)):
+        self.assertAlmostEquals(expected, value, places=12)
+      self.assertEquals(G.capacityModel.originalCapacity.tolist(),
+                        G.CurrentCapacity.tolist())
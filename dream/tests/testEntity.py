@@ -0,0 +1,46 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from unittest import TestCase
+
+from dream.simulation.Part import Part
+from dream.simulation.Batch import Batch
+from dream.simulation.SubBatch import SubBatch
+
+class EntityTestCase(TestCase):
+
+  def testSlots(self):
+    batch = Batch('B1', 'Batch1', numberOfUnits=4)
+    for entity in (Part('P1', 'Part1'), batch,
+                   SubBatch('SB1', 'SubBatch1', numberOfUnits=2, parentBatch=batch)):
+      # the attributes are in the slots, the instance dict is left empty
+      self.assertEquals(entity.__dict__, {})
+      self.assertEquals(entity.schedule, [])
+      self.assertEquals(entity.schedulingKeyCache, None)
+    self.assertEquals(batch.subBatchList[0].batchId, 'B1')
+
+  def testExtraAttributes(self):
+    part = Part('P1', 'Part1')
+    part.readyForAssembly = 1
+    self.assertEquals(part.__dict__, {'readyForAssembly': 1})
+    # the candidateReceivers are created when first used
+    part.candidateReceivers.append('M1')
+    self.assertEquals(part.candidateReceivers, ['M1'])
+    part.candidateReceivers = []
+    self.assertEquals(part.candidateReceivers, [])
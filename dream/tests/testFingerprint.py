@@ -0,0 +1,48 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from unittest import TestCase
+
+import numpy
+
+from dream.simulation.Fingerprint import fingerprint, resultFingerprint, FingerprintSet
+
+class FingerprintTestCase(TestCase):
+
+  def testCanonical(self):
+    first = {'Q1': 'EDD', 'Q2': 'FIFO', 'nested': {'a': [1, 2], 'b': set([3])}}
+    second = {'nested': {'b': set([3]), 'a': [1, 2]}, 'Q2': 'FIFO', 'Q1': 'EDD'}
+    self.assertEquals(fingerprint(first), fingerprint(second))
+    self.assertNotEquals(fingerprint(first), fingerprint(dict(first, Q1='LPT')))
+    # numpy scalars are fingerprinted as the python ones
+    self.assertEquals(fingerprint(list(numpy.array([3, 1, 2]))), fingerprint([3, 1, 2]))
+
+  def testResultFingerprint(self):
+    result = {'general': {'totalExecutionTime': 0.5}, 'elementList': [{'id': 'E1'}]}
+    other_run = {'general': {'totalExecutionTime': 0.7}, 'elementList': [{'id': 'E1'}]}
+    self.assertEquals(resultFingerprint(result), resultFingerprint(other_run))
+    self.assertNotEquals(fingerprint(result), fingerprint(other_run))
+
+  def testFingerprintSet(self):
+    tested = FingerprintSet(excludedKeys=['antID'])
+    self.assertTrue(tested.add({1: 'MA1', 2: 'MA2', 'antID': 1}))
+    self.assertFalse(tested.add({2: 'MA2', 1: 'MA1'}))
+    self.assertTrue({1: 'MA1', 2: 'MA2', 'antID': 5} in tested)
+    self.assertFalse({1: 'MA2', 2: 'MA2'} in tested)
+    self.assertEquals(len(tested), 1)
@@ -0,0 +1,107 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import time
+import shutil
+import tempfile
+from unittest import TestCase
+
+from dream.platform.jobs import JobStore, JobQueue, FINISHED, FAILED, CANCELLED
+
+def add(parameter_dict, progress=None):
+  for i in range(3):
+    progress(i + 1, 3, 'step %s' % i)
+  return dict(success=True, data=parameter_dict['a'] + parameter_dict['b'])
+
+def wait(parameter_dict, progress=None):
+  time.sleep(parameter_dict['seconds'])
+  return dict(success=True, data=None)
+
+def fail(parameter_dict, progress=None):
+  raise ValueError("failed in the job")
+
+def report(parameter_dict, progress=None):
+  # reports its progress as fast as it can
+  for i in xrange(parameter_dict['steps']):
+    progress(i, parameter_dict['steps'])
+  return dict(success=True, data=None)
+
+class JobQueueTestCase(TestCase):
+
+  def setUp(self):
+    self.path = tempfile.mkdtemp()
+    self.queue = JobQueue(JobStore(self.path),
+                          dict(add=add, wait=wait, fail=fail, report=report))
+
+  def tearDown(self):
+    self.queue.close()
+    shutil.rmtree(self.path)
+
+  def waitForJob(self, job_id, timeout=10):
+    end = time.time() + timeout
+    while time.time() < end:
+      job = self.queue.store.get(job_id)
+      if job['finished']:
+        return job
+      time.sleep(0.01)
+    self.fail("job %s did not finish" % job_id)
+
+  def test_result(self):
+    job_id = self.queue.submit('add', dict(a=1, b=2))
+    job = self.waitForJob(job_id)
+    self.assertEqual(FINISHED, job['status'])
+    self.assertEqual(dict(done=3, total=3, message='step 2'), job['progress'])
+    self.assertEqual(dict(success=True, data=3),
+                     self.queue.store.getResult(job_id))
+
+  def test_failure(self):
+    job = self.waitForJob(self.queue.submit('fail', {}))
+    self.assertEqual(FAILED, job['status'])
+    self.assertTrue('failed in the job' in job['error'])
+
+  def test_cancel(self):
+    running_id = self.queue.submit('wait', dict(seconds=30))
+    queued_id = self.queue.submit('add', dict(a=1, b=2))
+    self.assertEqual(CANCELLED, self.queue.cancel(queued_id)['status'])
+    while self.queue.store.get(running_id)['status'] != 'running':
+      time.sleep(0.01)
+    self.queue.cancel(running_id)
+    job = self.waitForJob(running_id)
+    self.assertEqual(CANCELLED, job['status'])
+    self.assertEqual(None, self.queue.store.getResult(running_id))
+    # the queue is free again
+    self.assertEqual(FINISHED,
+      self.waitForJob(self.queue.submit('add', dict(a=1, b=2)))['status'])
+    self.assertEqual(CANCELLED, self.queue.store.get(queued_id)['status'])
+
+  def test_cancel_while_reporting_progress(self):
+    job_id = self.queue.submit('report', dict(steps=10 ** 6))
+    while self.queue.store.get(job_id)['progress']['done'] == 0:
+      time.sleep(0.01)
+    self.queue.cancel(job_id)
+    # the progress of the job does not bring back its status
+    job = self.waitForJob(job_id)
+    time.sleep(0.1)
+    self.assertEqual(CANCELLED, self.queue.store.get(job_id)['status'])
+    self.assertEqual(None, self.queue.store.getResult(job_id))
+
+  def test_unknown_job(self):
+    self.assertEqual(None, self.queue.store.get('unknown'))
+    self.assertEqual(None, self.queue.store.get('../etc'))
+    self.assertRaises(KeyError, self.queue.submit, 'unknown', {})
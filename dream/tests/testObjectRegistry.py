@@ -0,0 +1,52 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation.Globals import G, findObjectById
+from dream.simulation.Queue import Queue
+from dream.simulation.Part import Part
+from dream.simulation.Exit import Exit
+from unittest import TestCase
+
+class ObjectRegistryTestCase(TestCase):
+  def setUp(self):
+    G.registry.clear()
+
+  def testRegisterOnConstruction(self):
+    queue = Queue('registry_Q1', 'Queue')
+    part = Part('registry_P1', 'Part')
+    self.assertTrue(findObjectById('registry_Q1') is queue)
+    self.assertTrue(findObjectById('registry_P1') is part)
+    self.assertTrue(G.registry.find('registry_P1', category='Entity') is part)
+    self.assertEquals(G.registry.find('registry_P1', category='CoreObject'), None)
+    self.assertEquals(findObjectById('missing'), None)
+
+  def testCategoryOrder(self):
+    # core objects are found before entities with the same id
+    part = Part('registry_same', 'Part')
+    queue = Queue('registry_same', 'Queue')
+    self.assertTrue(findObjectById('registry_same') is queue)
+    G.registry.clear('CoreObject')
+    self.assertTrue(findObjectById('registry_same') is part)
+
+  def testExitClear(self):
+    part = Part('registry_P2', 'Part')
+    G.EntityList.append(part)
+    Exit.clear(part)
+    self.assertEquals(findObjectById('registry_P2'), None)
+    self.assertFalse(part in G.EntityList)
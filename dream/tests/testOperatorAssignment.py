@@ -0,0 +1,81 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import random
+from unittest import TestCase
+
+from dream.simulation.OperatorAssignment import OperatorAssignment
+from dream.simulation.opAss_LPmethod import opAss_LP
+
+def randomInstance(rnd):
+  machineList = {}
+  for i in range(rnd.randint(1, 5)):
+    machineList['M%d' % i] = {'stationID': 'M%d' % i,
+                              'WIP': rnd.choice([0, 1, 2, 3.5, rnd.random()]),
+                              'lastAssignment': rnd.choice([0, rnd.random() * 10])}
+  PBlist = ['O%d' % i for i in range(rnd.randint(1, 4))]
+  PBskills = {}
+  previousAssignment = {}
+  for operator in PBlist:
+    PBskills[operator] = [mach for mach in sorted(machineList) if rnd.random() < 0.7]
+    if PBskills[operator] and rnd.random() < 0.5:
+      previousAssignment[operator] = rnd.choice(PBskills[operator])
+  weightFactors = rnd.choice([[2, 1, 0, 2, 1, 1], [2, 1, 2, 2, 1, 1],
+                              [1, 3, 1, 0, 0.5, 0], [0, 2, 0, 0, 0, 1]])
+  return machineList, PBlist, PBskills, previousAssignment, weightFactors
+
+class OperatorAssignmentTestCase(TestCase):
+
+  def testSameSolutionAsLP(self):
+    rnd = random.Random(1)
+    engine = OperatorAssignment()
+    for i in range(60):
+      machineList, PBlist, PBskills, previousAssignment, weightFactors = randomInstance(rnd)
+      solution = engine.solveFast(machineList, PBlist, PBskills, previousAssignment, weightFactors)
+      if solution is not None:
+        self.assertEqual(solution, opAss_LP(machineList, PBlist, PBskills,
+              previousAssignment=previousAssignment, weightFactors=weightFactors))
+
+  def testTieIsLeftToLP(self):
+    # two identical operators, either of them can be assigned
+    machineList = {'M1': {'stationID': 'M1', 'WIP': 1, 'lastAssignment': 0}}
+    engine = OperatorAssignment()
+    self.assertEqual(None, engine.solveFast(machineList, ['O1', 'O2'],
+          {'O1': ['M1'], 'O2': ['M1']}, {}, [2, 1, 0, 2, 1, 1]))
+
+  def testSublineIsLeftToLP(self):
+    machineList = {'St0_M0': {'stationID': 0, 'machineID': 0, 'WIP': 1, 'lastAssignment': 0}}
+    engine = OperatorAssignment()
+    self.assertEqual(None, engine.solveFast(machineList, ['O1'], {'O1': [0]},
+                                            {}, [2, 1, 0, 2, 1, 1]))
+
+  def testCache(self):
+    machineList = {'M1': {'stationID': 'M1', 'WIP': 1.1, 'lastAssignment': 0},
+                   'M2': {'stationID': 'M2', 'WIP': 1.0, 'lastAssignment': 0}}
+    engine = OperatorAssignment(cacheSize=1)
+    solution = engine.solve(machineList, ['O1'], {'O1': ['M1', 'M2']})
+    self.assertEqual({'O1': 'M1'}, solution)
+    # the cached solution is not changed by the caller
+    solution['O1'] = 'M2'
+    self.assertEqual({'O1': 'M1'}, engine.solve(machineList, ['O1'], {'O1': ['M1', 'M2']}))
+    self.assertEqual((1, 1, 0), (engine.cacheHits, engine.fastSolutions, engine.LPSolutions))
+    # the least recently used solution is dropped
+    engine.solve(machineList, ['O1'], {'O1': ['M2']})
+    engine.solve(machineList, ['O1'], {'O1': ['M1', 'M2']})
+    self.assertEqual((1, 3), (engine.cacheHits, engine.fastSolutions))
@@ -0,0 +1,51 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from unittest import TestCase
+
+import simpy
+
+from dream.simulation.OperatorRouter import EndOfTimestep
+
+class EndOfTimestepTestCase(TestCase):
+
+  def testAfterSameTimeEvents(self):
+    env = simpy.Environment()
+    log = []
+
+    def chain(name, length):
+      # events at the same time, each one scheduled by the previous one
+      for i in range(length):
+        yield env.timeout(0)
+        log.append((env.now, name, i))
+      yield env.timeout(1)
+      log.append((env.now, name, length))
+
+    def router():
+      yield EndOfTimestep(env)
+      log.append((env.now, 'router', None))
+
+    env.process(router())
+    env.process(chain('a', 3))
+    env.process(chain('b', 1))
+    env.run()
+    # the router runs once, after all the events of time 0 and before time 1
+    self.assertEquals(log, [(0, 'a', 0), (0, 'b', 0), (0, 'a', 1),
+                            (0, 'a', 2), (0, 'router', None),
+                            (1, 'b', 1), (1, 'a', 3)])
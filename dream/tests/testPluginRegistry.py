@@ -0,0 +1,51 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from copy import copy
+import json
+import os
+from unittest import TestCase
+
+from dream.plugins.plugin import Plugin, PluginRegistry
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+class PluginRegistryTestCase(TestCase):
+
+  def test_input_not_modified(self):
+    file_path = os.path.join(project_path, "dream", "plugins",
+                             "testModels", "GUICapacityProject07.json")
+    input_file = open(file_path, "r")
+    input_data = json.loads(input_file.read())
+    input_file.close()
+    data = json.loads(json.dumps(input_data))
+    PluginRegistry(None, data).run(data)
+    self.assertEqual(input_data, data)
+
+  def test_copyOnWrite(self):
+    data = dict(graph=dict(node=dict(Q1=dict(schedulingRule='FIFO'),
+                                     Q2=dict(schedulingRule='FIFO')),
+                           edge={}))
+    ant_data = copy(data)
+    Plugin(None, {}).copyOnWrite(ant_data, 'graph', 'node', 'Q1')['schedulingRule'] = 'EDD'
+    self.assertEqual('FIFO', data['graph']['node']['Q1']['schedulingRule'])
+    self.assertEqual('EDD', ant_data['graph']['node']['Q1']['schedulingRule'])
+    # the subtrees that were not modified are shared
+    self.assertTrue(ant_data['graph']['node']['Q2'] is data['graph']['node']['Q2'])
+    self.assertTrue(ant_data['graph']['edge'] is data['graph']['edge'])
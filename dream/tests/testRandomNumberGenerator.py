@@ -17,8 +17,10 @@
 # along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
 # ===========================================================================
 
-from dream.simulation.RandomNumberGenerator import RandomNumberGenerator
+from dream.simulation.RandomNumberGenerator import RandomNumberGenerator, RandomStreams
+from dream.simulation.SimulationContext import SimulationContext
 from unittest import TestCase
+import simpy
 
 from dream.simulation.Source import Source
 obj = Source(id='dummy_obj', name="Dummy obj to instanciate RNG")
@@ -84,3 +86,90 @@ class RandomNumberGeneratorTestCase(TestCase):
         self.assertRaises(ValueError, RandomNumberGenerator,
             obj, distribution='Unknown')
 
+
+    def sampleVectorised(self, distribution, count=100, seed=1):
+        context = SimulationContext()
+        context.vectorisedRandomNumbers = True
+        context.randomNumberBlockSize = 32
+        with context:
+            context.env = simpy.Environment()
+            context.numpyRnd.random.seed(seed)
+            rng = RandomNumberGenerator(obj, distribution=distribution)
+            return [rng.generateNumber() for i in range(count)]
+
+    def testVectorisedReproducible(self):
+        distribution = {'Exp': {'mean': 10}}
+        number_list = self.sampleVectorised(distribution)
+        self.assertEquals(number_list, self.sampleVectorised(distribution))
+        self.assertNotEquals(number_list,
+                             self.sampleVectorised(distribution, seed=2))
+        self.assertEquals(len(set(number_list)), 100)
+
+    def testVectorisedTruncated(self):
+        for number in self.sampleVectorised({'Normal':
+            {'min': 0, 'max': 3, 'stdev': 2, 'mean': 2}}):
+            self.assertTrue(0 <= number <= 3)
+        for number in self.sampleVectorised({'Cauchy':
+            {'location': 0, 'scale': 1}}):
+            self.assertTrue(number > 0)
+        for number in self.sampleVectorised({'Triangular':
+            {'min': 1, 'max': 3, 'mean': 2}}):
+            self.assertTrue(1 <= number <= 3)
+
+    def sampleStreams(self, generator_list, count=20, seed=1, replication=0):
+        context = SimulationContext()
+        context.commonRandomNumbers = True
+        with context:
+            context.env = simpy.Environment()
+            context.randomStreams = RandomStreams(seed, replication)
+            sample_list = []
+            for rng, number in generator_list:
+                sample_list.append([rng.generateNumber() for i in range(number)])
+            return sample_list
+
+    def testCommonRandomNumbers(self):
+        other_obj = Source(id='other_obj', name="Other obj")
+        distribution = {'Exp': {'mean': 10}}
+        def generators(obj_count=5, other_count=5):
+            return [(RandomNumberGenerator(obj, distribution,
+                                           purpose='processing'), obj_count),
+                    (RandomNumberGenerator(other_obj, distribution,
+                                           purpose='processing'), other_count),
+                    (RandomNumberGenerator(obj, distribution,
+                                           purpose='setup'), 5)]
+        obj_sample, other_sample, setup_sample = self.sampleStreams(generators())
+        # every object and purpose has its own stream
+        self.assertNotEquals(obj_sample, other_sample)
+        self.assertNotEquals(obj_sample, setup_sample)
+        # more numbers drawn by an object do not shift the numbers of the others
+        more_obj_sample, more_other_sample, more_setup_sample = \
+            self.sampleStreams(generators(obj_count=50))
+        self.assertEquals(more_obj_sample[:5], obj_sample)
+        self.assertEquals(more_other_sample, other_sample)
+        self.assertEquals(more_setup_sample, setup_sample)
+        # the streams depend on the seed and on the replication
+        self.assertNotEquals(self.sampleStreams(generators(), seed=2)[0],
+                             obj_sample)
+        self.assertNotEquals(self.sampleStreams(generators(), replication=1)[0],
+                             obj_sample)
+
+    def testGeneratorPerOperation(self):
+        # a MachineJobShop builds a generator for every operation, they go on
+        # with the block of the first one instead of drawing a new block
+        distribution = {'Exp': {'mean': 10}}
+        for (vectorised, common) in ((True, False), (False, True), (True, True)):
+            def sample(generator_count, count=40):
+                context = SimulationContext()
+                context.vectorisedRandomNumbers = vectorised
+                context.commonRandomNumbers = common
+                context.randomNumberBlockSize = 32
+                with context:
+                    context.env = simpy.Environment()
+                    context.numpyRnd.random.seed(1)
+                    context.randomStreams = RandomStreams(1, 0)
+                    rng_list = [RandomNumberGenerator(obj, dict(distribution),
+                                                      purpose='processing')
+                                for i in range(generator_count)]
+                    return [rng_list[i % generator_count].generateNumber()
+                            for i in range(count)]
+            self.assertEquals(sample(1), sample(40))
@@ -0,0 +1,107 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from dream.plugins import cache
+from dream.plugins.cache import ScenarioCache, configureScenarioCache
+from dream.plugins.plugin import ExecutionPlugin
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+class ScenarioCacheTestCase(TestCase):
+
+  def setUp(self):
+    self.saved_cache = cache.scenario_cache
+
+  def tearDown(self):
+    cache.scenario_cache = self.saved_cache
+
+  def test_key(self):
+    scenario_cache = ScenarioCache()
+    data = dict(general=dict(seed=1), graph=dict(node=dict(a=1, b=2)))
+    key = scenario_cache.getKey(data)
+    # the key does not depend on the order of the keys nor on the result
+    self.assertEqual(key, scenario_cache.getKey(dict(
+      result=dict(result_list=[1]),
+      graph=dict(node=dict(b=2, a=1)), general=dict(seed=1))))
+    self.assertNotEqual(key, scenario_cache.getKey(dict(
+      general=dict(seed=2), graph=dict(node=dict(a=1, b=2)))))
+    # unseeded scenarios are not cached
+    self.assertEqual(None, scenario_cache.getKey(dict(general=dict(seed=''))))
+    # nor the scenarios whose traces are kept in files
+    self.assertEqual(None, scenario_cache.getKey(dict(general=dict(
+      seed=1, trace='Yes', traceDirectory='/tmp/traces'))))
+    # the results of another version of the code are not used
+    self.assertNotEqual(key, ScenarioCache(version='other').getKey(data))
+    self.assertEqual(cache.getCodeVersion(), cache.getCodeVersion())
+
+  def test_lru(self):
+    scenario_cache = ScenarioCache(max_size=2)
+    scenario_cache.set('a', '1')
+    scenario_cache.set('b', '2')
+    self.assertEqual('1', scenario_cache.get('a'))
+    scenario_cache.set('c', '3')
+    # b was the least recently used
+    self.assertEqual(None, scenario_cache.get('b'))
+    self.assertEqual('1', scenario_cache.get('a'))
+    self.assertEqual('3', scenario_cache.get('c'))
+    self.assertEqual((3, 1), (scenario_cache.hits, scenario_cache.misses))
+
+  def test_disk(self):
+    path = tempfile.mkdtemp()
+    try:
+      ScenarioCache(max_size=0, path=path).set('a', '1')
+      self.assertEqual('1', ScenarioCache(path=path).get('a'))
+    finally:
+      shutil.rmtree(path)
+
+  def test_disk_size(self):
+    path = tempfile.mkdtemp()
+    try:
+      scenario_cache = ScenarioCache(max_size=0, path=path, max_disk_size=2)
+      scenario_cache.set('a', '1')
+      scenario_cache.set('b', '2')
+      os.utime(os.path.join(path, 'a.json'), (1, 1))
+      os.utime(os.path.join(path, 'b.json'), (2, 2))
+      # a is used again, so b is the least recently used
+      self.assertEqual('1', scenario_cache.get('a'))
+      scenario_cache.set('c', '3')
+      self.assertEqual(['a.json', 'c.json'], sorted(os.listdir(path)))
+      self.assertEqual(None, scenario_cache.get('b'))
+    finally:
+      shutil.rmtree(path)
+
+  def test_runOneScenario(self):
+    scenario_cache = configureScenarioCache()
+    file_path = os.path.join(project_path, "dream", "simulation",
+                             "JSONInputs", "Topology01.json")
+    input_file = open(file_path, "r")
+    data = json.loads(input_file.read())
+    input_file.close()
+    data['general']['seed'] = 1
+    plugin = ExecutionPlugin(None, {})
+    result = plugin.runOneScenario(data)
+    self.assertEqual(1, scenario_cache.misses)
+    self.assertEqual(result, plugin.runOneScenario(data))
+    self.assertEqual(1, scenario_cache.hits)
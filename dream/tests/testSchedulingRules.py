@@ -0,0 +1,99 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation import SchedulingRules
+from dream.simulation.SchedulingRules import sortByRules, \
+    registerSchedulingRule, AttributeRule, getSupportedSchedulingRules
+from dream.simulation.Queue import Queue
+from dream.simulation.Operator import Operator
+from unittest import TestCase
+
+def step(processingTime):
+  return {'processingTime': {'Fixed': {'mean': processingTime}}}
+
+class DummyEntity(object):
+  def __init__(self, id, dueDate, processingTimes):
+    self.id = id
+    self.dueDate = dueDate
+    self.priority = 0
+    self.remainingRoute = [step(p) for p in processingTimes]
+    self.schedulingKeyCache = {}
+
+class SchedulingRulesTestCase(TestCase):
+
+  def setUp(self):
+    self.entities = [DummyEntity('A', 10, [1, 2]),
+                     DummyEntity('B', 5, [3]),
+                     DummyEntity('C', 5, [1, 1, 1]),
+                     DummyEntity('D', 10, [2, 2])]
+
+  def ids(self, entity_list):
+    return [entity.id for entity in entity_list]
+
+  def testSupportedRules(self):
+    self.assertEquals(Queue.getSupportedSchedulingRules(),
+      ("FIFO", "Priority", "EDD", "EOD", "NumStages", "RPC", "LPT", "SPT",
+       "MS", "WINQ"))
+    self.assertEquals(Operator.getSupportedSchedulingRules(),
+      ("FIFO", "Priority", "WT", "EDD", "EOD", "NumStages", "RPC", "LPT",
+       "SPT", "MS", "WINQ"))
+
+  def testSingleRule(self):
+    entity_list = list(self.entities)
+    sortByRules(entity_list, ['FIFO'], None)
+    self.assertEquals(self.ids(entity_list), ['A', 'B', 'C', 'D'])
+    sortByRules(entity_list, ['RPC'], None)
+    self.assertEquals(self.ids(entity_list), ['D', 'A', 'B', 'C'])
+    sortByRules(entity_list, ['SPT'], None)
+    self.assertEquals(self.ids(entity_list), ['A', 'C', 'D', 'B'])
+
+  def testMultipleCriteria(self):
+    """One sort with a composite key gives the same order as sorting by each
+    criterion, from the last to the first.
+    """
+    criteria = ['EDD', 'NumStages', 'LPT']
+    expected = list(self.entities)
+    for criterion in reversed(criteria):
+      sortByRules(expected, [criterion], None)
+    entity_list = list(self.entities)
+    sortByRules(entity_list, criteria, None)
+    self.assertEquals(self.ids(entity_list), self.ids(expected))
+    self.assertEquals(self.ids(entity_list), ['C', 'B', 'D', 'A'])
+
+  def testKeyCache(self):
+    entity = self.entities[0]
+    rule = SchedulingRules.getSchedulingRule('RPC')
+    self.assertEquals(rule.cachedKey(entity, None), 3)
+    # the key is not computed again while the route does not change
+    entity.remainingRoute[1]['processingTime']['Fixed']['mean'] = 10
+    self.assertEquals(rule.cachedKey(entity, None), 3)
+    # but it is once the entity moved to its next step
+    entity.remainingRoute.pop(0)
+    self.assertEquals(rule.cachedKey(entity, None), 10)
+
+  def testRegisterRule(self):
+    registerSchedulingRule(AttributeRule('ById', 'id'))
+    try:
+      self.assertTrue('ById' in getSupportedSchedulingRules('Queue'))
+      entity_list = list(reversed(self.entities))
+      sortByRules(entity_list, ['ById'], None)
+      self.assertEquals(self.ids(entity_list), ['A', 'B', 'C', 'D'])
+    finally:
+      del SchedulingRules.schedulingRules['ById']
+      SchedulingRules.schedulingRuleNames.remove('ById')
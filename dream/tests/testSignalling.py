@@ -0,0 +1,66 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import random
+from unittest import TestCase
+
+import simpy
+
+from dream.simulation.SimulationContext import SimulationContext
+from dream.simulation.CoreObject import CoreObject
+from dream.simulation.ManPyObject import ExpectedSignals
+from dream.simulation.Queue import Queue
+
+def selectOneByOne(select, candidates):
+  candidates = list(candidates)
+  selected = []
+  while candidates:
+    selected.append(select(candidates))
+    candidates.remove(selected[-1])
+  return selected
+
+class SignallingTestCase(TestCase):
+
+  def testOrder(self):
+    rnd = random.Random(3)
+    context = SimulationContext()
+    with context:
+      context.env = simpy.Environment(initial_time=10)
+      station = Queue(id='Q0', name='Queue0')
+      station.env = context.env
+      for i in range(50):
+        candidates = []
+        for j in range(rnd.randint(1, 8)):
+          candidate = Queue(id='Q%d_%d' % (i, j), name='Queue')
+          # equal times of the candidates are frequent
+          candidate.timeLastEntityLeft = rnd.choice([0, 4, 10, 10, 7.5])
+          candidate.timeLastEntityEnded = rnd.choice([0, 4, 10, 10, 7.5])
+          candidates.append(candidate)
+        self.assertEquals(list(station.orderReceivers(candidates)),
+                          selectOneByOne(CoreObject.selectReceiver, candidates))
+        self.assertEquals(list(station.orderGivers(candidates)),
+                          selectOneByOne(CoreObject.selectGiver, candidates))
+
+  def testExpectedSignalsReset(self):
+    expectedSignals = ExpectedSignals({'isRequested': 1, 'canDispose': 0})
+    expectedSignals['canDispose'] = 1
+    expectedSignals['victimStartsProcess'] = 1
+    expectedSignals.reset()
+    self.assertEquals(expectedSignals, {'isRequested': 0, 'canDispose': 0,
+                                        'victimStartsProcess': 0})
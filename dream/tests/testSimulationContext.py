@@ -0,0 +1,93 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation.Globals import G
+from dream.simulation.SimulationContext import SimulationContext, getCurrentContext, ContextProxy
+from dream.simulation import LineGenerationJSON
+from unittest import TestCase
+import threading
+import json
+import os
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+def getStableResult(result):
+  result_data = json.loads(result)['result']['result_list'][0]
+  del result_data["general"]["totalExecutionTime"]
+  result_data["elementList"].sort(key=lambda x: x["id"])
+  return result_data
+
+class SimulationContextTestCase(TestCase):
+  def testIsolation(self):
+    previous_context = getCurrentContext()
+    G.maxSimTime = 10
+    with SimulationContext() as context:
+      self.assertTrue(getCurrentContext() is context)
+      self.assertEquals(G.maxSimTime, 0)
+      G.maxSimTime = 20
+      self.assertEquals(context.maxSimTime, 20)
+    self.assertTrue(getCurrentContext() is previous_context)
+    self.assertEquals(G.maxSimTime, 10)
+
+  def testConcurrentSimulations(self):
+    input_file = open(os.path.join(project_path, "dream", "simulation",
+                                   "JSONInputs", "Topology01.json"))
+    input_data = input_file.read()
+    input_file.close()
+    expected = getStableResult(LineGenerationJSON.main(input_data=input_data,
+                                               context=SimulationContext()))
+    result_list = []
+    def simulate():
+      result_list.append(getStableResult(LineGenerationJSON.main(
+                  input_data=input_data, context=SimulationContext())))
+    thread_list = [threading.Thread(target=simulate) for i in range(4)]
+    for thread in thread_list:
+      thread.start()
+    for thread in thread_list:
+      thread.join()
+    self.assertEquals(len(result_list), 4)
+    for result in result_list:
+      self.assertEquals(result, expected)
+
+  def testNoLookupThroughGPerEvent(self):
+    """The objects read the state of the run from their context while it
+    runs, the number of lookups through G does not grow with the simulation
+    time.
+    """
+    input_file = open(os.path.join(project_path, "dream", "simulation",
+                                   "JSONInputs", "Topology01.json"))
+    input_data = json.loads(input_file.read())
+    input_file.close()
+    lookup_list = []
+    getattr_ = ContextProxy.__getattr__
+    def countingGetattr(cls, name):
+      lookup_list.append(name)
+      return getattr_(cls, name)
+    count_list = []
+    ContextProxy.__getattr__ = countingGetattr
+    try:
+      for maxSimTime in (100, 1000):
+        input_data['general']['maxSimTime'] = maxSimTime
+        del lookup_list[:]
+        LineGenerationJSON.main(input_data=json.dumps(input_data),
+                                context=SimulationContext())
+        count_list.append(len(lookup_list))
+    finally:
+      ContextProxy.__getattr__ = getattr_
+    self.assertEquals(count_list[0], count_list[1])
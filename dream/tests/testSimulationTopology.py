@@ -18,6 +18,7 @@
 # ===========================================================================
 
 from dream.simulation import LineGenerationJSON
+from dream.simulation.SimulationContext import SimulationContext
 import json
 import os
 import glob
@@ -68,6 +69,78 @@ class SimulationTopology(TestCase):
     dump_file.close()
     self.assertEquals(stable_result, dump_result, "outputs are different")
 
+  def getReplicationsInput(self):
+    """Returns a line of a source, a machine with failures and an exit,
+    simulated for 4 replications.
+    """
+    return {
+      "general": {"numberOfReplications": 4, "seed": 1450, "maxSimTime": 50,
+                  "confidenceLevel": 0.5, "trace": "No"},
+      "graph": {
+        "node": {
+          "S1": {"_class": "Dream.Source", "name": "S1", "entity": "Dream.Part",
+                 "interArrivalTime": {"Exp": {"mean": 1.25}}},
+          "M1": {"_class": "Dream.Machine", "name": "M1",
+                 "processingTime": {"Exp": {"mean": 1.5}},
+                 "interruptions": {"failure": {"TTF": {"Exp": {"mean": 10}},
+                                               "TTR": {"Exp": {"mean": 2}}}}},
+          "E1": {"_class": "Dream.Exit", "name": "E1"}},
+        "edge": {
+          "con_11": {"_class": "Dream.Edge", "source": "S1", "destination": "M1"},
+          "con_24": {"_class": "Dream.Edge", "source": "M1", "destination": "E1"}}}}
+
+  def getExitThroughput(self, input_data, context=None):
+    result = LineGenerationJSON.main(input_data=json.dumps(input_data),
+                                     context=context)
+    result_data = json.loads(result)['result']['result_list'][0]
+    return [element for element in result_data["elementList"]
+            if element["id"] == "E1"][0]["results"]["throughput"]
+
+  def testParallelReplications(self):
+    """The replications give the same results whether they run one after
+    another or on a pool of processes.
+    """
+    input_data = self.getReplicationsInput()
+    result_list = []
+    for numberOfProcesses in (1, 3):
+      input_data['general']['numberOfProcesses'] = numberOfProcesses
+      result = LineGenerationJSON.main(input_data=json.dumps(input_data))
+      result_data = json.loads(result)['result']['result_list'][0]
+      del result_data["general"]["totalExecutionTime"]
+      result_data["elementList"].sort(key=lambda x: x["id"])
+      result_list.append(result_data)
+    self.assertEquals(result_list[0], result_list[1])
+    exit_results = [element for element in result_list[0]["elementList"]
+                    if element["id"] == "E1"][0]["results"]
+    self.assertEquals(len(exit_results["throughput"]), 4)
+    # every replication has its own random numbers
+    self.assertTrue(len(set(exit_results["throughput"])) > 1)
+
+  def testVectorisedReplications(self):
+    """The replications draw other vectorised random numbers, the same ones
+    in every run with the same seed.
+    """
+    input_data = self.getReplicationsInput()
+    input_data['general']['vectorisedRandomNumbers'] = 1
+    throughput = self.getExitThroughput(input_data)
+    self.assertEquals(len(throughput), 4)
+    self.assertTrue(len(set(throughput)) > 1)
+    self.assertEquals(throughput, self.getExitThroughput(input_data))
+
+  def testRandomNumberModesInOneContext(self):
+    """A run does not reuse the samplers of the previous runs of its
+    context, whatever their random number modes.
+    """
+    vectorised = self.getReplicationsInput()
+    vectorised['general']['vectorisedRandomNumbers'] = 1
+    common = self.getReplicationsInput()
+    common['general']['commonRandomNumbers'] = 1
+    expected = self.getExitThroughput(common, SimulationContext())
+    context = SimulationContext()
+    self.getExitThroughput(vectorised, context)
+    self.assertEquals(expected, self.getExitThroughput(common, context))
+    self.assertEquals(expected, self.getExitThroughput(common, context))
+
 # Automatically create a test method for every topology
 for filepath in glob.glob(os.path.join(project_path, "dream", "simulation",
                              "JSONInputs", "*.json")):
@@ -0,0 +1,88 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from unittest import TestCase
+
+from dream.simulation.SimulationContext import SimulationContext
+from dream.simulation.imports import Source, Queue, Machine, Exit
+from dream.simulation.Globals import runSimulation
+from dream.simulation.StopCondition import StopCondition, EntityCount, \
+      ConfidenceInterval, Predicate, getTCriticalValue
+
+class StopConditionTestCase(TestCase):
+
+  def run_single_server(self, maxSimTime=1440.0, processingTime={'Exp': {'mean': 0.25}}, **kw):
+    context = SimulationContext()
+    with context:
+      S = Source('S1', 'Source', interArrivalTime={'Fixed': {'mean': 0.5}}, entity='Dream.Part')
+      Q = Queue('Q1', 'Queue', capacity=1)
+      M = Machine('M1', 'Machine', processingTime=processingTime)
+      E = Exit('E1', 'Exit')
+      S.defineRouting(successorList=[Q])
+      Q.defineRouting(predecessorList=[S], successorList=[M])
+      M.defineRouting(predecessorList=[Q], successorList=[E])
+      E.defineRouting(predecessorList=[M])
+      runSimulation([S, Q, M, E], maxSimTime, **kw)
+      return E.numOfExits, context.maxSimTime
+
+  def testNoCondition(self):
+    self.assertEquals(self.run_single_server(), (2880, 1440.0))
+
+  def testEntityCount(self):
+    exits, end = self.run_single_server(stopConditions=[EntityCount(100)])
+    self.assertEquals(exits, 100)
+    self.assertTrue(end < 1440)
+
+  def testConfidenceInterval(self):
+    condition = ConfidenceInterval('lifespan', halfWidth=0.1)
+    exits, end = self.run_single_server(stopConditions=[condition], stopCheckInterval=10)
+    self.assertTrue(0 < end < 1440)
+    self.assertEquals(end % 10, 0)
+    self.assertTrue(condition.getHalfWidth() <= 0.1 * condition.getMean())
+
+  def testConfidenceIntervalSlowStart(self):
+    # no entity leaves the model before 30, the empty batches do not stop it
+    processingTime = {'Fixed': {'mean': 30}}
+    condition = ConfidenceInterval('throughput', halfWidth=0.1)
+    exits, end = self.run_single_server(100.0, processingTime, stopConditions=[condition])
+    self.assertEquals(end, 100)
+    # the batches are counted from the first exit on
+    condition = ConfidenceInterval('throughput', halfWidth=0.1)
+    exits, end = self.run_single_server(processingTime=processingTime,
+          stopConditions=[condition], stopCheckInterval=30)
+    self.assertTrue(30 < end < 1440)
+    self.assertTrue(exits >= 10)
+    self.assertTrue(condition.getMean() > 0)
+
+  def testPredicate(self):
+    exits, end = self.run_single_server(
+          stopConditions=[Predicate(lambda env: env.now >= 100)])
+    self.assertEquals(end, 100)
+
+  def testFromDict(self):
+    condition = StopCondition.fromDict({'type': 'EntityCount', 'target': 10, 'units': True})
+    self.assertTrue(isinstance(condition, EntityCount))
+    self.assertEquals((condition.target, condition.units), (10, True))
+    self.assertRaises(ValueError, StopCondition.fromDict, {'type': 'Unknown'})
+
+  def testTCriticalValue(self):
+    self.assertEquals(getTCriticalValue(0.95, 9), 2.262)
+    self.assertEquals(getTCriticalValue(0.95, 35), 2.042)
+    self.assertEquals(getTCriticalValue(0.95, 1000), 1.960)
+    self.assertRaises(ValueError, getTCriticalValue, 0.5, 10)
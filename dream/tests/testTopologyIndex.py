@@ -0,0 +1,65 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation.TopologyIndex import TopologyIndex
+from unittest import TestCase
+
+edges = {
+  'e1': {'source': 'D1', 'destination': 'Q2', '_class': 'Dream.Edge',
+         'data': {'entity': 'Part'}},
+  'e2': {'source': 'D1', 'destination': 'Q1', '_class': 'Dream.Edge',
+         'data': {'entity': 'Frame'}},
+  'e3': {'source': 'Q1', 'destination': 'E1', '_class': 'Dream.Edge'},
+  'e4': {'source': 'Q2', 'destination': 'E1', '_class': 'Dream.Edge'},
+  'e5': {'source': 'OP1', 'destination': 'Q1', '_class': 'Dream.Operator'},
+}
+
+class DummyObject(object):
+  def __init__(self, id):
+    self.id = id
+
+class TopologyIndexTestCase(TestCase):
+  def testSuccessors(self):
+    index = TopologyIndex(edges)
+    self.assertEquals(index.getSuccessorList('D1'), ['Q1', 'Q2'])
+    self.assertEquals(index.getSuccessorList('D1', entity='Part'), ['Q2'])
+    self.assertEquals(index.getSuccessorList('D1', entity='Frame'), ['Q1'])
+    self.assertEquals(index.getSuccessorList('E1'), [])
+
+  def testPredecessors(self):
+    index = TopologyIndex(edges)
+    self.assertEquals(index.getPredecessorList('E1'), ['Q1', 'Q2'])
+    self.assertEquals(index.getPredecessorList('Q1'), ['D1', 'OP1'])
+    self.assertEquals(index.getPredecessorList('Q1',
+                      edge_class='Dream.Operator'), ['OP1'])
+
+  def testPredicate(self):
+    index = TopologyIndex(edges)
+    predicate = lambda source, destination, edge_class, edge_data: \
+                  source == 'D1' and destination == 'Q1'
+    self.assertEquals(index.getSuccessorList('D1', predicate=predicate), ['Q1'])
+    self.assertEquals(index.getPredecessorList('Q1', predicate=predicate), ['D1'])
+
+  def testObjects(self):
+    index = TopologyIndex(edges)
+    first, duplicate, other = DummyObject('Q1'), DummyObject('Q1'), DummyObject('E1')
+    index.indexObjects([first, duplicate, other])
+    self.assertTrue(index.getObject('Q1') is first)
+    self.assertEquals(index.getObject('missing'), None)
+    self.assertEquals(index.getObjects(['E1', 'missing', 'Q1']), [other, first])
@@ -0,0 +1,141 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import os
+import json
+import shutil
+import tempfile
+from unittest import TestCase
+
+import xlrd
+
+from dream.simulation.TraceSink import FileTraceSink, MemoryTraceSink, \
+    RouteTable, TRACE_FORMATS, readTrace, readRoute, exportToExcel
+from dream.simulation.LineGenerationJSON import main as simulate_line_json
+from dream.simulation.SimulationContext import SimulationContext
+from dream.plugins.ParseTraceFile import ParseTraceFile
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+record_list = [(0.0, 'M1', 'Part1', 'enter', 'got into Machine1'),
+               (1.5, 'M1', u'Pi\xe8ce2', 'release', u'released Machine\xe9')]
+
+class TraceSinkTestCase(TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def writeRecords(self, sink):
+    for record in record_list:
+      sink.write(*record)
+    route = RouteTable()
+    route.write(0, 0, 'Time/Machines')
+    route.write_merge(0, 0, 1, 3, 'M1')
+    sink.writeRoute(route)
+
+  def testFileFormats(self):
+    memory_sink = MemoryTraceSink()
+    self.writeRecords(memory_sink)
+    for trace_format in TRACE_FORMATS:
+      path = os.path.join(self.directory, 'trace.' + trace_format)
+      sink = FileTraceSink(path, trace_format, bufferSize=1)
+      self.writeRecords(sink)
+      sink.close()
+      self.assertEquals(list(readTrace(path, trace_format)),
+                        memory_sink.readRecords())
+      route = readRoute(sink.routePath, trace_format)
+      self.assertEquals(route.cells, {(0, 0): 'Time/Machines'})
+      self.assertEquals(route.merges, [(0, 0, 1, 3, 'M1')])
+
+  def testExportToExcel(self):
+    sink = MemoryTraceSink()
+    self.writeRecords(sink)
+    path = os.path.join(self.directory, 'trace.xls')
+    exportToExcel(sink.readRecords(), sink.route).save(path)
+    book = xlrd.open_workbook(path)
+    self.assertEquals(book.sheet_names(), ['sheet 1', 'sheet 2 route'])
+    self.assertEquals(book.sheet_by_index(0).row_values(1),
+                      ['1.5', u'Pi\xe8ce2', u'released Machine\xe9'])
+
+  def testSimulationTrace(self):
+    with open(os.path.join(project_path, 'dream', 'simulation', 'JSONInputs',
+                           'WipInMachineJobShop1.json')) as f:
+      data = json.load(f)
+    data['general']['trace'] = 'Yes'
+    data['general']['traceDirectory'] = self.directory
+    result = json.loads(simulate_line_json(input_data=json.dumps(data),
+                                           context=SimulationContext()))
+    trace, = [element['results'] for element in
+              result['result']['result_list'][-1]['elementList']
+              if element['id'] == 'TraceFile']
+    self.assertEquals((trace['version'], trace['format']), (2, 'csv.gz'))
+    record_list = list(readTrace(trace['path'], trace['format']))
+    self.assertTrue(record_list)
+    self.assertTrue(all(record['kind'] for record in record_list))
+    self.assertTrue(os.path.exists(trace['routePath']))
+
+    # an other run keeps its trace in its own files of the directory
+    other_result = json.loads(simulate_line_json(input_data=json.dumps(data),
+                                                 context=SimulationContext()))
+    other_trace, = [element['results'] for element in
+                    other_result['result']['result_list'][-1]['elementList']
+                    if element['id'] == 'TraceFile']
+    self.assertNotEquals(other_trace['path'], trace['path'])
+    self.assertNotEquals(other_trace['routePath'], trace['routePath'])
+    self.assertEquals(list(readTrace(trace['path'], trace['format'])),
+                      record_list)
+
+    # the trace is converted to excel by the plugin
+    ParseTraceFile(None, {'output_id': 'trace'}).postprocess(result)
+    trace_file = result['result']['result_list'][-1]['trace']
+    self.assertEquals(trace_file['name'], 'Trace.xls')
+    book = xlrd.open_workbook(file_contents=trace_file['data'].decode('base64'))
+    self.assertEquals(book.sheet_by_index(0).nrows, len(record_list))
+
+  def testEncodedSimulationTrace(self):
+    with open(os.path.join(project_path, 'dream', 'simulation', 'JSONInputs',
+                           'WipInMachineJobShop1.json')) as f:
+      data = json.load(f)
+    data['general']['trace'] = 'Yes'
+    data['general']['traceFormat'] = 'jsonl'
+    result = json.loads(simulate_line_json(input_data=json.dumps(data),
+                                           context=SimulationContext()))
+    trace, = [element['results'] for element in
+              result['result']['result_list'][-1]['elementList']
+              if element['id'] == 'TraceFile']
+    self.assertEquals((trace['version'], trace['format']), (2, 'jsonl'))
+    self.assertTrue(trace['data'])
+    ParseTraceFile(None, {'output_id': 'trace',
+                          'export_format': 'raw'}).postprocess(result)
+    trace_file = result['result']['result_list'][-1]['trace']
+    self.assertEquals((trace_file['name'], trace_file['data']),
+                      ('Trace.jsonl', trace['data']))
+
+  def testUnversionedTraceResults(self):
+    # the results of the simulations that encoded the excel file of the trace
+    result = {'result': {'result_list': [{'elementList': [
+      {'id': 'TraceFile', 'results': {'trace': 'ZXhjZWw=\n'}}]}]}}
+    ParseTraceFile(None, {'output_id': 'trace'}).postprocess(result)
+    self.assertEquals(result['result']['result_list'][-1]['trace'],
+                      {'name': 'Trace.xls',
+                       'mime_type': 'application/vnd.ms-excel',
+                       'data': 'ZXhjZWw=\n'})
@@ -0,0 +1,75 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import logging
+from unittest import TestCase
+
+import simpy
+
+from dream.simulation.Tracing import Tracer
+from dream.simulation.SimulationContext import SimulationContext
+from dream.simulation.Queue import Queue
+
+class TracingTestCase(TestCase):
+
+  def trace(self, tracer):
+    context = SimulationContext()
+    with context:
+      context.env = simpy.Environment()
+      context.tracer = tracer
+      queue = Queue(id='Q1', name='Queue1')
+      other_queue = Queue(id='Q2', name='Queue2')
+      queue.printTrace('Part1', enter='Queue1')
+      queue.printTrace(queue.id, signalGiver='Machine1')
+      other_queue.printTrace('Part2', enter='Queue2')
+      return queue.isTraced('entity'), queue.isTraced('signal')
+
+  def testDisabled(self):
+    tracer = Tracer(output='ringBuffer')
+    self.assertEquals(self.trace(tracer), (False, False))
+    self.assertEquals(tracer.getMessages(), [])
+
+  def testRingBuffer(self):
+    tracer = Tracer(enabled=True, output='ringBuffer', bufferSize=2)
+    self.trace(tracer)
+    message_list = tracer.getMessages()
+    # only the last messages are kept
+    self.assertEquals(len(message_list), 2)
+    self.assertTrue(message_list[0].startswith('0 Q1 ____'))
+    self.assertTrue(message_list[1].startswith('0 Part2 got into Queue2 ='))
+
+  def testFilters(self):
+    tracer = Tracer(enabled=True, output='ringBuffer', level=logging.INFO)
+    self.assertEquals(self.trace(tracer), (True, False))
+    self.assertEquals(len(tracer.getMessages()), 2)
+    tracer = Tracer(enabled=True, output='ringBuffer', categories=['signal'])
+    self.assertEquals(self.trace(tracer), (False, True))
+    self.assertEquals(len(tracer.getMessages()), 1)
+    tracer = Tracer(enabled=True, output='ringBuffer', objectIds=['Q2'])
+    self.assertEquals(self.trace(tracer), (False, False))
+    self.assertEquals(len(tracer.getMessages()), 1)
+
+  def testGeneralInput(self):
+    tracer = Tracer.fromGeneralInput({'console': 'Yes', 'consoleLevel': 'info',
+                                      'consoleOutput': 'logging'})
+    self.assertTrue(tracer.enabled)
+    self.assertEquals(tracer.level, logging.INFO)
+    self.assertFalse(Tracer.fromGeneralInput({}).enabled)
+    self.assertRaises(ValueError, Tracer.fromGeneralInput,
+                      {'consoleOutput': 'stdout'})
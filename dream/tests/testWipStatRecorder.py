@@ -0,0 +1,58 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation.WipStatRecorder import WipStatRecorder
+from unittest import TestCase
+
+class WipStatRecorderTestCase(TestCase):
+  def testRecord(self):
+    recorder = WipStatRecorder(initialCapacity=2)
+    for i in range(1, 100):
+      recorder.record(i, i % 3)
+    self.assertEquals(len(recorder), 100)
+    rows = recorder.toList()
+    self.assertEquals(rows[0], [0.0, 0.0])
+    self.assertEquals(rows[5], [5.0, 2.0])
+    self.assertEquals(rows[-1], [99.0, 0.0])
+
+  def testChangeOnly(self):
+    recorder = WipStatRecorder(changeOnly=True)
+    for time, wip in [(1, 0), (2, 1), (3, 1), (4, 2), (5, 2), (6, 0)]:
+      recorder.record(time, wip)
+    self.assertEquals(recorder.toList(),
+                      [[0, 0], [2, 1], [4, 2], [6, 0]])
+
+  def testInterval(self):
+    recorder = WipStatRecorder(interval=10)
+    for time, wip in [(1, 1), (5, 2), (10, 3), (12, 4), (25, 5)]:
+      recorder.record(time, wip)
+    # the last row of every interval holds the latest wip
+    self.assertEquals(recorder.toList(), [[0, 2], [10, 4], [25, 5]])
+
+  def testMaxLength(self):
+    recorder = WipStatRecorder(maxLength=5, initialCapacity=2)
+    for i in range(1, 20):
+      recorder.record(i, i)
+    self.assertEquals(len(recorder), 5)
+    self.assertEquals([time for (time, wip) in recorder.toList()],
+                      [15, 16, 17, 18, 19])
+
+  def testUnknownOption(self):
+    # a misspelled option is not silently ignored
+    self.assertRaises(TypeError, WipStatRecorder, changeonly=True)
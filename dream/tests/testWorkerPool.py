@@ -0,0 +1,106 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import os
+import sys
+import time
+import threading
+from unittest import TestCase
+
+from dream.platform.workerpool import WorkerPool, TimeoutError, WorkerError
+
+def getPid():
+  return os.getpid()
+
+def sleep(seconds):
+  time.sleep(seconds)
+  return seconds
+
+def fail():
+  raise ValueError("failed in the worker")
+
+def setModuleState():
+  # stands for an application keeping its state at module level
+  sys.modules['dreamTestModuleState'] = sys
+  return os.getpid()
+
+class WorkerPoolTestCase(TestCase):
+
+  def setUp(self):
+    self.pool = WorkerPool(size=1, max_tasks_per_worker=3)
+
+  def tearDown(self):
+    self.pool.close()
+
+  def test_worker_is_reused(self):
+    pid = self.pool.apply(getPid, 10)
+    self.assertNotEqual(pid, os.getpid())
+    self.assertEqual(pid, self.pool.apply(getPid, 10))
+
+  def test_worker_is_recycled(self):
+    pid_list = [self.pool.apply(getPid, 10) for i in range(4)]
+    self.assertEqual(len(set(pid_list[:3])), 1)
+    self.assertNotEqual(pid_list[0], pid_list[3])
+
+  def test_timeout(self):
+    pid = self.pool.apply(getPid, 10)
+    self.assertRaises(TimeoutError, self.pool.apply, sleep, 0.1, 5)
+    # the worker was replaced and the pool is still usable
+    self.assertNotEqual(pid, self.pool.apply(getPid, 10))
+
+  def test_error(self):
+    try:
+      self.pool.apply(fail, 10)
+    except WorkerError, e:
+      self.assertTrue("failed in the worker" in str(e))
+    else:
+      self.fail("WorkerError not raised")
+    self.assertEqual(0.01, self.pool.apply(sleep, 10, 0.01))
+
+  def test_stateful_worker_is_retired(self):
+    pool = WorkerPool(size=1, stateful_modules=('dreamTestModuleState',))
+    try:
+      pid = pool.apply(setModuleState, 10)
+      # the worker left module level state behind, the next task runs in a fresh one
+      self.assertNotEqual(pid, pool.apply(getPid, 10))
+    finally:
+      pool.close()
+
+  def test_stateful_module_imported_before_fork(self):
+    # the module was there when the worker was forked, the task did not import it
+    sys.modules['dreamTestModuleState'] = sys
+    try:
+      pool = WorkerPool(size=1, stateful_modules=('dreamTestModuleState',))
+      try:
+        pid = pool.apply(setModuleState, 10)
+        self.assertEqual(pid, pool.apply(getPid, 10))
+      finally:
+        pool.close()
+    finally:
+      del sys.modules['dreamTestModuleState']
+
+  def test_wait_for_worker_timeout(self):
+    # the only worker is busy for longer than the timeout of the second request
+    busy = threading.Thread(target=self.pool.apply, args=(sleep, 10, 1))
+    busy.start()
+    time.sleep(0.2)
+    try:
+      self.assertRaises(TimeoutError, self.pool.apply, getPid, 0.2)
+    finally:
+      busy.join()